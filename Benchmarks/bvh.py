@@ -0,0 +1,62 @@
+from vectorObjects.BoundingVolumeHierarchy import BVH
+import numpy as np
+import timeit
+import sys
+
+# Ray casts against a height field mesh, testing every triangle of the mesh for each ray against a BVH, along with the
+# time to build and refit the BVH. Pass the number of grid cells along each side as an argument, where the mesh has
+# twice the square of that many triangles.
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 708
+x, y = np.meshgrid(np.linspace(0, 10, size + 1), np.linspace(0, 10, size + 1))
+heights = np.sin(x * 2) * np.cos(y * 3) * 0.5
+vertices = np.column_stack((x.ravel(), y.ravel(), heights.ravel()))
+
+corners = (np.arange(size)[:, None] * (size + 1) + np.arange(size)[None, :]).ravel()
+faces = np.concatenate([np.column_stack((corners, corners + 1, corners + size + 2)),
+                        np.column_stack((corners, corners + size + 2, corners + size + 1))])
+
+rng = np.random.default_rng(0)
+ray_count = 100000
+origins = np.column_stack((rng.uniform(0, 10, (ray_count, 2)), np.full(ray_count, 5.0)))
+directions = np.column_stack((rng.uniform(-0.5, 0.5, (ray_count, 2)), -np.ones(ray_count)))
+
+first, edges_1, edges_2 = vertices[faces[:, 0]], vertices[faces[:, 1]] - vertices[faces[:, 0]], \
+    vertices[faces[:, 2]] - vertices[faces[:, 0]]
+
+
+def brute_force(origin, direction):
+    """
+    Test one ray against every triangle, the same Moller-Trumbore test as the BVH
+    """
+    p = np.cross(direction, edges_2)
+    determinant = np.einsum("ij,ij->i", edges_1, p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = origin - first
+        u = np.einsum("ij,ij->i", s, p) / determinant
+        q = np.cross(s, edges_1)
+        v = (q @ direction) / determinant
+        t = np.einsum("ij,ij->i", edges_2, q) / determinant
+    t = np.where((u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0), t, np.inf)
+    return np.argmin(t), t.min()
+
+
+print(f"{len(faces)} triangles, {ray_count} rays")
+brute_rays = 20
+seconds = min(timeit.repeat(lambda: [brute_force(origins[i], directions[i]) for i in range(brute_rays)], number=1,
+                            repeat=3)) / brute_rays
+print(f"    {'brute force':<24} {seconds * 1e3:9.3f} ms per ray")
+
+for split in ("median", "sah"):
+    build = min(timeit.repeat(lambda: BVH(vertices, faces, split=split), number=1, repeat=1))
+    bvh = BVH(vertices, faces, split=split)
+    closest = min(timeit.repeat(lambda: bvh.intersect_rays(origins, directions), number=1, repeat=3)) / ray_count
+    print(f"    {split:<24} {build * 1e3:9.1f} ms to build, {closest * 1e6:7.2f} us per ray")
+
+triangles, distances = bvh.intersect_rays(origins[:brute_rays], directions[:brute_rays])
+expected = np.array([brute_force(origins[i], directions[i])[1] for i in range(brute_rays)])
+print(f"    matches brute force      {np.allclose(distances, expected)}")
+
+moved = vertices + rng.normal(scale=0.002, size=vertices.shape)
+refit = min(timeit.repeat(lambda: bvh.refit(moved), number=1, repeat=3))
+closest = min(timeit.repeat(lambda: bvh.intersect_rays(origins, directions), number=1, repeat=3)) / ray_count
+print(f"    {'refit':<24} {refit * 1e3:9.1f} ms to refit, {closest * 1e6:7.2f} us per ray")
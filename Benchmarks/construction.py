@@ -0,0 +1,34 @@
+from vectorObjects.DefinedVectors import Vector3D
+import numpy as np
+import struct
+import timeit
+import array
+
+# Construct Vector3D from each kind of input accepted by _load, along with from_array and from_buffer. Before the
+# dispatch table, ex=True walked an isinstance chain and could only take numbers, lists and tuples, so an ndarray row
+# had to be converted with tolist first.
+number = 200000
+row = np.array([1.1, 2.2, 3.3])
+buffer = struct.pack("<3d", 1.1, 2.2, 3.3)
+
+cases = [
+    ("positional", "Vector3D(1.1, 2.2, 3.3)"),
+    ("ex=True list", "Vector3D([1.1, 2.2, 3.3], ex=True)"),
+    ("ex=True numbers", "Vector3D(1.1, 2.2, 3.3, ex=True)"),
+    ("ex=True numpy scalars", "Vector3D(row[0], row[1], row[2], ex=True)"),
+    ("before: ex=True ndarray.tolist()", "Vector3D(row.tolist(), ex=True)"),
+    ("ex=True ndarray", "Vector3D(row, ex=True)"),
+    ("ex=True memoryview", "Vector3D(view, ex=True)"),
+    ("ex=True array.array", "Vector3D(values, ex=True)"),
+    ("from_array ndarray", "Vector3D.from_array(row)"),
+    ("from_buffer bytes", "Vector3D.from_buffer(buffer)"),
+    ("before: struct.unpack then positional", "Vector3D(*struct.unpack('<3d', buffer))"),
+]
+
+namespace = {"Vector3D": Vector3D, "row": row, "buffer": buffer, "struct": struct, "view": memoryview(row),
+             "values": array.array("d", [1.1, 2.2, 3.3])}
+
+print(f"Constructing {number} Vector3D")
+for name, statement in cases:
+    seconds = min(timeit.repeat(statement, globals=namespace, number=number, repeat=3))
+    print(f"    {name:<40} {seconds / number * 1e9:8.1f} ns {number / seconds / 1e6:6.2f} M/s")
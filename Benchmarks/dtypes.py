@@ -0,0 +1,43 @@
+from vectorObjects.DefinedVectors import Vector3D, VectorRGB
+from vectorObjects.VectorArrays import Vector3DArray, VectorRGBArray, memory_usage
+import numpy as np
+import timeit
+import sys
+
+# Bytes per vector and the throughput of the same operations on a list of slots objects and on batches of each dtype.
+# Pass the number of vectors as an argument. The list of objects is only timed up to 1000000 vectors.
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+rng = np.random.default_rng(0)
+values = rng.uniform(1, 100, (count, 3))
+
+
+def throughput(method, number):
+    seconds = min(timeit.repeat(method, number=1, repeat=3))
+    return number / seconds / 1e6
+
+
+def report(name, bytes_per_vector, cases):
+    rates = "  ".join(f"{case} {rate:8.2f}" for case, rate in cases)
+    print(f"    {name:<24} {bytes_per_vector:8.1f} bytes/vector  {rates}  M vectors/s")
+
+
+for vector_type, batch_type in [(Vector3D, Vector3DArray), (VectorRGB, VectorRGBArray)]:
+    print(f"{count} {vector_type.__name__}")
+
+    objects = min(count, 1000000)
+    vectors = batch_type(values[:objects]).to_vectors()
+    other = vector_type(1.5, 2.5, 3.5)
+    cases = [("add", throughput(lambda: [vector + other for vector in vectors], objects)),
+             ("scale", throughput(lambda: [vector * 0.5 for vector in vectors], objects))]
+    if vector_type is Vector3D:
+        cases.append(("dot", throughput(lambda: [vector.dot_product(other) for vector in vectors], objects)))
+    report("slots objects", memory_usage(vectors) / objects, cases)
+    del vectors
+
+    for dtype in batch_type.dtypes:
+        batch = batch_type(values, dtype=dtype)
+        cases = [("add", throughput(lambda: batch + other, count)),
+                 ("scale", throughput(lambda: batch * 0.5, count))]
+        if vector_type is Vector3D:
+            cases.append(("dot", throughput(lambda: batch.dot_product(other), count)))
+        report(f"{batch_type.__name__} {np.dtype(dtype).name}", batch.memory_report()["bytes_per_vector"], cases)
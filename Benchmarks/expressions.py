@@ -0,0 +1,63 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.Expressions import lazy, fuse
+from vectorObjects.Precision import precision
+import tracemalloc
+import numpy as np
+import timeit
+import sys
+
+# Evaluate (a - b) * k + c and ((a - b) * k + c).normalise() eagerly, where every step allocates a full batch, against
+# lazily, where each step writes into a buffer of one chunk. Pass the number of rows as an argument.
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+rng = np.random.default_rng(0)
+a, b, c = (Vector3DArray(rng.uniform(0.1, 1, (count, 3))) for _ in range(3))
+out = Vector3DArray(np.empty((count, 3)))
+k = 0.7
+
+cases = [
+    ("(a - b) * k + c", [
+        ("eager", lambda: (a - b) * k + c),
+        ("lazy", lambda: ((lazy(a) - b) * k + c).evaluate()),
+        ("lazy into out", lambda: ((lazy(a) - b) * k + c).evaluate(out=out)),
+    ]),
+    ("((a - b) * k + c).normalise()", [
+        ("eager", lambda: ((a - b) * k + c).normalise()),
+        ("lazy", lambda: ((lazy(a) - b) * k + c).normalise().evaluate()),
+        ("lazy into out", lambda: ((lazy(a) - b) * k + c).normalise().evaluate(out=out)),
+    ]),
+]
+
+
+def peak_memory(method):
+    tracemalloc.start()
+    method()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+print(f"{count} Vector3D rows")
+for title, methods in cases:
+    print(f"    {title}")
+    for name, method in methods:
+        seconds = min(timeit.repeat(method, number=1, repeat=3))
+        print(f"        {name:<20} {seconds * 1e3:9.1f} ms {count / seconds / 1e6:7.1f} M rows/s "
+              f"{peak_memory(method) / 1e6:9.1f} MB peak")
+
+single_a, single_b, single_c = Vector3D(1.1, 2.2, 3.3), Vector3D(0.3, 0.2, 0.1), Vector3D(5.0, 6.0, 7.0)
+short = fuse(lambda p, q, scale, r: (p - q) * scale + r)
+long = fuse(lambda p, q, scale, r: ((p - q) * scale + r - p * 0.5) / 3.0 + q)
+number = 200000
+for policy in ("rounded", "exact"):
+    with precision(policy):
+        print(f"Single Vector3D with {policy} precision")
+        for name, method in [
+            ("eager (a - b) * k + c", lambda: (single_a - single_b) * k + single_c),
+            ("lazy (a - b) * k + c", lambda: ((lazy(single_a) - single_b) * k + single_c).evaluate()),
+            ("fuse (a - b) * k + c", lambda: short(single_a, single_b, k, single_c)),
+            ("eager 6 operators", lambda: ((single_a - single_b) * k + single_c - single_a * 0.5) / 3.0 + single_b),
+            ("fuse 6 operators", lambda: long(single_a, single_b, k, single_c)),
+        ]:
+            seconds = min(timeit.repeat(method, number=number, repeat=3))
+            print(f"        {name:<28} {seconds / number * 1e9:9.1f} ns")
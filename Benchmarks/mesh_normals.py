@@ -0,0 +1,39 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.MeshNormals import mesh_normals
+import numpy as np
+import timeit
+import sys
+
+# Face normals of a grid mesh, one triangle at a time with Vector3D.cross_product and normalise, against the face and
+# vertex normals of every triangle together. Pass the number of grid cells along each side as an argument.
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+x, y = np.meshgrid(np.linspace(0, 1, size + 1), np.linspace(0, 1, size + 1))
+heights = np.sin(x * 6) * np.cos(y * 4) * 0.1
+vertices = Vector3DArray(np.column_stack((x.ravel(), y.ravel(), heights.ravel())))
+
+corners = (np.arange(size)[:, None] * (size + 1) + np.arange(size)[None, :]).ravel()
+faces = np.concatenate([np.column_stack((corners, corners + 1, corners + size + 2)),
+                        np.column_stack((corners, corners + size + 2, corners + size + 1))])
+vertex_list = list(vertices)
+face_list = faces.tolist()
+
+
+def per_triangle():
+    normals = []
+    for a, b, c in face_list:
+        edge = vertex_list[b] - vertex_list[a]
+        edge.cross_product(vertex_list[c] - vertex_list[a])
+        edge.normalise()
+        normals.append(edge)
+    return normals
+
+
+print(f"{len(faces)} triangles, {len(vertices)} vertices")
+for name, method in [
+    ("Vector3D per triangle", per_triangle),
+    ("mesh_normals area", lambda: mesh_normals(vertices, faces)),
+    ("mesh_normals angle", lambda: mesh_normals(vertices, faces, weighting="angle")),
+]:
+    seconds = min(timeit.repeat(method, number=1, repeat=3))
+    print(f"    {name:<24} {seconds * 1e3:9.1f} ms {len(faces) / seconds / 1e6:7.2f} M triangles/s")
@@ -0,0 +1,60 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.Parallel import ParallelExecutor
+import numpy as np
+import time
+import sys
+import os
+
+# Run each batch operation over the same points with 1 to N workers in both process and thread mode, against the single
+# core batch operation of vectorObjects.VectorArrays. Pass the number of points and the largest number of workers as
+# arguments, such as 100000000 16, which needs several GB of memory.
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+largest = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+rng = np.random.default_rng(0)
+points = rng.uniform(0.1, 1, (count, 3))
+others = rng.uniform(0.1, 1, (count, 3))
+matrix = np.eye(4)
+matrix[:3, :3] = [[0.36, 0.48, -0.8], [-0.8, 0.6, 0], [0.48, 0.64, 0.6]]
+matrix[:3, 3] = [1, 2, 3]
+
+
+def timed(method):
+    start = time.perf_counter()
+    method()
+    return time.perf_counter() - start
+
+
+def operations(executor):
+    return [
+        ("normalise", lambda: executor.normalise(points)),
+        ("cross_product", lambda: executor.cross_product(points, others)),
+        ("transform", lambda: executor.transform(points, matrix)),
+        ("rotate", lambda: executor.rotate(points[:, :2], 0.5, (0.5, 0.5))),
+        ("sub_divide 2", lambda: executor.sub_divide(points[:count // 4], others[:count // 4], 2)),
+    ]
+
+
+print(f"{count} points")
+single = {
+    "normalise": lambda: Vector3DArray(points.copy()).normalise(),
+    "cross_product": lambda: Vector3DArray(points.copy()).cross_product(Vector3DArray(others)),
+    "transform": lambda: points @ matrix[:3, :3].T + matrix[:3, 3],
+}
+for name, method in single.items():
+    print(f"    {'VectorArrays ' + name:<36} {timed(method):8.3f} s")
+
+workers = 1
+while True:
+    for mode in ("process", "thread"):
+        with ParallelExecutor(workers, mode=mode) as executor:
+            for name, method in operations(executor):
+                # The first run also starts the pool of workers
+                method()
+                seconds = timed(method)
+                print(f"    {f'{name} {mode} x{workers}':<36} {seconds:8.3f} s {count / seconds / 1e6:8.1f} M points/s")
+
+    if workers >= largest:
+        break
+    workers = min(workers * 2, largest)
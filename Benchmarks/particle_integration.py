@@ -0,0 +1,63 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.Precision import precision
+import numpy as np
+import timeit
+
+# Integrate positions by velocities over a number of steps. Before operators returned new vectors, a + b updated a in
+# place, so velocities had to be copied before being scaled by dt.
+particles = 10000
+steps = 10
+dt = 0.01
+
+rng = np.random.default_rng(0)
+positions = [Vector3D(*p) for p in rng.uniform(-1, 1, (particles, 3)).tolist()]
+velocities = [Vector3D(*v) for v in rng.uniform(-1, 1, (particles, 3)).tolist()]
+position_batch = Vector3DArray(rng.uniform(-1, 1, (particles, 3)))
+velocity_batch = Vector3DArray(rng.uniform(-1, 1, (particles, 3)))
+
+
+def defensive_copy():
+    for _ in range(steps):
+        for p, v in zip(positions, velocities):
+            step = Vector3D(v.x, v.y, v.z)
+            step *= dt
+            p += step
+
+
+def out_of_place():
+    for _ in range(steps):
+        for i, (p, v) in enumerate(zip(positions, velocities)):
+            positions[i] = p + v * dt
+
+
+def in_place():
+    for _ in range(steps):
+        for p, v in zip(positions, velocities):
+            p += v * dt
+
+
+def add_scaled():
+    for _ in range(steps):
+        for p, v in zip(positions, velocities):
+            p.add_scaled(v, dt)
+
+
+def batch_in_place():
+    for _ in range(steps):
+        position_batch.__iadd__(velocity_batch * dt)
+
+
+def batch_add_scaled():
+    for _ in range(steps):
+        position_batch.add_scaled(velocity_batch, dt)
+
+
+for mode in ["rounded(14)", "exact"]:
+    with precision(mode):
+        print(f"Precision {mode}, {particles} particles over {steps} steps")
+        for name, method in [("before: copy then mutate", defensive_copy), ("p = p + v * dt", out_of_place),
+                             ("p += v * dt", in_place), ("p.add_scaled(v, dt)", add_scaled),
+                             ("Vector3DArray +=", batch_in_place), ("Vector3DArray.add_scaled", batch_add_scaled)]:
+            seconds = min(timeit.repeat(method, number=1, repeat=3))
+            print(f"    {name:<28} {seconds * 1e3:9.2f} ms")
@@ -0,0 +1,26 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.Precision import precision
+import numpy as np
+import timeit
+
+# Time the same operations under each precision policy, for single vectors and for a batch
+modes = ["exact", "rounded(14)", "float32"]
+scalar_number = 200000
+batch = Vector3DArray(np.random.default_rng(0).uniform(-1, 1, (1000000, 3)))
+batch_other = batch.copy()
+
+for mode in modes:
+    with precision(mode):
+        add = timeit.timeit("a + b", setup="a = Vector3D(1.1, 2.2, 3.3); b = Vector3D(0.1, 0.2, 0.3)",
+                            globals=globals(), number=scalar_number)
+        mul = timeit.timeit("a * 1.0000001", setup="a = Vector3D(1.1, 2.2, 3.3)", globals=globals(),
+                            number=scalar_number)
+        tuple_add = timeit.timeit("a + (0.1, 0.2, 0.3)", setup="a = Vector3D(1.1, 2.2, 3.3)", globals=globals(),
+                                  number=scalar_number)
+        batch_add = min(timeit.repeat("batch + batch_other", globals=globals(), number=1, repeat=5))
+
+    print(f"{mode:<12} Vector3D + Vector3D: {add / scalar_number * 1e9:8.1f} ns/op | "
+          f"Vector3D * float: {mul / scalar_number * 1e9:8.1f} ns/op | "
+          f"Vector3D + tuple: {tuple_add / scalar_number * 1e9:8.1f} ns/op | "
+          f"Vector3DArray(1M) + Vector3DArray: {batch_add * 1e3:7.2f} ms")
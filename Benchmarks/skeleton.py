@@ -0,0 +1,72 @@
+from vectorObjects.DefinedVectors import Vector3D, PymeshioQuaternion
+from vectorObjects.Skeleton import Skeleton
+import numpy as np
+import timeit
+import sys
+
+# World poses of a skeleton of branching chains, walking every bones chain of parents with PymeshioQuaternion objects
+# for each frame, against one level at a time for every frame together. Pass the number of frames as an argument.
+frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+chains, chain_length = 12, 12
+rng = np.random.default_rng(0)
+
+parents = [-1]
+for chain in range(chains):
+    parents += [0] + [len(parents) + index for index in range(chain_length - 1)]
+count = len(parents)
+
+offsets = rng.uniform(-1, 1, (count, 3))
+rotations = rng.normal(size=(frames, count, 4))
+rotations /= np.linalg.norm(rotations, axis=2, keepdims=True)
+skeleton = Skeleton(parents, offsets)
+
+
+def chain_walk():
+    results = []
+    for frame in sample.tolist():
+        quaternions = [PymeshioQuaternion(*rotation) for rotation in frame]
+        for bone in range(count):
+            rotation, position, index = PymeshioQuaternion(), Vector3D(0, 0, 0), bone
+            chain = []
+            while index >= 0:
+                chain.append(index)
+                index = parents[index]
+            for index in reversed(chain):
+                offset = np.append(offsets[index], 1.0) @ rotation.getMatrix()
+                position = position + Vector3D(*offset[:3].tolist())
+                rotation = rotation * quaternions[index]
+            results.append((rotation, position))
+    return results
+
+
+# The chain walk is slow enough that it is only timed on a sample of the frames
+walk_frames = max(frames // 30, 1)
+sample = rotations[:walk_frames]
+walk = min(timeit.repeat(chain_walk, number=1, repeat=3)) / walk_frames
+levels = min(timeit.repeat(lambda: skeleton.evaluate_frames(rotations), number=1, repeat=3)) / frames
+
+print(f"{count} bones in {len(skeleton.levels)} levels")
+print(f"    {'chain walk':<28} {walk * 1e3:9.3f} ms per frame")
+print(f"    {'evaluate_frames':<28} {levels * 1e3:9.3f} ms per frame")
+
+skeleton.set_pose(rotations[0])
+skeleton.evaluate()
+leaf = count - 1
+number = 2000
+
+
+def one_bone():
+    skeleton.set_local(leaf, rotations[1, leaf])
+    skeleton.set_local(leaf, rotations[0, leaf])
+    return skeleton.evaluate()
+
+
+def every_bone():
+    skeleton.set_pose(rotations[1])
+    skeleton.set_pose(rotations[0])
+    return skeleton.evaluate()
+
+
+for name, method in [("evaluate, one bone changed", one_bone), ("evaluate, every bone changed", every_bone)]:
+    seconds = min(timeit.repeat(method, number=number, repeat=3)) / number
+    print(f"    {name:<28} {seconds * 1e3:9.3f} ms per frame")
@@ -0,0 +1,67 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.SpatialIndex import KDTree, UniformGrid
+import numpy as np
+import time
+import sys
+
+# Compare nearest neighbour and radius queries of a KDTree and UniformGrid against brute force, both as a loop of
+# __sub__ and dot_product over Vector3D and as a single numpy call per query. Pass the largest number of points as an
+# argument, such as 10000000, which needs several GB of memory.
+largest = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+queries = 1000
+radius = 0.02
+
+rng = np.random.default_rng(0)
+query_points = rng.uniform(0, 1, (queries, 3))
+
+
+def timed(method):
+    start = time.perf_counter()
+    method()
+    return time.perf_counter() - start
+
+
+def vector_loop(points, count):
+    vectors = [Vector3D(*p) for p in points.tolist()]
+    for q in query_points[:count].tolist():
+        target = Vector3D(*q)
+        best, best_distance = None, float("inf")
+        for i, vector in enumerate(vectors):
+            difference = vector - target
+            distance = difference.dot_product(difference)
+            if distance < best_distance:
+                best, best_distance = i, distance
+
+
+def numpy_brute_force(points, count):
+    for q in query_points[:count]:
+        difference = points - q
+        np.argmin(np.einsum("ij,ij->i", difference, difference))
+
+
+size = 10000
+while size <= largest:
+    points = rng.uniform(0, 1, (size, 3))
+    print(f"{size} points, per query in microseconds")
+
+    if size <= 100000:
+        count = max(1, 100000 // size)
+        print(f"    {'brute force, Vector3D loop':<32} {timed(lambda: vector_loop(points, count)) / count * 1e6:12.1f}")
+
+    count = min(queries, max(10, 10 ** 8 // size))
+    print(f"    {'brute force, numpy':<32} {timed(lambda: numpy_brute_force(points, count)) / count * 1e6:12.1f}")
+
+    tree_build = timed(lambda: KDTree(points))
+    grid_build = timed(lambda: UniformGrid(radius, points))
+    tree, grid = KDTree(points), UniformGrid(radius, points)
+
+    for name, index in [("KDTree", tree), ("UniformGrid", grid)]:
+        print(f"    {name + ' k=1':<32} {timed(lambda: index.query(query_points, 1)) / queries * 1e6:12.1f}")
+        print(f"    {name + ' k=10':<32} {timed(lambda: index.query(query_points, 10)) / queries * 1e6:12.1f}")
+        print(f"    {name + f' radius {radius}':<32} "
+              f"{timed(lambda: index.query_radius(query_points, radius)) / queries * 1e6:12.1f}")
+        print(f"    {name + ' box':<32} "
+              f"{timed(lambda: index.query_box(query_points, query_points + radius)) / queries * 1e6:12.1f}")
+
+    print(f"    build, KDTree {tree_build:.2f} s, UniformGrid {grid_build:.2f} s")
+    size *= 10
@@ -0,0 +1,38 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import stack, unstack
+from itertools import chain
+import numpy as np
+import timeit
+
+# Move a list of Vector3D into an (N, 3) array and back again. Before __array__, stack and unstack this went through
+# to_list of each vector, or the __iter__ of each vector flattened by itertools.chain.
+count = 200000
+vectors = [Vector3D(i * 0.5, i * 0.25, i * 0.125) for i in range(count)]
+array = stack(vectors)
+
+to_array = [
+    ("before: np.array of to_list", lambda: np.array([vector.to_list() for vector in vectors])),
+    ("before: fromiter of chained __iter__", lambda: np.fromiter(chain.from_iterable(vectors), dtype=np.float64,
+                                                                 count=count * 3).reshape(count, 3)),
+    ("np.stack via __array__", lambda: np.stack(vectors)),
+    ("stack", lambda: stack(vectors)),
+]
+
+from_array = [
+    ("before: Vector3D(*row) per row", lambda: [Vector3D(*row) for row in array.tolist()]),
+    ("unstack", lambda: unstack(array, Vector3D)),
+]
+
+for title, cases in [(f"{count} Vector3D to an array", to_array), (f"An array to {count} Vector3D", from_array)]:
+    print(title)
+    for name, method in cases:
+        seconds = min(timeit.repeat(method, number=1, repeat=5))
+        print(f"    {name:<40} {seconds * 1e3:8.2f} ms {count / seconds / 1e6:6.2f} M vectors/s")
+
+single = Vector3D(1.1, 2.2, 3.3)
+number = 200000
+print("A single Vector3D to an array")
+for name, statement in [("before: np.array(v.to_list())", "np.array(single.to_list())"),
+                        ("np.asarray(v)", "np.asarray(single)")]:
+    seconds = min(timeit.repeat(statement, globals=globals(), number=number, repeat=3))
+    print(f"    {name:<40} {seconds / number * 1e9:8.1f} ns")
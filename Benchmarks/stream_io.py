@@ -0,0 +1,84 @@
+from vectorObjects.DefinedVectors import Vector2D, Vector3D
+from vectorObjects.StreamIO import read_obj, read_points, ObjWriter, write_points
+import numpy as np
+import tempfile
+import time
+import os
+
+# Compare reading and writing a large obj and csv file with the streaming functions of StreamIO against parsing each
+# line with float() into a Vector3D, which holds the whole file in memory as python objects.
+vertices = 500000
+
+rng = np.random.default_rng(0)
+positions = rng.uniform(-100, 100, (vertices, 3))
+normals = rng.uniform(-1, 1, (vertices, 3))
+uvs = rng.uniform(0, 1, (vertices, 2))
+
+directory = tempfile.mkdtemp()
+obj_path = os.path.join(directory, "mesh.obj")
+csv_path = os.path.join(directory, "points.csv")
+
+
+def timed(name, path, method):
+    start = time.perf_counter()
+    method()
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path) / 1e6
+    print(f"    {name:<36} {seconds:7.2f} s {size / seconds:9.1f} MB/s")
+
+
+def naive_write_obj():
+    with open(obj_path, "w") as file:
+        for record, rows in [("v", positions), ("vn", normals), ("vt", uvs)]:
+            for row in rows.tolist():
+                file.write(record + " " + " ".join(repr(value) for value in row) + "\n")
+
+
+def stream_write_obj():
+    chunk = 65536
+    with ObjWriter(obj_path) as writer:
+        for record, rows in [("v", positions), ("vn", normals), ("vt", uvs)]:
+            for start in range(0, len(rows), chunk):
+                writer.write(record, rows[start:start + chunk])
+
+
+def naive_read_obj():
+    found = {"v": [], "vn": [], "vt": []}
+    with open(obj_path) as file:
+        for line in file:
+            values = line.split()
+            if values[0] == "vt":
+                found["vt"].append(Vector2D(*[float(value) for value in values[1:3]]))
+            elif values[0] in found:
+                found[values[0]].append(Vector3D(*[float(value) for value in values[1:4]]))
+    return found
+
+
+def stream_read_obj():
+    return sum(len(batch) for _, batch in read_obj(obj_path))
+
+
+def naive_read_csv():
+    with open(csv_path) as file:
+        return [Vector3D(*[float(value) for value in line.split(",")]) for line in file]
+
+
+def stream_read_csv():
+    return sum(len(batch) for batch in read_points(csv_path))
+
+
+print(f"obj of {vertices} v, vn and vt records")
+timed("write, per line", obj_path, naive_write_obj)
+timed("write, ObjWriter", obj_path, stream_write_obj)
+timed("read, per line into Vector3D", obj_path, naive_read_obj)
+timed("read, read_obj", obj_path, stream_read_obj)
+
+write_points(csv_path, [positions])
+print(f"csv of {vertices} x, y, z rows")
+timed("read, per line into Vector3D", csv_path, naive_read_csv)
+timed("read, read_points", csv_path, stream_read_csv)
+timed("write, write_points", csv_path, lambda: write_points(csv_path, [positions]))
+
+os.remove(obj_path)
+os.remove(csv_path)
+os.rmdir(directory)
@@ -0,0 +1,256 @@
+"""
+Benchmark every operation of every class in DefinedVectors, along with the VectorMaster methods they are built on, and
+compare the results against a previous run.
+
+    python Benchmarks/suite.py --output results.json
+    python Benchmarks/suite.py --baseline results.json --threshold 0.1
+
+Timings are the best of several repeats in nanoseconds per operation. Memory is the peak traced memory of creating one
+million instances of each class, including the list that holds them. When a baseline is given, any timing or memory
+that is worse than the baseline by more than the threshold is reported, and the exit code is 1.
+"""
+from vectorObjects.DefinedVectors import Vector2D, Vector3D, Vector4D, VectorRGB, PymeshioQuaternion
+from vectorObjects.VectorMaster import VectorMaster
+from vectorObjects.Precision import precision, get_precision
+from datetime import datetime, timezone
+import tracemalloc
+import inspect
+import platform
+import argparse
+import operator
+import timeit
+import numpy as np
+import json
+import sys
+
+VECTOR_CLASSES = [Vector2D, Vector3D, Vector4D, VectorRGB]
+VALUES = (1.1, 2.2, 3.3, 4.4)
+# Operands close to one, so repeating an in place multiply or divide millions of times does not overflow
+OTHER_VALUES = (1.0000001, 0.9999999, 1.0000002, 0.9999998)
+OPERATORS = [("+", "__add__"), ("-", "__sub__"), ("*", "__mul__"), ("/", "__truediv__")]
+
+
+def _literal(values):
+    return f"({', '.join(str(value) for value in values)})"
+
+
+def vector_cases(cls):
+    """
+    The cases of a class generated by vector_class, as (name, setup, statement)
+    """
+    width = len(cls.__slots__)
+    values, other_values = VALUES[:width], OTHER_VALUES[:width]
+    setup = f"a = cls{_literal(values)}; b = cls{_literal(other_values)}"
+
+    cases = [("construct positional", "", f"cls{_literal(values)}")]
+    if "ex" in inspect.signature(cls.__init__).parameters:
+        cases.append(("construct ex=True", "", f"cls([{', '.join(str(value) for value in values)}], ex=True)"))
+    else:
+        cases.append(("construct list", "", f"cls([{', '.join(str(value) for value in values)}])"))
+
+    operands = [("vector", "b"), ("scalar", "1.0000001"), ("tuple", _literal(other_values))]
+    for symbol, name in OPERATORS:
+        for operand_name, operand in operands:
+            cases.append((f"{name} {operand_name}", setup, f"a {symbol} {operand}"))
+            cases.append((f"{name.replace('__', '__i', 1)} {operand_name}", setup, f"a {symbol}= {operand}"))
+
+    cases += [
+        ("__neg__", setup, "-a"),
+        ("__eq__", setup, "a == b"),
+        ("copy", setup, "a.copy()"),
+        ("add_scaled", setup, "a.add_scaled(b, 0.5)"),
+        ("to_tuple", setup, "a.to_tuple()"),
+        ("dot_product", setup, "a.dot_product(b)"),
+        ("normalise", setup, "a.normalise()"),
+        ("sub_divide 10", setup, "a.sub_divide(b, 10)"),
+        ("sub_divide 10 array", setup, "a.sub_divide(b, 10, output='array')"),
+    ]
+
+    if width == 3:
+        # a stays perpendicular to the unit vector b, so repeated cross products keep the same magnitude
+        cases.append(("cross_product", "a = cls(1.1, 2.2, 0.0); b = cls(0.0, 0.0, 1.0)", "a.cross_product(b)"))
+
+    if cls is Vector2D:
+        cases.append(("rotate_around_point", setup, "a.rotate_around_point(0.5, (0.1, 0.2))"))
+
+    return cases
+
+
+def quaternion_cases():
+    setup = "a = cls(0.1, 0.2, 0.3, 0.9); b = cls(0.3, 0.1, 0.2, 0.9); a.getNormalized(); b.getNormalized()"
+    return [
+        ("construct positional", "", "cls(0.1, 0.2, 0.3, 0.9)"),
+        ("__mul__", setup, "a * b"),
+        ("__eq__", setup, "a == b"),
+        ("dot", setup, "a.dot(b)"),
+        ("getNormalized", setup, "a.getNormalized()"),
+        ("getRightHanded", setup, "a.getRightHanded()"),
+        ("getMatrix", setup, "a.getMatrix()"),
+        ("getRHMatrix", setup, "a.getRHMatrix()"),
+        ("getRollPitchYaw", setup, "a.getRollPitchYaw()"),
+        ("createFromAxisAngle", "", "cls.createFromAxisAngle((0.0, 1.0, 0.0), 0.5)"),
+    ]
+
+
+def master_cases():
+    """
+    The VectorMaster methods directly, as classes that define their own methods no longer call all of them
+    """
+    setup = "a = Vector3D(1.1, 2.2, 3.3); b = Vector3D(0.1, 0.2, 0.3)"
+    return [
+        ("_load positional", setup, "a._load((1.1, 2.2, 3.3))"),
+        ("_load list", setup, "a._load(([1.1, 2.2, 3.3], ))"),
+        ("_mathematical_operator vector", setup, "cls._mathematical_operator(a, b, operator.add)"),
+        ("_mathematical_operator scalar", setup, "cls._mathematical_operator(a, 1.0000001, operator.mul)"),
+        ("_mathematical_operator tuple", setup, "cls._mathematical_operator(a, (0.1, 0.2, 0.3), operator.sub)"),
+        ("_equality", setup, "a._equality(a, b)"),
+        ("_return_dot_product", setup, "cls._return_dot_product(a, b)"),
+        ("_return_cross_product", "a = Vector3D(1.1, 2.2, 0.0); b = Vector3D(0.0, 0.0, 1.0)",
+         "a._return_cross_product(a, b)"),
+        ("_normalise_attributes", setup, "a._normalise_attributes(a)"),
+        ("_copy", setup, "cls._copy(a)"),
+    ]
+
+
+def all_cases():
+    """
+    Every case as (class, name, setup, statement), where results are named class.name
+    """
+    cases = [(cls, name, setup, statement) for cls in VECTOR_CLASSES for name, setup, statement in vector_cases(cls)]
+    cases += [(PymeshioQuaternion, name, setup, statement) for name, setup, statement in quaternion_cases()]
+    cases += [(VectorMaster, name, setup, statement) for name, setup, statement in master_cases()]
+    return cases
+
+
+def time_case(cls, setup, statement, repeat, min_time):
+    """
+    The best time of repeat runs in nanoseconds per operation, where the number of operations per run is calibrated so
+    that each run takes at least min_time seconds
+    """
+    timer = timeit.Timer(statement, setup, globals={"cls": cls, "Vector3D": Vector3D, "operator": operator})
+
+    number = 1
+    while True:
+        seconds = timer.timeit(number)
+        if seconds >= min_time:
+            break
+        number *= max(2, min(10, int(min_time / max(seconds, 1e-9)) + 1))
+
+    return min([seconds] + timer.repeat(repeat - 1, number)) / number * 1e9
+
+
+def peak_memory(cls, count):
+    """
+    The peak memory in bytes of creating count instances of cls, each with their own values, scaled to one million
+    instances
+    """
+    values = VALUES[:len(cls.__slots__)]
+    tracemalloc.start()
+    instances = [cls(*[value + i for value in values]) for i in range(count)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return int(peak * 1000000 / count)
+
+
+def run(filters, repeat, min_time, memory_count):
+    timings = {}
+    for cls, name, setup, statement in all_cases():
+        key = f"{cls.__name__}.{name}"
+        if filters and not any(f in key for f in filters):
+            continue
+
+        timings[key] = round(time_case(cls, setup, statement, repeat, min_time), 2)
+        print(f"    {key:<52} {timings[key]:12.1f} ns")
+
+    memory = {}
+    if memory_count > 0:
+        for cls in VECTOR_CLASSES + [PymeshioQuaternion]:
+            if filters and not any(f in cls.__name__ for f in filters):
+                continue
+
+            memory[cls.__name__] = peak_memory(cls, memory_count)
+            print(f"    {cls.__name__ + ' peak memory per 1M':<52} {memory[cls.__name__] / 1e6:12.1f} MB")
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "precision": get_precision().name,
+            "repeat": repeat,
+            "min_time": min_time,
+            "memory_count": memory_count,
+        },
+        "timings_ns": timings,
+        "memory_bytes_per_million": memory,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every result that is also in the baseline, returning the names of those that are worse than the
+    baseline by more than threshold
+    """
+    regressions = []
+    for section in ("timings_ns", "memory_bytes_per_million"):
+        current, previous = results.get(section, {}), baseline.get(section, {})
+        for key in sorted(set(current) & set(previous)):
+            if previous[key] <= 0:
+                continue
+
+            change = current[key] / previous[key] - 1
+            status = "REGRESSION" if change > threshold else ("improved" if change < -threshold else "")
+            if status:
+                print(f"    {key:<52} {previous[key]:12.1f} -> {current[key]:12.1f} {change:+8.1%} {status}")
+            if change > threshold:
+                regressions.append(key)
+
+        missing = len(set(previous) - set(current))
+        if missing:
+            print(f"    {missing} results of the baseline {section} were not measured this run")
+
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark every operation of the vectors in DefinedVectors")
+    parser.add_argument("--output", help="Write the results to this json file")
+    parser.add_argument("--baseline", help="Compare the results against a previous json file of results")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="The fraction a result can be worse than the baseline before it is a regression")
+    parser.add_argument("--filter", nargs="*", default=[],
+                        help="Only run cases whose name contains one of these, such as Vector3D or __add__")
+    parser.add_argument("--repeat", type=int, default=5, help="The number of repeats of each timing")
+    parser.add_argument("--min-time", type=float, default=0.05, help="The minimum seconds of each repeat")
+    parser.add_argument("--memory-count", type=int, default=1000000,
+                        help="The number of instances created to measure memory, or 0 to skip it")
+    parser.add_argument("--precision", default=None, help="Run under this precision policy, such as exact")
+    args = parser.parse_args(arguments)
+
+    if args.precision is None:
+        results = run(args.filter, args.repeat, args.min_time, args.memory_count)
+    else:
+        with precision(args.precision):
+            results = run(args.filter, args.repeat, args.min_time, args.memory_count)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        print(f"Compared to {args.baseline} with a threshold of {args.threshold:.0%}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions found")
+            return 1
+        print("No regressions found")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+from vectorObjects.DefinedVectors import Vector3D, PymeshioQuaternion
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.Transforms import Transform
+import numpy as np
+import timeit
+import math
+import sys
+
+# Move points by a scale, quaternion rotation and translation, one vector at a time through numpy as a list of vectors
+# is moved without Transform, against a single Transform applied to the list, a batch, and a batch written into out.
+# Pass the number of points as an argument.
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+rng = np.random.default_rng(0)
+rows = rng.uniform(-10, 10, (count, 3))
+vectors = [Vector3D(*row) for row in rows.tolist()]
+batch = Vector3DArray(rows)
+out = Vector3DArray(np.empty((count, 3)))
+
+quaternion = PymeshioQuaternion.createFromAxisAngle((0, 0, 1), math.pi / 3)
+transform = Transform.from_components((1, 2, 3), quaternion, (2, 2, 2))
+matrix = transform.matrix
+
+
+def round_trip():
+    return [Vector3D(*(np.array([v.x, v.y, v.z, 1.0]) @ matrix)[:3].tolist()) for v in vectors]
+
+
+print(f"{count} Vector3D points")
+for name, method in [
+    ("list round trip", round_trip),
+    ("Transform list", lambda: transform.apply(vectors)),
+    ("Transform per vector", lambda: [transform.apply(v) for v in vectors]),
+    ("Transform batch", lambda: transform.apply(batch)),
+    ("Transform batch into out", lambda: transform.apply(batch, out=out)),
+]:
+    seconds = min(timeit.repeat(method, number=1, repeat=3))
+    print(f"    {name:<26} {seconds * 1e3:9.1f} ms {count / seconds / 1e6:7.2f} M points/s")
+
+parent, child = Transform.translation((0, 1, 0)), Transform.rotation(quaternion)
+number = 100000
+print("Composition")
+for name, method in [
+    ("matrix product", lambda: parent.matrix @ child.matrix),
+    ("cached compose", lambda: parent @ child),
+]:
+    seconds = min(timeit.repeat(method, number=number, repeat=3))
+    print(f"    {name:<26} {seconds / number * 1e9:9.1f} ns")
@@ -0,0 +1,61 @@
+from vectorObjects.DefinedVectors import Vector3D
+from vectorObjects.VectorArrays import Vector3DArray
+from vectorObjects.Welding import weld
+import numpy as np
+import time
+import sys
+
+# Merge the duplicate vertices of a mesh where every vertex is shared by several faces. Before __hash__ this was a
+# pass comparing every vertex against every unique vertex found so far, which is only run for the smallest size. Pass
+# the largest number of points as an argument, such as 10000000, which needs several GB of memory.
+largest = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+rng = np.random.default_rng(0)
+
+
+def timed(method):
+    start = time.perf_counter()
+    method()
+    return time.perf_counter() - start
+
+
+def pairwise(vectors):
+    unique, inverse = [], []
+    for vector in vectors:
+        for index, existing in enumerate(unique):
+            if existing == vector:
+                inverse.append(index)
+                break
+        else:
+            inverse.append(len(unique))
+            unique.append(vector)
+    return unique, inverse
+
+
+def hashed(vectors):
+    indices, inverse = {}, []
+    for vector in vectors:
+        inverse.append(indices.setdefault(vector, len(indices)))
+    return list(indices), inverse
+
+
+size = 1000
+while size <= largest:
+    # Each unique vertex appears around six times, as in a closed triangle mesh
+    unique = rng.uniform(0, 1, (max(size // 6, 1), 3))
+    points = unique[rng.integers(0, len(unique), size)]
+    noisy = points + rng.normal(0, 1e-9, points.shape)
+    batch = Vector3DArray(points)
+
+    print(f"{size} points")
+    cases = [("weld exact", lambda: weld(batch)),
+             ("weld tolerance 1e-6", lambda: weld(noisy, 1e-6))]
+    if size <= 1000000:
+        vectors = batch.to_vectors()
+        cases.insert(0, ("set of Vector3D", lambda: hashed(vectors)))
+    if size <= 1000:
+        cases.insert(0, ("before: pairwise __eq__", lambda: pairwise(vectors)))
+
+    for name, method in cases:
+        seconds = timed(method)
+        print(f"    {name:<30} {seconds * 1e3:10.1f} ms {size / seconds / 1e6:8.2f} M points/s")
+    size *= 10
@@ -1,5 +1,6 @@
 from vectorObjects.DefinedVectors import Vector2D, Vector3D, VectorRGB
 from vectorObjects.VectorMaster import VectorMaster
+from vectorObjects.VectorFactory import vector_class, make_vector_class
 import operator
 from random import randint
 
@@ -8,10 +9,10 @@ example_vector = Vector3D(4.5, 3.2, 5.6)
 tuple_vector = Vector3D((3, 5, 10), ex=True)
 list_vector = Vector3D([5, 2, 5], ex=True)
 
-example_vector + tuple_vector
+example_vector += tuple_vector
 print(f"Vector3D after addition of b array: {example_vector}\n")
 
-example_vector + 5
+example_vector += 5
 print(f"Vector3D after constant addition: {example_vector}\n")
 
 dot_product = example_vector.dot_product(tuple_vector)
@@ -23,8 +24,16 @@ print(f"Vector3D after normalisation: {list_vector}\n")
 example_vector.cross_product(tuple_vector)
 print(f"Vector3D after cross product: {example_vector}\n")
 
+# Operators return a new vector, whilst in place operators and add_scaled update the vector they are called on
+position = Vector3D(0, 0, 0)
+velocity = Vector3D(1, 2, 3)
+position.add_scaled(velocity, 0.5)
+print(f"Position after half a step of velocity: {position}\n")
 
-# Custom Vector based with VectorMaster inheritance
+
+# Custom Vector based with VectorMaster inheritance. vector_class will generate any of the common methods that are not
+# defined by the class itself, such as __mul__, dot_product or normalise
+@vector_class
 class Vector5D(VectorMaster):
     __slots__ = ["a", "b", "c", "d", "e"]
 
@@ -47,6 +56,13 @@ class Vector5D(VectorMaster):
             self._mathematical_operator(self, other, operator.add)
 
 
+# If you don't need any custom methods, the whole class can be generated from the names of its attributes
+Vector5DGenerated = make_vector_class("Vector5DGenerated", ["a", "b", "c", "d", "e"])
+generated_vector = Vector5DGenerated(1, 2, 3, 4, 5)
+generated_vector *= 2
+print(f"Generated Vector5D after constant multiplication: {generated_vector}\n")
+
+
 width = 3
 height = 3
 
@@ -0,0 +1,440 @@
+from vectorObjects.VectorArrays import as_points
+from vectorObjects.SpatialIndex import _as_queries, _ranges, _offsets
+from vectorObjects.MeshNormals import _as_triangles
+import numpy as np
+
+SPLITS = ("sah", "median")
+
+
+def _surface_areas(lower, upper):
+    extent = upper - lower
+    return 2.0 * (extent[..., 0] * extent[..., 1] + extent[..., 1] * extent[..., 2] + extent[..., 2] * extent[..., 0])
+
+
+def _padded(rows):
+    """
+    Copy rows with its last row repeated, so an end equal to the number of rows is in range of reduceat
+    """
+    return np.vstack([rows, rows[-1:]])
+
+
+def _range_bounds(lower, upper, starts, ends):
+    """
+    The bounds of the rows of lower and upper in each range of starts to ends, which must not be empty, where lower and
+    upper end with a padding row
+    """
+    bounds = np.column_stack([starts, ends]).ravel()
+    return np.minimum.reduceat(lower, bounds, axis=0)[::2], np.maximum.reduceat(upper, bounds, axis=0)[::2]
+
+
+class BVH:
+    """
+    A bounding volume hierarchy over the triangles of an indexed mesh, held as flat arrays of nodes rather than node
+    objects, with the triangles reordered so that the triangles of every node are contiguous. Nodes are split along the
+    widest axis of the centres of their triangles, ether where the surface area heuristic estimates queries are
+    cheapest, or at the median.
+
+    Like vectorObjects.SpatialIndex.KDTree, queries are answered for a whole block of rays or boxes at once by walking
+    the tree breadth first, keeping the (query, node) pairs that can still hold a result at each level. Ray queries
+    prune nodes that are further than the closest hit found so far.
+    """
+    __slots__ = ["vertices", "faces", "leaf_size", "split", "_order", "_lower", "_upper", "_start", "_end", "_left",
+                 "_levels", "_origins", "_edges_1", "_edges_2", "_triangle_lower", "_triangle_upper"]
+
+    # The number of queries processed at once, which bounds the memory used by the candidates of each block
+    _query_block = 4096
+
+    # The number of bins each node is divided into along its axis when evaluating the surface area heuristic
+    _bins = 16
+
+    def __init__(self, vertices, faces, leaf_size=8, split="sah"):
+        """
+        :param vertices: The vertices of the mesh as an (V, 3) array, a Vector3DArray, or a list of Vector3D
+        :type vertices: np.ndarray | Vector3DArray | list
+
+        :param faces: An (F, 3) array of the vertex indices of each triangle
+        :type faces: np.ndarray | list
+
+        :param leaf_size: The maximum number of triangles of a leaf node
+        :type leaf_size: int
+
+        :param split: How nodes are split, sah for the surface area heuristic, which builds slower but answers queries
+            faster, or median
+        :type split: str
+        """
+        if split not in SPLITS:
+            raise ValueError(f"split must be one of {', '.join(SPLITS)} but found {split}")
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size must be at least 1 but found {leaf_size}")
+
+        self.vertices = as_points(vertices).copy()
+        if self.vertices.ndim != 2 or self.vertices.shape[1] != 3:
+            raise ValueError(f"A BVH requires three dimensional vertices but found {self.vertices.shape}")
+
+        self.faces = _as_triangles(faces, len(self.vertices)).copy()
+        if len(self.faces) == 0:
+            raise ValueError("A BVH requires at least one triangle")
+
+        self.leaf_size = leaf_size
+        self.split = split
+        self._build()
+
+    def __repr__(self):
+        return f"BVH({len(self)} triangles, {len(self._start)} nodes, {self.split})"
+
+    def __len__(self):
+        return len(self.faces)
+
+    def _update_triangles(self):
+        """
+        Store the first corner, two edges and the bounds of every triangle in the order of the tree
+        """
+        corners = self.vertices[self.faces[self._order]]
+        self._origins = corners[:, 0]
+        self._edges_1 = corners[:, 1] - corners[:, 0]
+        self._edges_2 = corners[:, 2] - corners[:, 0]
+        self._triangle_lower, self._triangle_upper = corners.min(axis=1), corners.max(axis=1)
+
+    def _build(self):
+        """
+        Build the tree a level at a time, where every node of a level is bounded and split in the same numpy calls
+        """
+        count = len(self.faces)
+        corners = self.vertices[self.faces]
+
+        # The bounds and centre of every triangle are kept in the order of the tree, with a padding row for
+        # _range_bounds, and reordered in place as each level is split
+        triangle_lower, triangle_upper = _padded(corners.min(axis=1)), _padded(corners.max(axis=1))
+        centres = _padded(corners.mean(axis=1))
+        order = np.arange(count)
+
+        lower, upper, starts, ends, lefts, levels = [], [], [], [], [], []
+        level_start, level_end = np.array([0]), np.array([count])
+        node_count = 0
+
+        while len(level_start) > 0:
+            level_lower, level_upper = _range_bounds(triangle_lower, triangle_upper, level_start, level_end)
+            split = (level_end - level_start) > self.leaf_size
+            level_left = np.full(len(level_start), -1, dtype=np.int64)
+            level_left[split] = node_count + len(level_start) + 2 * np.arange(split.sum())
+
+            lower.append(level_lower), upper.append(level_upper), starts.append(level_start), ends.append(level_end)
+            lefts.append(level_left), levels.append((node_count, node_count + len(level_start)))
+            node_count += len(level_start)
+
+            split_start, split_end = level_start[split], level_end[split]
+            if len(split_start) == 0:
+                break
+
+            # Sort the triangles of every node being split by their centres along the widest axis of those centres, so
+            # each half is contiguous. As KDTree, each value is scaled into [node, node + 1) so every node is sorted
+            # with a single argsort.
+            centre_lower, centre_upper = _range_bounds(centres, centres, split_start, split_end)
+            extent = centre_upper - centre_lower
+            axis = np.argmax(extent, axis=1)
+            rows = np.arange(len(axis))
+            width = extent[rows, axis] * 1.000001
+            group, positions = _ranges(split_start, split_end)
+            scaled = (centres[positions, axis[group]] - centre_lower[rows, axis][group]) / \
+                np.where(width > 0, width, 1.0)[group]
+            np.minimum(scaled, 0.999999, out=scaled)
+            sort = np.argsort(group + scaled, kind="stable")
+            reordered = positions[sort]
+            order[positions] = order[reordered]
+            for values in (triangle_lower, triangle_upper, centres):
+                values[positions] = values[reordered]
+
+            middle = (split_start + split_end) // 2
+            if self.split == "sah":
+                middle = self._sah_middle(triangle_lower, triangle_upper, positions, group, scaled[sort], split_start,
+                                          middle)
+
+            level_start = np.column_stack([split_start, middle]).ravel()
+            level_end = np.column_stack([middle, split_end]).ravel()
+
+        self._order = order
+        self._lower, self._upper = np.concatenate(lower), np.concatenate(upper)
+        self._start, self._end, self._left = np.concatenate(starts), np.concatenate(ends), np.concatenate(lefts)
+        self._levels = levels
+        self._update_triangles()
+
+    def _sah_middle(self, triangle_lower, triangle_upper, positions, group, scaled, split_start, median):
+        """
+        The position every node is split at, where the triangles of each node are sorted along its axis and divided
+        into bins, and the split between bins with the lowest area weighted count of triangles on each side is chosen.
+        Nodes whose centres all share one bin are split at the median.
+        """
+        nodes, bins = len(split_start), self._bins
+        key = group * bins + (scaled * bins).astype(np.int64)
+
+        # The triangles of each bin are a contiguous range of rows, which are bounded in the same way as nodes
+        first = np.flatnonzero(np.concatenate([[True], key[1:] != key[:-1]]))
+        last = np.concatenate([first[1:], [len(key)]]) - 1
+        bounds_lower, bounds_upper = _range_bounds(triangle_lower, triangle_upper, positions[first],
+                                                   positions[last] + 1)
+        bin_lower = np.full((nodes * bins, 3), np.inf)
+        bin_upper = np.full((nodes * bins, 3), -np.inf)
+        bin_lower[key[first]], bin_upper[key[first]] = bounds_lower, bounds_upper
+        bin_lower, bin_upper = bin_lower.reshape(nodes, bins, 3), bin_upper.reshape(nodes, bins, 3)
+
+        left_counts = np.cumsum(np.bincount(key, minlength=nodes * bins).reshape(nodes, bins), axis=1)
+        right_counts = left_counts[:, -1:] - left_counts
+
+        left_area = _surface_areas(np.minimum.accumulate(bin_lower, axis=1), np.maximum.accumulate(bin_upper, axis=1))
+        right_area = _surface_areas(np.minimum.accumulate(bin_lower[:, ::-1], axis=1)[:, ::-1],
+                                    np.maximum.accumulate(bin_upper[:, ::-1], axis=1)[:, ::-1])
+
+        # Splitting after bin j puts bins 0 to j on the left and j + 1 onwards on the right
+        with np.errstate(invalid="ignore"):
+            cost = left_area[:, :-1] * left_counts[:, :-1] + right_area[:, 1:] * right_counts[:, :-1]
+        cost = np.where((left_counts[:, :-1] > 0) & (right_counts[:, :-1] > 0), cost, np.inf)
+
+        best = np.argmin(cost, axis=1)
+        rows = np.arange(nodes)
+        return np.where(np.isfinite(cost[rows, best]), split_start + left_counts[rows, best], median)
+
+    def refit(self, vertices=None):
+        """
+        Update the bounds of every node after the vertices have moved, keeping the structure of the tree. This is much
+        faster than building a new tree, but queries slow down as the vertices move further from where the tree was
+        built.
+
+        :param vertices: The new position of every vertex, of the same shape as the vertices the tree was built with,
+            or None if self.vertices was updated in place
+        :type vertices: np.ndarray | Vector3DArray | list | None
+        """
+        if vertices is not None:
+            vertices = as_points(vertices)
+            if vertices.shape != self.vertices.shape:
+                raise ValueError(f"Refitting requires vertices of shape {self.vertices.shape} but found "
+                                 f"{vertices.shape}")
+            self.vertices[:] = vertices
+
+        self._update_triangles()
+        leaves = np.flatnonzero(self._left < 0)
+        self._lower[leaves], self._upper[leaves] = _range_bounds(_padded(self._triangle_lower),
+                                                                 _padded(self._triangle_upper), self._start[leaves],
+                                                                 self._end[leaves])
+
+        # Every child is in the level after its parent, so the deepest levels are bounded first
+        for first, last in reversed(self._levels):
+            nodes = np.arange(first, last)
+            children = self._left[nodes]
+            internal = children >= 0
+            nodes, children = nodes[internal], children[internal]
+            self._lower[nodes] = np.minimum(self._lower[children], self._lower[children + 1])
+            self._upper[nodes] = np.maximum(self._upper[children], self._upper[children + 1])
+
+    def _entry(self, origins, inverse, nodes):
+        """
+        The distance along each ray at which it enters the bounding box of its node, or inf if it misses. Where a ray
+        runs along the face of a box the product of 0 and inf is nan, which fmin and fmax ignore.
+        """
+        with np.errstate(invalid="ignore"):
+            near = (self._lower[nodes] - origins) * inverse
+            far = (self._upper[nodes] - origins) * inverse
+        entry = np.maximum(np.fmax.reduce(np.fmin(near, far), axis=1), 0.0)
+        leave = np.fmin.reduce(np.fmax(near, far), axis=1)
+        return np.where(entry <= leave, entry, np.inf)
+
+    def _intersect(self, origins, directions, triangles):
+        """
+        The distance along each ray at which it hits its triangle, or inf if it misses, by the Moller-Trumbore
+        algorithm. Both sides of each triangle are hit, and degenerate triangles are never hit.
+        """
+        edges_1, edges_2 = self._edges_1[triangles], self._edges_2[triangles]
+        p = np.cross(directions, edges_2)
+        determinant = np.einsum("ij,ij->i", edges_1, p)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1.0 / determinant
+            s = origins - self._origins[triangles]
+            u = np.einsum("ij,ij->i", s, p) * inverse
+            q = np.cross(s, edges_1)
+            v = np.einsum("ij,ij->i", directions, q) * inverse
+            t = np.einsum("ij,ij->i", edges_2, q) * inverse
+
+            hit = (determinant != 0) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+        return np.where(hit, t, np.inf)
+
+    def _ray_hits(self, origins, directions, limits, closest):
+        """
+        Walk the tree for a block of rays, returning the closest hit of every ray, or every (ray, triangle, distance)
+        hit within the limit of each ray
+        """
+        count = len(origins)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / directions
+
+        best = limits.copy()
+        best_triangles = np.full(count, -1, dtype=np.int64)
+        hit_rays, hit_triangles, hit_distances = [], [], []
+
+        rays, nodes = np.arange(count), np.zeros(count, dtype=np.int64)
+        while len(rays) > 0:
+            entry = self._entry(origins[rays], inverse[rays], nodes)
+            kept = (entry <= best[rays]) & (entry < np.inf)
+            rays, nodes = rays[kept], nodes[kept]
+
+            leaf = self._left[nodes] < 0
+            group, triangles = _ranges(self._start[nodes[leaf]], self._end[nodes[leaf]])
+            leaf_rays = rays[leaf][group]
+            distances = self._intersect(origins[leaf_rays], directions[leaf_rays], triangles)
+
+            found = (distances <= best[leaf_rays]) & (distances < np.inf)
+            leaf_rays, triangles, distances = leaf_rays[found], triangles[found], distances[found]
+            if closest and len(leaf_rays) > 0:
+                order = np.lexsort((distances, leaf_rays))
+                leaf_rays, triangles, distances = leaf_rays[order], triangles[order], distances[order]
+                first = np.concatenate([[True], leaf_rays[1:] != leaf_rays[:-1]])
+                best[leaf_rays[first]] = distances[first]
+                best_triangles[leaf_rays[first]] = triangles[first]
+            elif not closest:
+                hit_rays.append(leaf_rays), hit_triangles.append(triangles), hit_distances.append(distances)
+
+            rays, children = rays[~leaf], self._left[nodes[~leaf]]
+            rays = np.repeat(rays, 2)
+            nodes = np.column_stack([children, children + 1]).ravel()
+
+        if closest:
+            hit = best_triangles >= 0
+            best_triangles[hit] = self._order[best_triangles[hit]]
+            return best_triangles, np.where(hit, best, np.inf)
+
+        if not hit_rays:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(hit_rays), self._order[np.concatenate(hit_triangles)], np.concatenate(hit_distances)
+
+    def _rays(self, origins, directions, limits, single, closest, scale=None):
+        """
+        Answer ray queries a block at a time, gathering the results of every block
+        """
+        if closest:
+            triangles, distances = np.empty(len(origins), dtype=np.int64), np.empty(len(origins))
+        else:
+            all_rays, all_triangles, all_distances = [], [], []
+
+        for start in range(0, len(origins), self._query_block):
+            block = slice(start, start + self._query_block)
+            results = self._ray_hits(origins[block], directions[block], limits[block], closest)
+            if closest:
+                triangles[block], distances[block] = results
+            else:
+                all_rays.append(results[0] + start), all_triangles.append(results[1]), all_distances.append(results[2])
+
+        if closest:
+            if scale is not None:
+                hit = triangles >= 0
+                distances[hit] *= scale[hit]
+            return (int(triangles[0]), float(distances[0])) if single else (triangles, distances)
+
+        rays, triangles, distances = (np.concatenate(all_rays), np.concatenate(all_triangles),
+                                      np.concatenate(all_distances))
+        if scale is not None:
+            distances *= scale[rays]
+        order = np.lexsort((triangles, distances, rays))
+        triangles, distances = triangles[order], distances[order]
+        return (triangles, distances) if single else (triangles, distances, _offsets(rays, len(origins)))
+
+    def intersect_rays(self, origins, directions, max_distance=np.inf, closest=True):
+        """
+        Find the triangles hit by each ray. Distances are measured in multiples of the length of each direction, which
+        is the distance itself when directions are of unit length.
+
+        :param origins: The origin of a single ray, such as a Vector3D, or of a batch of rays as an (R, 3) array, a
+            Vector3DArray, or a list of Vector3D
+        :type origins: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param directions: The direction of each ray, of the same form as origins. A single origin or direction is
+            shared by every ray
+        :type directions: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param max_distance: Ignore hits further along each ray than this, ether one distance for every ray or one per
+            ray
+        :type max_distance: float | np.ndarray
+
+        :param closest: If True only find the closest hit of each ray, otherwise find every hit
+        :type closest: bool
+
+        :return: If closest, the index of the face and the distance of the closest hit of each ray, with -1 and inf
+            where a ray hits nothing, as an int and float for a single ray or arrays of shape (R, ) for a batch.
+            Otherwise the faces and distances of every hit in order of distance, where for a batch the hits of every
+            ray are concatenated along with (R + 1) offsets so ray i hit faces[offsets[i]:offsets[i + 1]]
+        :rtype: (int, float) | (np.ndarray, np.ndarray) | (np.ndarray, np.ndarray, np.ndarray)
+        """
+        origins, single_origin = _as_queries(origins, 3)
+        directions, single_direction = _as_queries(directions, 3)
+        origins, directions = np.broadcast_arrays(origins, directions)
+        limits = np.broadcast_to(np.asarray(max_distance, dtype=np.float64), (len(origins), )).copy()
+        return self._rays(origins, directions, limits, single_origin and single_direction, closest)
+
+    def intersect_segments(self, starts, ends, closest=True):
+        """
+        Find the triangles crossed by each line segment, such as to test if the line of sight between two points is
+        blocked. Distances are measured from the start of each segment, and segments of zero length hit nothing.
+
+        :param starts: The start of a single segment, or of a batch of segments, of the forms accepted by intersect_rays
+        :type starts: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param ends: The end of each segment, of the same form as starts
+        :type ends: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param closest: If True only find the hit closest to the start of each segment, otherwise find every hit
+        :type closest: bool
+
+        :return: As intersect_rays
+        :rtype: (int, float) | (np.ndarray, np.ndarray) | (np.ndarray, np.ndarray, np.ndarray)
+        """
+        starts, single_start = _as_queries(starts, 3)
+        ends, single_end = _as_queries(ends, 3)
+        starts, ends = np.broadcast_arrays(starts, ends)
+
+        directions = ends - starts
+        lengths = np.linalg.norm(directions, axis=1)
+        limits = np.where(lengths > 0, 1.0, -1.0)
+        return self._rays(starts, directions, limits, single_start and single_end, closest, lengths)
+
+    def query_box(self, lower, upper):
+        """
+        Find every triangle whose bounding box overlaps an axis aligned box, inclusive of its bounds
+
+        :param lower: The minimum corner of a single box, or the minimum corners of a batch of boxes
+        :type lower: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param upper: The maximum corner of each box, of the same form as lower
+        :type upper: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :return: For a single box the faces found in ascending order. For a batch the faces of every box concatenated,
+            along with (Q + 1) offsets so box i found faces[offsets[i]:offsets[i + 1]]
+        :rtype: np.ndarray | (np.ndarray, np.ndarray)
+        """
+        lower, single = _as_queries(lower, 3)
+        upper, _ = _as_queries(upper, 3)
+        lower, upper = np.broadcast_arrays(lower, upper)
+        if (lower > upper).any():
+            raise ValueError("The lower corner of a box cannot be greater than its upper corner")
+
+        box_ids, faces = [], []
+        for start in range(0, len(lower), self._query_block):
+            block_lower, block_upper = lower[start:start + self._query_block], upper[start:start + self._query_block]
+            boxes, nodes = np.arange(len(block_lower)), np.zeros(len(block_lower), dtype=np.int64)
+
+            while len(boxes) > 0:
+                kept = ((self._lower[nodes] <= block_upper[boxes]).all(axis=1) &
+                        (self._upper[nodes] >= block_lower[boxes]).all(axis=1))
+                boxes, nodes = boxes[kept], nodes[kept]
+
+                leaf = self._left[nodes] < 0
+                group, triangles = _ranges(self._start[nodes[leaf]], self._end[nodes[leaf]])
+                leaf_boxes = boxes[leaf][group]
+                found = ((self._triangle_lower[triangles] <= block_upper[leaf_boxes]).all(axis=1) &
+                         (self._triangle_upper[triangles] >= block_lower[leaf_boxes]).all(axis=1))
+                box_ids.append(leaf_boxes[found] + start), faces.append(self._order[triangles[found]])
+
+                boxes, children = boxes[~leaf], self._left[nodes[~leaf]]
+                boxes = np.repeat(boxes, 2)
+                nodes = np.column_stack([children, children + 1]).ravel()
+
+        box_ids, faces = np.concatenate(box_ids), np.concatenate(faces)
+        faces = faces[np.lexsort((faces, box_ids))]
+        return faces if single else (faces, _offsets(box_ids, len(lower)))
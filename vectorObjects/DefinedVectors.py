@@ -1,9 +1,11 @@
 from vectorObjects.VectorMaster import VectorMaster
-import operator
+from vectorObjects.VectorFactory import vector_class
+from vectorObjects.MatrixCache import MatrixCache
 import math
 import numpy as np
 
 
+@vector_class
 class Vector2D(VectorMaster):
     """
     A vector object for working with 2D coordinates or uv values.
@@ -11,132 +13,6 @@ class Vector2D(VectorMaster):
     """
     __slots__ = ['x', 'y']
 
-    def __init__(self, *args, ex=False):
-        # If the user is passing a list or tuple, then we need to set the args from _load
-        if ex:
-            self.x, self.y = self._load(args)
-        else:
-            self.x, self.y = args
-
-    def __repr__(self):
-        """
-        Return for debugging
-        """
-        return f"{self.x, self.y}"
-
-    def __str__(self):
-        """
-        Print return for code readability
-        """
-        return f"{self.x, self.y}"
-
-    def __getitem__(self, item):
-        """
-        Allows for index calling returns in order of x, y.
-        """
-        if item == 0:
-            return self.x
-        elif item == 1:
-            return self.y
-        else:
-            raise IndexError("Index out of range: Vector 2D has x[0] and y[1] items. Item calls greater than 1 "
-                             "not permitted")
-
-    def __iter__(self):
-        """
-        Allows for iteration in order x, y.
-        """
-        yield self.x
-        yield self.y
-
-    def __add__(self, other):
-        """
-        Add ether another instance of vector 2D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector2D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.add)
-
-    def __sub__(self, other):
-        """
-        Subtract ether another instance of vector 2D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector2D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.sub)
-
-    def __mul__(self, other):
-        """
-        Multiply ether another instance of vector 2D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector2D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.mul)
-
-    def __truediv__(self, other):
-        """
-        Divide ether another instance of vector 2D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector2D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.truediv)
-
-    def __neg__(self):
-        """
-        Invert the sign of all elements
-        """
-        return self._negative(self)
-
-    def __eq__(self, other):
-        """
-        See if two vectors are equal
-        """
-        return self._equality(self, other)
-
-    def __ne__(self, other):
-        """
-        Opposite of equality
-        """
-        return not self.__eq__(other)
-
-    def to_tuple(self):
-        """
-        Returns a tuple representation of type (x, y)
-        """
-        return self._return_tuple(self)
-
-    def to_list(self):
-        """
-        Returns a list representation of type [x, y]
-        """
-        return self._return_list(self)
-
-    def dot_product(self, other):
-        """
-        Calculate the dot product of two instances of the same class object
-        """
-        return self._return_dot_product(self, other)
-
-    def cross_product(self, other):
-        """
-        Calculate the cross product of two instances of the same class object
-        """
-        return self._return_cross_product(self, other)
-
-    def normalise(self):
-        """
-        Normalise attributes
-        """
-        return self._normalise_attributes(self)
-
     def rotate_around_point(self, radians, origin=(0, 0), rounding=7):
         """
         Rotate the vector of current point counter clockwise around another point if defined else the origin
@@ -156,219 +32,16 @@ class Vector2D(VectorMaster):
 
         return round(qx, rounding), round(qy, rounding)
 
-    def sub_divide(self, other, sub_divisions, from_self=True, include_points=True):
-        """
-        This takes the current instance of vector2D and another instance of Vector 2D and in-betweens the points into
-        multiple Vector2D objects equal in length to the sub_divisions.
-
-        :param other: Another instance of a Vector2D object
-        :type other: Vector2D
-
-        :param sub_divisions: The number of Vector 2D objects you want have calculated between this vector and other
-        :type sub_divisions: int
-
-        :param from_self: By default this will create a sub divided list from this point to the next point. If you want
-            the opposite, ie from the other point to this point, set to False
-        :type from_self: bool
-
-        :param include_points: If True the returned list will include the points
-        :type include_points: bool
-
-        :return: A list of Vector2D, with The current instance and previous instance being the first or last based on
-            from_self, with the number of subdivided points between them in form Vector2D equal to sub_divisions.
-        :rtype: list[Vector2D]
-        """
-
-        if from_self:
-            x_spaced = [float(x) for x in np.linspace(self.x, other.x, 2 + sub_divisions)]
-            y_spaced = [float(y) for y in np.linspace(self.y, other.y, 2 + sub_divisions)]
-
-        else:
-            x_spaced = [float(x) for x in np.linspace(other.x, self.x, 2 + sub_divisions)]
-            y_spaced = [float(y) for y in np.linspace(other.y, self.y, 2 + sub_divisions)]
-
-        if include_points:
-            return [Vector2D(x, y) for x, y in zip(x_spaced, y_spaced)]
-        else:
-            return [Vector2D(x, y) for x, y in zip(x_spaced[1:-1], y_spaced[1:-1])]
-
 
+@vector_class
 class Vector3D(VectorMaster):
     """
     A vector object for working with 3D coordinates such as vertex positions in 3D space or a normal direction.
     """
     __slots__ = ["x", "y", "z"]
 
-    def __init__(self, *args, ex=False):
-        # If the user is passing a list or tuple, then we need to set the args from _load
-        if ex:
-            self.x, self.y, self.z = self._load(args)
-        else:
-            self.x, self.y, self.z = args
-
-    def __repr__(self):
-        """
-        Return for debugging
-        """
-        return f"{self.x, self.y, self.z}"
-
-    def __str__(self):
-        """
-        Print return for code readability
-        """
-        return f"{self.x, self.y, self.z}"
-
-    def __getitem__(self, item):
-        """
-        Allows for index calling returns in order of x, y, z.
-        """
-        if item == 0:
-            return self.x
-        elif item == 1:
-            return self.y
-        elif item == 2:
-            return self.z
-        else:
-            raise IndexError("Index out of range: Vector 3D has x[0], y[1] and z[2] items. Item calls greater than 2 "
-                             "not permitted")
-
-    def __iter__(self):
-        """
-        Allows for iteration in order x, y, z
-        """
-        yield self.x
-        yield self.y
-        yield self.z
-
-    def __add__(self, other):
-        """
-        Add ether another instance of vector 3D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector3D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.add)
-
-    def __sub__(self, other):
-        """
-        Subtract ether another instance of vector 3D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector3D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.sub)
-
-    def __mul__(self, other):
-        """
-        Multiply ether another instance of vector 3D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector3D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.mul)
-
-    def __truediv__(self, other):
-        """
-        Divide ether another instance of vector 3D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector3D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.truediv)
-
-    def __neg__(self):
-        """
-        Invert the sign of all elements
-        """
-        return self._negative(self)
-
-    def __eq__(self, other):
-        """
-        See if two vectors are equal
-        """
-        return self._equality(self, other)
-
-    def __ne__(self, other):
-        """
-        Opposite of equality
-        """
-        return not self.__eq__(other)
-
-    def to_tuple(self):
-        """
-        Returns a tuple representation of type (x, y, z)
-        """
-        return self._return_tuple(self)
-
-    def to_list(self):
-        """
-        Returns a list representation of type [x, y ,z]
-        """
-        return self._return_list(self)
-
-    def dot_product(self, other):
-        """
-        Calculate the dot product of two instances of the same class object
-        """
-        return self._return_dot_product(self, other)
-
-    def cross_product(self, other):
-        """
-        Calculate the cross product of two instances of the same class object
-        """
-        return self._return_cross_product(self, other)
-
-    def normalise(self):
-        """
-        Normalise attributes
-        """
-        return self._normalise_attributes(self)
-
-    def sub_divide(self, other, sub_divisions, from_self=True, include_points=True):
-        """
-        This takes the current instance of vector2D and another instance of Vector3D and in-betweens the points into
-        multiple Vector3D objects equal in length to the sub_divisions.
-
-        :param other: Another instance of a Vector3D object
-        :type other: Vector3D
-
-        :param sub_divisions: The number of Vector3D objects you want have calculated between this vector and other
-        :type sub_divisions: int
-
-        :param from_self: By default this will create a sub divided list from this point to the next point. If you want
-            the opposite, ie from the other point to this point, set to False
-        :type from_self: bool
-
-        :param include_points: If True the returned list will include the points
-        :type include_points: bool
-
-        :return: A list of Vector3D, with The current instance and previous instance being the first or last based on
-            from_self, with the number of subdivided points between them in form Vector2D equal to sub_divisions.
-        :rtype: list[Vector3D]
-        """
-
-        # todo Need to generalise sub_divde
-
-        if from_self:
-            x_spaced = [float(x) for x in np.linspace(self.x, other.x, 2 + sub_divisions)]
-            y_spaced = [float(y) for y in np.linspace(self.y, other.y, 2 + sub_divisions)]
-            z_spaced = [float(z) for z in np.linspace(self.z, other.z, 2 + sub_divisions)]
-
-        else:
-            x_spaced = [float(x) for x in np.linspace(other.x, self.x, 2 + sub_divisions)]
-            y_spaced = [float(y) for y in np.linspace(other.y, self.y, 2 + sub_divisions)]
-            z_spaced = [float(z) for z in np.linspace(other.z, self.z, 2 + sub_divisions)]
-
-        if include_points:
-            return [Vector3D(x, y, z) for x, y, z in zip(x_spaced, y_spaced, z_spaced)]
-        else:
-            return [Vector3D(x, y, z) for x, y, z in zip(x_spaced[1:-1], y_spaced[1:-1], z_spaced[1: -1])]
-
 
+@vector_class
 class VectorRGB(VectorMaster):
     """
     A vector object for working with 3D coordinates such as vertex positions in 3D space or a normal direction.
@@ -379,129 +52,14 @@ class VectorRGB(VectorMaster):
         super().__init__()
         self.r, self.g, self.b = self._load(args)
 
-    def __repr__(self):
-        """
-        Return for debugging
-        """
-        return f"{self.r, self.g, self.b}"
-
     def __str__(self):
         """
         Print return for code readability
         """
         return f"R: {self.r}, G: {self.g}, B: {self.b}"
 
-    def __getitem__(self, item):
-        """
-        Allows for index calling returns in order of r, g, b.
-        """
-        if item == 0:
-            return self.r
-        elif item == 1:
-            return self.g
-        elif item == 2:
-            return self.b
-        else:
-            raise IndexError("Index out of range: Vector RGB has r[0], g[1] and b[2] items. Item calls greater than 2 "
-                             "not permitted")
-
-    def __iter__(self):
-        """
-        Allows for iteration in order r, g, b
-        """
-        yield self.r
-        yield self.g
-        yield self.b
-
-    def __add__(self, other):
-        """
-        Add ether another instance of VectorRGB, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: VectorRGB | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.add)
-
-    def __sub__(self, other):
-        """
-        Subtract ether another instance of VectorRGB, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: VectorRGB | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.sub)
-
-    def __mul__(self, other):
-        """
-        Multiply ether another instance of VectorRGB, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: VectorRGB | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.mul)
-
-    def __truediv__(self, other):
-        """
-        Divide ether another instance of VectorRGB, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: VectorRGB | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.truediv)
-
-    def __neg__(self):
-        """
-        Invert the sign of all elements
-        """
-        return self._negative(self)
-
-    def __eq__(self, other):
-        """
-        See if two vectors are equal
-        """
-        return self._equality(self, other)
-
-    def __ne__(self, other):
-        """
-        Opposite of equality
-        """
-        return not self.__eq__(other)
-
-    def to_tuple(self):
-        """
-        Returns a tuple representation of type (r, g, b)
-        """
-        return self._return_tuple(self)
-
-    def to_list(self):
-        """
-        Returns a list representation of type [r, g ,b]
-        """
-        return self._return_list(self)
-
-    def dot_product(self, other):
-        """
-        Calculate the dot product of two instances of the same class object
-        """
-        return self._return_dot_product(self, other)
-
-    def cross_product(self, other):
-        """
-        Calculate the cross product of two instances of the same class object
-        """
-        return self._return_cross_product(self, other)
-
-    def normalise(self):
-        """
-        Normalise attributes
-        """
-        return self._normalise_attributes(self)
-
 
+@vector_class
 class Vector4D(VectorMaster):
     """
     Vector for 4D vertex coordinates and normal directions
@@ -509,138 +67,6 @@ class Vector4D(VectorMaster):
 
     __slots__ = ['x', 'y', 'z', 'w']
 
-    def __init__(self, *args, ex=False):
-        # If the user is passing a list or tuple, then we need to set the args from _load
-        if ex:
-            self.x, self.y, self.z, self.w = self._load(args)
-        else:
-            self.x, self.y, self.z, self.w = args
-
-    def __repr__(self):
-        """
-        Return for debugging
-        """
-        return f"{self.x, self.y, self.z, self.w}"
-
-    def __str__(self):
-        """
-        Print return for code readability
-        """
-        return f"{self.x, self.y, self.z, self.w}"
-
-    def __getitem__(self, item):
-        """
-        Allows for index calling returns in order of x, y, z, w.
-        """
-        if item == 0:
-            return self.x
-        elif item == 1:
-            return self.y
-        elif item == 2:
-            return self.z
-        elif item == 3:
-            return self.w
-        else:
-            raise IndexError("Index out of range: Vector 4D has x[0], y[1], z[2], and w[3] items. Item calls greater"
-                             " than 3 not permitted")
-
-    def __iter__(self):
-        """
-        Allows for iteration in order x, y, z, w
-        """
-        yield self.x
-        yield self.y
-        yield self.z
-        yield self.w
-
-    def __add__(self, other):
-        """
-        Add ether another instance of vector 4D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector4D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.add)
-
-    def __sub__(self, other):
-        """
-        Subtract ether another instance of vector 4D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector4D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.sub)
-
-    def __mul__(self, other):
-        """
-        Multiply ether another instance of vector 4D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector4D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.mul)
-
-    def __truediv__(self, other):
-        """
-        Divide ether another instance of vector 4D, an int/float as a constant to all attributes, or a list/tuple of
-        values of equal length to the number of attributes
-
-        :type other: Vector4D | int | float | list | tuple
-        :rtype: tuple
-        """
-        return self._mathematical_operator(self, other, operator.truediv)
-
-    def __neg__(self):
-        """
-        Invert the sign of all elements
-        """
-        return self._negative(self)
-
-    def __eq__(self, other):
-        """
-        See if two vectors are equal
-        """
-        return self._equality(self, other)
-
-    def __ne__(self, other):
-        """
-        Opposite of equality
-        """
-        return not self.__eq__(other)
-
-    def to_tuple(self):
-        """
-        Returns a tuple representation of type (x, y, z, w)
-        """
-        return self._return_tuple(self)
-
-    def to_list(self):
-        """
-        Returns a list representation of type [x, y ,z, w]
-        """
-        return self._return_list(self)
-
-    def dot_product(self, other):
-        """
-        Calculate the dot product of two instances of the same class object
-        """
-        return self._return_dot_product(self, other)
-
-    def cross_product(self, other):
-        """
-        Calculate the cross product of two instances of the same class object
-        """
-        return self._return_cross_product(self, other)
-
-    def normalise(self):
-        """
-        Normalise attributes
-        """
-        return self._normalise_attributes(self)
-
 
 class PymeshioQuaternion(VectorMaster):
     """
@@ -655,6 +81,9 @@ class PymeshioQuaternion(VectorMaster):
     """
     __slots__ = ['x', 'y', 'z', 'w']
 
+    # An optional MatrixCache shared by all instances, set via enable_matrix_cache
+    _matrix_cache = None
+
     def __init__(self, x=0, y=0, z=0, w=1):
         super().__init__()
         self.x = x
@@ -712,7 +141,49 @@ class PymeshioQuaternion(VectorMaster):
             [0, 0, 0, 1]],
             'f')
 
+    @classmethod
+    def enable_matrix_cache(cls, max_size=1024, digits=None):
+        """
+        Cache the results of getMatrix, getRHMatrix and getRollPitchYaw in a bounded least recently used cache keyed by
+        the components of each quaternion. Cached matrices are read only.
+
+        :param max_size: The maximum number of entries to cache
+        :type max_size: int
+
+        :param digits: The number of decimal places of the components used as the key, or None to use them exactly
+        :type digits: int | None
+
+        :return: The cache, which holds the hit, miss and eviction counters
+        :rtype: MatrixCache
+        """
+        cls._matrix_cache = MatrixCache(max_size, digits)
+        return cls._matrix_cache
+
+    @classmethod
+    def disable_matrix_cache(cls):
+        """
+        Stop caching matrices, removing the cache
+        """
+        cls._matrix_cache = None
+
+    def _cached(self, name, calculate):
+        """
+        Return the result of calculate via the matrix cache if it is enabled
+        """
+        if self._matrix_cache is None:
+            return calculate()
+        return self._matrix_cache.get(name, (self.x, self.y, self.z, self.w), calculate)
+
     def getMatrix(self):
+        return self._cached("matrix", self._calculate_matrix)
+
+    def getRHMatrix(self):
+        return self._cached("rh_matrix", self._calculate_rh_matrix)
+
+    def getRollPitchYaw(self):
+        return self._cached("roll_pitch_yaw", self._calculate_roll_pitch_yaw)
+
+    def _calculate_matrix(self):
         sqX = self.x*self.x
         sqY = self.y*self.y
         sqZ = self.z*self.z
@@ -724,7 +195,7 @@ class PymeshioQuaternion(VectorMaster):
         wz = self.w*self.z
         return self._mmd_quaternion_array(sqY, sqZ, xy, wz, xz, wy, sqX, yz, wx)
 
-    def getRHMatrix(self):
+    def _calculate_rh_matrix(self):
         x = -self.x
         y = -self.y
         z = self.z
@@ -740,7 +211,7 @@ class PymeshioQuaternion(VectorMaster):
         wz = w*z
         return self._mmd_quaternion_array(sqY, sqZ, xy, wz, xz, wy, sqX, yz, wx)
 
-    def getRollPitchYaw(self):
+    def _calculate_roll_pitch_yaw(self):
         m=self.getMatrix()
 
         roll = math.atan2(m[0, 1], m[1, 1])
@@ -0,0 +1,597 @@
+from vectorObjects.VectorArrays import VectorArrayMaster
+from vectorObjects.VectorMaster import VectorMaster
+from vectorObjects.Precision import resolve, _state, _to_float32
+import linecache
+import math
+import numpy as np
+
+# The numpy ufunc and source symbol of each binary operation
+_BINARY = {
+    "add": (np.add, "+"),
+    "subtract": (np.subtract, "-"),
+    "multiply": (np.multiply, "*"),
+    "divide": (np.true_divide, "/"),
+}
+
+# Leaves hold a value rather than operating on other expressions. Arguments are the parameters of a fused function,
+# which are bound to a value on each call.
+_LEAVES = {"rows", "vector", "constant", "scalar", "argument"}
+
+# The generated scalar kernels of each structure of expression and precision policy
+_SCALAR_KERNELS = {}
+
+
+def _vector_type(cls):
+    """
+    The class that defines the attributes of a vector, skipping subclasses such as VectorRGBView that only add their
+    own private slots
+    """
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        if slots and not any(slot.startswith("_") for slot in slots):
+            return base
+    raise TypeError(f"Unable to find the attributes of {cls.__name__}")
+
+
+def _leaf(value):
+    """
+    Wrap a value as an expression: a batch or (N, k) array as rows, an (N, ) array as one scalar per row, a vector or
+    list/tuple as the same vector for every row, or an int/float as a constant for every attribute
+    """
+    if isinstance(value, Expression):
+        return value
+
+    elif isinstance(value, VectorArrayMaster):
+        return Expression("rows", (value.data, ), value.width(), value.vector_type)
+
+    elif isinstance(value, np.ndarray):
+        if value.ndim == 2:
+            return Expression("rows", (value, ), value.shape[1])
+        elif value.ndim == 1:
+            return Expression("rows", (value.reshape(-1, 1), ), 1)
+        raise ValueError(f"Arrays are expected to be of shape (N, k) or (N, ) but found {value.shape}")
+
+    elif isinstance(value, VectorMaster):
+        vector_type = _vector_type(type(value))
+        return Expression("vector", (value, ), len(vector_type.__slots__), vector_type)
+
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        return Expression("scalar", (float(value), ), 0)
+
+    elif isinstance(value, (list, tuple)):
+        return Expression("constant", (tuple(float(v) for v in value), ), len(value))
+
+    raise TypeError(f"Expressions cannot operate with type {type(value)}")
+
+
+def _combined_width(left, right):
+    """
+    The width of the result of a binary operation, where a width of 0 is a constant and a width of 1 is one scalar per
+    row, both of which broadcast against every attribute
+    """
+    if left.width == right.width or min(left.width, right.width) <= 1:
+        return max(left.width, right.width)
+    raise ValueError(f"Expressions must have the same number of attributes but found {left.width} and {right.width}")
+
+
+def lazy(value):
+    """
+    Start a deferred expression from a batch, array, vector, list/tuple or number. Arithmetic on the expression builds
+    a tree rather than calculating anything, which is then calculated in a single pass by evaluate.
+
+    :rtype: Expression
+    """
+    return _leaf(value)
+
+
+class Expression:
+    """
+    A deferred calculation over batches or single vectors, built by arithmetic on the result of lazy.
+
+    evaluate calculates a batch a chunk of rows at a time, with each step writing into a small buffer that is reused
+    for every chunk, so there is no full size temporary per step and the data of each chunk stays in cache. Expressions
+    of single vectors are compiled into a function of unrolled attribute arithmetic, cached by the structure of the
+    expression, so there are no intermediate vectors, although building and looking up the expression on every call
+    costs more than the operators save. Use fuse for single vectors in a loop. The precision policy is applied after
+    each step as the eager operators do, so results are the same as evaluating the expression eagerly.
+    """
+    __slots__ = ["operation", "operands", "width", "vector_type"]
+
+    def __init__(self, operation, operands, width, vector_type=None):
+        self.operation = operation
+        self.operands = operands
+        self.width = width
+        self.vector_type = vector_type
+
+    def __repr__(self):
+        return f"Expression({self._describe()})"
+
+    def _describe(self):
+        if self.operation == "rows":
+            return f"rows{self.operands[0].shape}"
+        elif self.operation == "argument":
+            return f"argument {self.operands[0]}"
+        elif self.operation in ("vector", "constant", "scalar"):
+            return repr(self.operands[0])
+        elif self.operation in _BINARY:
+            return f"({self.operands[0]._describe()} {_BINARY[self.operation][1]} {self.operands[1]._describe()})"
+        return f"{self.operation}({', '.join(operand._describe() for operand in self.operands)})"
+
+    def _binary(self, other, operation, reflected=False):
+        other = _leaf(other)
+        left, right = (other, self) if reflected else (self, other)
+        width = _combined_width(left, right)
+        vector_type = next((operand.vector_type for operand in (left, right) if operand.width == width and
+                            operand.vector_type is not None), None)
+        return Expression(operation, (left, right), width, vector_type)
+
+    def __add__(self, other):
+        return self._binary(other, "add")
+
+    def __radd__(self, other):
+        return self._binary(other, "add", True)
+
+    def __sub__(self, other):
+        return self._binary(other, "subtract")
+
+    def __rsub__(self, other):
+        return self._binary(other, "subtract", True)
+
+    def __mul__(self, other):
+        return self._binary(other, "multiply")
+
+    def __rmul__(self, other):
+        return self._binary(other, "multiply", True)
+
+    def __truediv__(self, other):
+        return self._binary(other, "divide")
+
+    def __rtruediv__(self, other):
+        return self._binary(other, "divide", True)
+
+    def __neg__(self):
+        return Expression("negative", (self, ), self.width, self.vector_type)
+
+    def _require_vector(self, name):
+        if self.width < 2:
+            raise ValueError(f"{name} requires an expression of vectors but found a width of {self.width}")
+
+    def dot(self, other):
+        """
+        The dot product of each row with other, as one scalar per row
+        """
+        other = _leaf(other)
+        self._require_vector("dot")
+        if other.width != self.width:
+            raise ValueError(f"Dot products require the same number of attributes but found {self.width} and "
+                             f"{other.width}")
+        return Expression("dot", (self, other), 1)
+
+    def lengths(self):
+        """
+        The euclidean length of each row, as one scalar per row
+        """
+        self._require_vector("lengths")
+        return Expression("length", (self, ), 1)
+
+    def normalise(self):
+        """
+        Each row divided by its length. Like the eager normalise only a float32 precision policy is applied
+        """
+        self._require_vector("normalise")
+        return Expression("normalise", (self, ), self.width, self.vector_type)
+
+    def _nodes(self):
+        """
+        Every node of the tree in the order they are calculated, with each operand before the operations that use it.
+        A sub expression that is used more than once, such as d in d.dot(d), is only included once.
+        """
+        nodes, seen, stack = [], set(), [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in seen:
+                continue
+            if expanded or node.operation in _LEAVES:
+                seen.add(id(node))
+                nodes.append(node)
+            else:
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node.operands))
+        return nodes
+
+    def _map_rows(self, function):
+        """
+        A copy of the tree with function applied to the array of every rows leaf
+        """
+        if self.operation == "rows":
+            return Expression("rows", (function(self.operands[0]), ), self.width, self.vector_type)
+        elif self.operation in _LEAVES:
+            return self
+        return Expression(self.operation, tuple(operand._map_rows(function) for operand in self.operands), self.width,
+                          self.vector_type)
+
+    def __len__(self):
+        nodes = self._nodes()
+        count = _row_count(nodes, _bind(nodes, ()))
+        if count is None:
+            raise TypeError("An expression of single vectors has no length")
+        return count
+
+    def __iter__(self):
+        return iter(self.evaluate())
+
+    def __getitem__(self, item):
+        """
+        Evaluate only the rows selected by item, so expr[i] calculates a single row rather than the whole batch
+        """
+        if isinstance(item, (int, np.integer)):
+            count = len(self)
+            if not -count <= item < count:
+                raise IndexError(f"Index {item} out of range for an expression of {count} rows")
+            item = item % count
+            return self._map_rows(lambda data: data[item:item + 1]).evaluate()[0]
+        return self._map_rows(lambda data: data[item]).evaluate()
+
+    def evaluate(self, out=None, chunk_size=65536, rounding=None):
+        """
+        Calculate the expression
+
+        :param out: For expressions of batches, an optional float64 array or batch to write the result into, which may
+            be one of the batches in the expression as each chunk is read before it is written
+        :type out: np.ndarray | VectorArrayMaster | None
+
+        :param chunk_size: The number of rows calculated at once
+        :type chunk_size: int
+
+        :param rounding: The precision policy, see vectorObjects.Precision. None uses the current policy
+
+        :return: A batch of the vector type of the expression, or an (N, k) array if it has no vector type, or an (N, )
+            array for dot and lengths. Expressions of single vectors return a single vector, tuple or float.
+        :rtype: VectorArrayMaster | np.ndarray | VectorMaster | tuple | float
+        """
+        return _evaluate(self._nodes(), (), out, chunk_size, resolve(rounding))
+
+
+def _bind(nodes, arguments):
+    """
+    The leaf of every leaf node, with each argument replaced by the leaf of the value it is bound to
+    """
+    leaves = {}
+    for node in nodes:
+        if node.operation == "argument":
+            leaves[id(node)] = _leaf(arguments[node.operands[0]])
+        elif node.operation in _LEAVES:
+            leaves[id(node)] = node
+    return leaves
+
+
+def _row_count(nodes, leaves):
+    """
+    The number of rows of every rows leaf, or None if there are no rows
+    """
+    counts = {len(leaf.operands[0]) for leaf in leaves.values() if leaf.operation == "rows"}
+    if len(counts) > 1:
+        raise ValueError(f"Every batch of an expression must have the same number of rows but found {sorted(counts)}")
+    return counts.pop() if counts else None
+
+
+def _evaluate(nodes, arguments, out, chunk_size, policy):
+    leaves = _bind(nodes, arguments)
+    count = _row_count(nodes, leaves)
+    if count is None:
+        return _scalar_kernel(nodes, leaves, policy)(*[leaf.operands[0] for leaf in leaves.values()])
+    return _evaluate_rows(nodes, leaves, count, out, chunk_size, policy)
+
+
+def _batch_types():
+    return {batch_type.vector_type: batch_type for batch_type in VectorArrayMaster.__subclasses__()}
+
+
+def _evaluate_rows(nodes, leaves, count, out, chunk_size, policy):
+    """
+    Calculate every node a chunk of rows at a time, with the root writing straight into the output
+    """
+    root = nodes[-1]
+    width = max(root.width, 1)
+    result = out
+    if out is None:
+        out = result = np.empty((count, width) if root.width > 1 else count, dtype=np.float64)
+    elif isinstance(out, VectorArrayMaster):
+        out = out.data
+
+    shape = (count, width) if root.width > 1 else (count, )
+    if out.shape != shape or out.dtype != np.float64:
+        raise ValueError(f"Output buffer must be a float64 array of shape {shape} but found {out.dtype} {out.shape}")
+    target = out.reshape(count, width)
+
+    # Single vectors and constants are converted once rather than per chunk
+    constants = {}
+    for key, leaf in leaves.items():
+        value = leaf.operands[0]
+        if leaf.operation == "vector":
+            constants[key] = np.fromiter(value, dtype=np.float64, count=leaf.width)
+        elif leaf.operation == "constant":
+            constants[key] = np.array(value, dtype=np.float64)
+        elif leaf.operation == "scalar":
+            constants[key] = value
+
+    size = min(chunk_size, count)
+    buffers = {id(node): np.empty((size, max(node.width, 1)), dtype=np.float64) for node in nodes[:-1]
+               if node.operation not in _LEAVES}
+    lengths = np.empty(size, dtype=np.float64)
+
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        values = {}
+        for node in nodes:
+            key = id(node)
+            if node.operation in _LEAVES:
+                leaf = leaves[key]
+                values[key] = leaf.operands[0][start:stop] if leaf.operation == "rows" else constants[key]
+                if node is root:
+                    target[start:stop] = values[key]
+            else:
+                output = target[start:stop] if node is root else buffers[key][:stop - start]
+                values[key] = _step(node, [values[id(operand)] for operand in node.operands], output,
+                                    lengths[:stop - start], policy)
+
+    if isinstance(result, VectorArrayMaster) or root.width <= 1:
+        return result
+
+    batch_type = _batch_types().get(root.vector_type)
+    if batch_type is None:
+        return result
+    return batch_type(result, dtype=_result_dtype(leaves, batch_type))
+
+
+def _result_dtype(leaves, batch_type):
+    """
+    The dtype of a batch result, promoted from the floating dtypes of the rows of the expression so a float32 expression
+    returns a float32 batch, and float64 if any rows are float64 or every row is of an integer dtype
+    """
+    dtypes = [leaf.operands[0].dtype for leaf in leaves.values() if leaf.operation == "rows"]
+    dtype = np.result_type(*dtypes)
+    return dtype if np.issubdtype(dtype, np.floating) and dtype in batch_type.dtypes else np.float64
+
+
+def _full(value, rows, width):
+    """
+    A constant or one value per row as a (rows, width) view, for the steps that need every row of their operand
+    """
+    return np.broadcast_to(value, (rows, width))
+
+
+def _step(node, operands, output, lengths, policy):
+    """
+    Calculate one node of a chunk into output, applying the precision policy as the eager batch operators do
+    """
+    operation = node.operation
+    if operation in _BINARY:
+        _BINARY[operation][0](operands[0], operands[1], out=output)
+        policy.apply_array(output)
+
+    elif operation == "negative":
+        np.negative(operands[0], out=output)
+
+    elif operation == "dot":
+        width = node.operands[0].width
+        np.einsum("ij,ij->i", _full(operands[0], len(output), width), _full(operands[1], len(output), width),
+                  out=output[:, 0])
+
+    elif operation == "length":
+        values = _full(operands[0], len(output), node.operands[0].width)
+        np.einsum("ij,ij->i", values, values, out=output[:, 0])
+        np.sqrt(output, out=output)
+
+    elif operation == "normalise":
+        values = _full(operands[0], len(output), node.width)
+        np.einsum("ij,ij->i", values, values, out=lengths)
+        np.sqrt(lengths, out=lengths)
+        if not lengths.all():
+            raise ZeroDivisionError(f"Unable to normalise {np.count_nonzero(lengths == 0)} zero length vectors")
+
+        np.divide(values, lengths[:, None], out=output)
+        if policy.single:
+            policy.apply_array(output)
+
+    return output
+
+
+def _rounded(source, policy):
+    """
+    Source of a value with the precision policy applied, as the generated operators of VectorFactory do
+    """
+    if policy.exact:
+        return source
+    elif policy.single:
+        return f"_to_float32({source})"
+    return f"_round({source}, {policy.digits})"
+
+
+def _scalar_source(nodes, leaves, parameters, policy):
+    """
+    Source of a function that calculates every node with unrolled attribute arithmetic, taking the value of each leaf
+    whose id is in parameters as an argument
+    """
+    index = {id(node): position for position, node in enumerate(nodes)}
+
+    def name(node, attribute):
+        position = index[id(node)]
+        if node.width == 0:
+            return f"v{position}"
+        return f"v{position}_{0 if node.width == 1 else attribute}"
+
+    def names(node):
+        return [name(node, attribute) for attribute in range(max(node.width, 1))]
+
+    lines = [f"def _kernel({', '.join(f'a{i}' for i in range(len(parameters)))}):"]
+    for node in nodes:
+        key = id(node)
+        if node.operation in _LEAVES:
+            source = f"a{parameters.index(key)}" if key in parameters else f"_constants[{index[key]}]"
+            leaf = leaves[key]
+            if leaf.operation == "vector":
+                # Reading each attribute directly is faster than unpacking the vector through __iter__
+                slots = leaf.vector_type.__slots__
+                lines += [f"    {target} = {source}.{slot}" for target, slot in zip(names(node), slots)]
+            else:
+                targets = ", ".join(names(node)) + ("," if node.width == 1 else "")
+                lines.append(f"    {targets} = {source}")
+            continue
+
+        operands = node.operands
+        if node.operation in _BINARY:
+            symbol = _BINARY[node.operation][1]
+            for attribute, target in enumerate(names(node)):
+                value = f"{name(operands[0], attribute)} {symbol} {name(operands[1], attribute)}"
+                lines.append(f"    {target} = {_rounded(value, policy)}")
+
+        elif node.operation == "negative":
+            lines += [f"    {target} = -{name(operands[0], attribute)}" for attribute, target in enumerate(names(node))]
+
+        elif node.operation in ("dot", "length"):
+            other = operands[1] if node.operation == "dot" else operands[0]
+            total = " + ".join(f"{name(operands[0], attribute)} * {name(other, attribute)}"
+                               for attribute in range(operands[0].width))
+            lines.append(f"    {name(node, 0)} = {total if node.operation == 'dot' else f'_sqrt({total})'}")
+
+        elif node.operation == "normalise":
+            total = " + ".join(f"{source} * {source}" for source in names(operands[0]))
+            lines.append(f"    s{index[key]} = 1.0 / _sqrt({total})")
+            for attribute, target in enumerate(names(node)):
+                value = f"{name(operands[0], attribute)} * s{index[key]}"
+                lines.append(f"    {target} = _to_float32({value})" if policy.single else f"    {target} = {value}")
+
+    root = nodes[-1]
+    if root.width > 1 and root.vector_type is not None and len(root.vector_type.__slots__) == root.width:
+        lines.append("    new = _new(_vector_type)")
+        lines += [f"    new.{slot} = {source}" for slot, source in zip(root.vector_type.__slots__, names(root))]
+        lines.append("    return new")
+    elif root.width > 1:
+        lines.append(f"    return ({', '.join(names(root))})")
+    else:
+        lines.append(f"    return {names(root)[0]}")
+    return "\n".join(lines) + "\n"
+
+
+def _compile_scalar(nodes, leaves, parameters, policy, filename):
+    source = _scalar_source(nodes, leaves, parameters, policy)
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    constants = {position: leaves[id(node)].operands[0] for position, node in enumerate(nodes)
+                 if node.operation in _LEAVES and id(node) not in parameters}
+    namespace = {"_sqrt": math.sqrt, "_round": round, "_to_float32": _to_float32, "_new": object.__new__,
+                 "_vector_type": nodes[-1].vector_type, "_constants": constants}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["_kernel"]
+
+
+def _structure(nodes, leaves):
+    """
+    A key of the structure of an expression, without the values of its leaves
+    """
+    index = {id(node): position for position, node in enumerate(nodes)}
+    key = []
+    for node in nodes:
+        if node.operation in _LEAVES:
+            leaf = leaves[id(node)]
+            key.append((leaf.operation, leaf.width, leaf.vector_type))
+        else:
+            key.append((node.operation, node.width, node.vector_type,
+                        tuple(index[id(operand)] for operand in node.operands)))
+    return tuple(key)
+
+
+def _scalar_kernel(nodes, leaves, policy):
+    """
+    The compiled kernel of an expression of single vectors, which takes the value of every leaf as an argument
+    """
+    key = (_structure(nodes, leaves), policy.name)
+    kernel = _SCALAR_KERNELS.get(key)
+    if kernel is None:
+        filename = f"<vectorObjects.Expressions kernel {len(_SCALAR_KERNELS)}>"
+        kernel = _SCALAR_KERNELS[key] = _compile_scalar(nodes, leaves, list(leaves), policy, filename)
+    return kernel
+
+
+def _argument_kind(value):
+    if isinstance(value, np.ndarray):
+        return np.ndarray, value.ndim, value.shape[-1] if value.ndim == 2 else 1
+    return type(value)
+
+
+class FusedFunction:
+    """
+    A function of vectors and batches that is traced into an expression the first time it is called with each
+    combination of argument types, see fuse
+    """
+    __slots__ = ["function", "_traces"]
+
+    def __init__(self, function):
+        self.function = function
+        self._traces = {}
+
+    def __repr__(self):
+        return f"FusedFunction({getattr(self.function, '__name__', self.function)})"
+
+    def _trace(self, arguments, policy):
+        parameters = []
+        for position, value in enumerate(arguments):
+            leaf = _leaf(value)
+            parameters.append(Expression("argument", (position, ), leaf.width, leaf.vector_type))
+
+        nodes = _leaf(self.function(*parameters))._nodes()
+        leaves = _bind(nodes, arguments)
+        if _row_count(nodes, leaves) is not None:
+            return nodes, None
+
+        # Arguments are passed straight to the compiled kernel, whilst any constants in the function are held by it
+        positions = {id(node): node.operands[0] for node in nodes if node.operation == "argument"}
+        parameters = sorted(positions, key=positions.get)
+        filename = f"<vectorObjects.Expressions {getattr(self.function, '__qualname__', 'function')}>"
+        kernel = _compile_scalar(nodes, leaves, parameters, policy, filename)
+
+        # A kernel that does not use every argument still accepts them, in the order they were passed
+        used = [positions[key] for key in parameters]
+        if used != list(range(len(arguments))):
+            return nodes, lambda *values: kernel(*[values[position] for position in used])
+        return nodes, kernel
+
+    def __call__(self, *arguments, out=None, chunk_size=65536, rounding=None):
+        """
+        Calculate the function for these arguments, with single vectors calling the compiled kernel directly and
+        batches being evaluated a chunk at a time as Expression.evaluate
+        """
+        policy = _state.policy if rounding is None else resolve(rounding)
+        kinds = tuple(map(type, arguments))
+        if np.ndarray in kinds:
+            kinds = tuple(_argument_kind(value) for value in arguments)
+
+        key = (kinds, policy.name)
+        trace = self._traces.get(key)
+        if trace is None:
+            trace = self._traces[key] = self._trace(arguments, policy)
+
+        nodes, kernel = trace
+        if kernel is not None:
+            return kernel(*arguments)
+        return _evaluate(nodes, arguments, out, chunk_size, policy)
+
+
+def fuse(function):
+    """
+    Wrap a function of vectors so that its arithmetic is fused. The function is called once per combination of
+    argument types with placeholders, which records its operations as an expression. Single vectors then call a
+    compiled function of unrolled attribute arithmetic with no intermediate vectors, whilst batches are evaluated a
+    chunk at a time.
+
+    step = fuse(lambda position, velocity, dt: position + velocity * dt)
+    step(Vector3D(0, 0, 0), Vector3D(1, 2, 3), 0.5)
+    step(positions, velocities, 0.5)
+
+    :param function: A function that only uses the operators, dot, lengths and normalise of its arguments
+    :type function: callable
+
+    :rtype: FusedFunction
+    """
+    return FusedFunction(function)
@@ -0,0 +1,300 @@
+from vectorObjects.DefinedVectors import Vector2D, Vector3D, Vector4D, VectorRGB, PymeshioQuaternion
+from vectorObjects.VectorMaster import VectorMaster
+from contextlib import contextmanager
+from time import perf_counter_ns
+import numpy as np
+import functools
+import inspect
+import sys
+
+# The classes whose public methods and operators are instrumented by default, along with the private methods of
+# VectorMaster which are always instrumented
+DEFINED_CLASSES = (Vector2D, Vector3D, Vector4D, VectorRGB, PymeshioQuaternion)
+
+
+class OperationStats:
+    """
+    The number of calls, the total time in nanoseconds, and the kind of operand of each call of a single method.
+
+    Time is inclusive, so a method that calls another instrumented method also includes the time of that call.
+    """
+    __slots__ = ["calls", "total_ns", "operands", "call_sites"]
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.operands = {}
+        self.call_sites = {}
+
+    def __repr__(self):
+        return f"OperationStats({self.calls} calls, {self.total_ns} ns)"
+
+    def to_dict(self):
+        return {"calls": self.calls, "total_ns": self.total_ns,
+                "mean_ns": self.total_ns / self.calls if self.calls else 0.0,
+                "operands": dict(self.operands), "call_sites": dict(self.call_sites)}
+
+
+class _InstrumentationState:
+    """
+    The stats of every method that has been instrumented, and the original attributes replaced whilst enabled
+    """
+    __slots__ = ["stats", "originals", "call_sites"]
+
+    def __init__(self):
+        self.stats = {}
+        self.originals = []
+        self.call_sites = False
+
+
+_state = _InstrumentationState()
+
+
+# Parameters that hold the instance an operation applies to, rather than its operand
+_SUBJECTS = ("self", "cls", "current_inst", "instance")
+
+
+def _operand_parameter(function):
+    """
+    The position and name of the operand parameter of a function, being a parameter named other, other_inst or rhs, or
+    otherwise the first positional parameter after the instance, such as other_inst of
+    _equality(self, current_inst, other_inst). Returns None if the function has no operand.
+    """
+    try:
+        parameters = list(inspect.signature(function).parameters.values())
+    except (TypeError, ValueError):
+        return None
+
+    positional = [parameter for parameter in parameters
+                  if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)]
+    for index, parameter in enumerate(positional):
+        if parameter.name in ("other", "other_inst", "rhs"):
+            return index, parameter.name
+
+    for index, parameter in enumerate(positional):
+        if parameter.name not in _SUBJECTS:
+            return index, parameter.name
+    return None
+
+
+def _operand_kind(args, kwargs, operand):
+    """
+    The kind of operand of a call, such as other in a + other, from the operand parameter of the function
+    """
+    if operand is None:
+        return "none"
+
+    index, name = operand
+    if index < len(args):
+        other = args[index]
+    elif name in kwargs:
+        other = kwargs[name]
+    else:
+        return "none"
+
+    if isinstance(other, VectorMaster):
+        return "vector"
+    elif isinstance(other, (int, float, np.number)):
+        return "scalar"
+    elif isinstance(other, (list, tuple)):
+        return "tuple"
+    elif isinstance(other, np.ndarray):
+        return "array"
+    else:
+        return "other"
+
+
+def _wrap(function, stats, call_sites):
+    """
+    Wrap a function so each call updates stats
+    """
+    operand = _operand_parameter(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.total_ns += perf_counter_ns() - start
+            stats.calls += 1
+            kind = _operand_kind(args, kwargs, operand)
+            stats.operands[kind] = stats.operands.get(kind, 0) + 1
+
+            if call_sites:
+                frame = sys._getframe(1)
+                site = f"{frame.f_code.co_filename}:{frame.f_lineno}"
+                stats.call_sites[site] = stats.call_sites.get(site, 0) + 1
+
+    return wrapper
+
+
+def _targets(cls, private):
+    """
+    The names and attributes of cls to instrument, being ether its private methods or its public methods and operators
+    """
+    for name, attribute in vars(cls).items():
+        dunder = name.startswith("__") and name.endswith("__")
+        if private != (name.startswith("_") and not dunder):
+            continue
+        if dunder and name in ("__new__", "__init_subclass__", "__subclasshook__", "__class_getitem__"):
+            continue
+
+        if isinstance(attribute, (staticmethod, classmethod)) or inspect.isfunction(attribute):
+            yield name, attribute
+
+
+def _instrument(cls, name, attribute):
+    stats = _state.stats.setdefault(f"{cls.__name__}.{name}", OperationStats())
+    if isinstance(attribute, (staticmethod, classmethod)):
+        replacement = type(attribute)(_wrap(attribute.__func__, stats, _state.call_sites))
+    else:
+        replacement = _wrap(attribute, stats, _state.call_sites)
+
+    _state.originals.append((cls, name, attribute))
+    setattr(cls, name, replacement)
+
+
+def _instrument_class(cls):
+    """
+    Instrument the public methods and operators of cls, unless it is already instrumented
+    """
+    if any(instrumented is cls for instrumented, _, _ in _state.originals):
+        return
+    [_instrument(cls, name, attribute) for name, attribute in list(_targets(cls, False))]
+
+
+def enable(classes=None, call_sites=False):
+    """
+    Start counting the calls and time of every private method of VectorMaster, and every public method and operator of
+    classes. Whilst disabled the original methods are in place, so there is no cost at all.
+
+    :param classes: The classes to instrument, or None for the classes in DefinedVectors
+    :type classes: tuple | list | None
+
+    :param call_sites: If True, also count the file and line each method is called from, which is slower
+    :type call_sites: bool
+    """
+    if is_enabled():
+        disable()
+
+    _state.call_sites = call_sites
+    [_instrument(VectorMaster, name, attribute) for name, attribute in list(_targets(VectorMaster, True))]
+
+    for cls in DEFINED_CLASSES if classes is None else classes:
+        _instrument_class(cls)
+
+
+def disable():
+    """
+    Restore the original methods, keeping the stats recorded so far
+    """
+    for cls, name, attribute in reversed(_state.originals):
+        setattr(cls, name, attribute)
+    _state.originals = []
+
+
+def is_enabled():
+    return len(_state.originals) > 0
+
+
+def reset():
+    """
+    Set every counter back to zero
+    """
+    [stats.__init__() for stats in _state.stats.values()]
+
+
+def snapshot():
+    """
+    The stats of every method that has been called, keyed by class and method name such as Vector3D.__add__
+
+    :return: A dict of calls, total_ns, mean_ns, operands and call_sites for each method
+    :rtype: dict
+    """
+    return {name: stats.to_dict() for name, stats in _state.stats.items() if stats.calls > 0}
+
+
+def _difference(after, before):
+    """
+    The stats of after that were recorded since before, where both are snapshots
+    """
+    difference = {}
+    for name, stats in after.items():
+        previous = before.get(name)
+        if previous is None:
+            difference[name] = stats
+            continue
+
+        calls = stats["calls"] - previous["calls"]
+        if calls == 0:
+            continue
+
+        total_ns = stats["total_ns"] - previous["total_ns"]
+        difference[name] = {
+            "calls": calls, "total_ns": total_ns, "mean_ns": total_ns / calls,
+            "operands": {kind: count - previous["operands"].get(kind, 0) for kind, count in stats["operands"].items()
+                         if count != previous["operands"].get(kind, 0)},
+            "call_sites": {site: count - previous["call_sites"].get(site, 0)
+                           for site, count in stats["call_sites"].items()
+                           if count != previous["call_sites"].get(site, 0)}}
+    return difference
+
+
+@contextmanager
+def instrument(classes=None, call_sites=False):
+    """
+    Instrument a block of code, yielding a dict that is filled with the stats of the calls made within the block when
+    it exits. If instrumentation was not already enabled it is disabled again on exit, whilst if it was any classes
+    that were not already instrumented are instrumented for the block only.
+
+    with instrument() as stats:
+        run_pipeline()
+    print(report(stats))
+    """
+    already_enabled = is_enabled()
+    added = len(_state.originals)
+    if not already_enabled:
+        enable(classes, call_sites)
+    elif classes is not None:
+        [_instrument_class(cls) for cls in classes]
+
+    before = snapshot()
+    measurement = {}
+    try:
+        yield measurement
+    finally:
+        measurement.update(_difference(snapshot(), before))
+        if not already_enabled:
+            disable()
+        else:
+            # Only restore the classes that were added for this block
+            for cls, name, attribute in reversed(_state.originals[added:]):
+                setattr(cls, name, attribute)
+            del _state.originals[added:]
+
+
+def report(stats=None, sort="total_ns", limit=20):
+    """
+    Format stats as a table, with the most expensive methods first
+
+    :param stats: A snapshot or the dict of instrument, or None for the current snapshot
+    :type stats: dict | None
+
+    :param sort: The field to sort by: calls, total_ns or mean_ns
+    :type sort: str
+
+    :param limit: The maximum number of methods to include
+    :type limit: int
+
+    :rtype: str
+    """
+    stats = snapshot() if stats is None else stats
+    rows = sorted(stats.items(), key=lambda item: item[1][sort], reverse=True)[:limit]
+
+    lines = [f"{'method':<40} {'calls':>10} {'total ms':>10} {'mean ns':>10}  operands"]
+    for name, values in rows:
+        operands = ", ".join(f"{kind} {count}" for kind, count in sorted(values["operands"].items()))
+        lines.append(f"{name:<40} {values['calls']:>10} {values['total_ns'] / 1e6:>10.2f} {values['mean_ns']:>10.1f}  "
+                     f"{operands}")
+    return "\n".join(lines)
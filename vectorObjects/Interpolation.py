@@ -0,0 +1,216 @@
+from vectorObjects.VectorArrays import QuaternionArray, Vector3DArray
+import numpy as np
+
+
+def _shortest_path(q0, q1):
+    """
+    Flip the sign of any q1 that is more than 90 degrees from q0, so interpolation takes the shortest path between
+    them, returning the adjusted q1 and the dot product of each pair
+    """
+    dot = np.einsum("...i,...i->...", q0, q1)
+    flip = dot < 0
+    q1 = np.where(flip[..., None], -q1, q1)
+    return q1, np.abs(dot)
+
+
+def _normalise(quaternions):
+    return quaternions / np.linalg.norm(quaternions, axis=-1, keepdims=True)
+
+
+def nlerp(q0, q1, t):
+    """
+    Normalised linear interpolation between arrays of quaternions in x, y, z, w order, taking the shortest path.
+    Faster than slerp, but the angular velocity is not constant across t.
+
+    :param q0: The quaternions at t = 0, of shape (..., 4)
+    :type q0: np.ndarray
+
+    :param q1: The quaternions at t = 1, of shape (..., 4)
+    :type q1: np.ndarray
+
+    :param t: The position between q0 and q1, which broadcasts against the leading dimensions of q0
+    :type t: float | np.ndarray
+
+    :rtype: np.ndarray
+    """
+    q0, q1 = np.asarray(q0, dtype=np.float64), np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+
+    q1, _ = _shortest_path(q0, q1)
+    return _normalise(q0 + (q1 - q0) * t)
+
+
+def slerp(q0, q1, t, threshold=0.9995):
+    """
+    Spherical linear interpolation between arrays of quaternions in x, y, z, w order, taking the shortest path.
+
+    Where a pair of quaternions are closer than threshold, by their dot product, nlerp is used for that pair to avoid
+    dividing by the sine of a very small angle.
+
+    :param q0: The quaternions at t = 0, of shape (..., 4)
+    :type q0: np.ndarray
+
+    :param q1: The quaternions at t = 1, of shape (..., 4)
+    :type q1: np.ndarray
+
+    :param t: The position between q0 and q1, which broadcasts against the leading dimensions of q0
+    :type t: float | np.ndarray
+
+    :param threshold: The dot product above which nlerp is used
+    :type threshold: float
+
+    :rtype: np.ndarray
+    """
+    q0, q1 = np.asarray(q0, dtype=np.float64), np.asarray(q1, dtype=np.float64)
+    t = np.broadcast_to(np.asarray(t, dtype=np.float64), np.broadcast_shapes(q0.shape[:-1], q1.shape[:-1]))
+
+    q1, dot = _shortest_path(q0, q1)
+    close = dot > threshold
+
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.where(close, 1.0, np.sin(theta))
+
+    scale_0 = np.where(close, 1.0 - t, np.sin((1.0 - t) * theta) / sin_theta)
+    scale_1 = np.where(close, t, np.sin(t * theta) / sin_theta)
+
+    result = q0 * scale_0[..., None] + q1 * scale_1[..., None]
+    return _normalise(result)
+
+
+class MotionInterpolator:
+    """
+    Interpolates the rotation and translation of many bones from their keyframes, such as the bone motion of a vmd
+    file, evaluating every bone at a batch of times in one vectorised pass.
+
+    Keyframes are held as (B, K) times, (B, K, 4) quaternions in x, y, z, w order, and (B, K, 3) translations. Bones
+    with fewer than K keyframes are padded by repeating their last keyframe.
+    """
+    __slots__ = ["times", "rotations", "translations", "_offsets", "_flat_times"]
+
+    def __init__(self, times, rotations, translations=None):
+        """
+        :param times: The sorted time of each keyframe, ether (K, ) if every bone shares the same keyframe times, or
+            (B, K) for the times of each bone
+        :type times: np.ndarray
+
+        :param rotations: The quaternion of each bone at each keyframe, of shape (B, K, 4)
+        :type rotations: np.ndarray
+
+        :param translations: The translation of each bone at each keyframe, of shape (B, K, 3), or None if the motion
+            only contains rotations
+        :type translations: np.ndarray | None
+        """
+        self.rotations = np.asarray(rotations, dtype=np.float64)
+        if self.rotations.ndim != 3 or self.rotations.shape[2] != 4:
+            raise ValueError(f"Rotations are expected to be of shape (B, K, 4) but found {self.rotations.shape}")
+
+        bones, keys = self.rotations.shape[:2]
+        if keys == 0:
+            raise ValueError("A MotionInterpolator requires at least one keyframe")
+
+        self.times = np.broadcast_to(np.asarray(times, dtype=np.float64), (bones, keys)).copy()
+        if (np.diff(self.times, axis=1) < 0).any():
+            raise ValueError("Keyframe times must be sorted for each bone")
+
+        if translations is None:
+            self.translations = np.zeros((bones, keys, 3))
+        else:
+            self.translations = np.asarray(translations, dtype=np.float64)
+            if self.translations.shape != (bones, keys, 3):
+                raise ValueError(f"Translations are expected to be of shape {(bones, keys, 3)} but found "
+                                 f"{self.translations.shape}")
+
+        # Each bones times are shifted by an offset larger than the span of all times, so the keyframes of every bone
+        # can be found with a single binary search of one sorted array
+        span = self.times.max() - self.times.min() + 1.0
+        self._offsets = (np.arange(bones) * span)[:, None]
+        self._flat_times = (self.times - self.times.min() + self._offsets).ravel()
+
+    @classmethod
+    def from_tracks(cls, tracks):
+        """
+        Create an interpolator from a list of one (times, rotations, translations) per bone, where each bone can have a
+        different number of keyframes and translations can be None
+
+        :type tracks: list[tuple]
+        :rtype: MotionInterpolator
+        """
+        keys = max(len(times) for times, _, _ in tracks)
+        times = np.empty((len(tracks), keys))
+        rotations = np.empty((len(tracks), keys, 4))
+        translations = np.zeros((len(tracks), keys, 3))
+
+        for bone, (bone_times, bone_rotations, bone_translations) in enumerate(tracks):
+            count = len(bone_times)
+            if count == 0:
+                raise ValueError(f"Bone {bone} has no keyframes")
+
+            times[bone, :count], times[bone, count:] = bone_times, bone_times[-1]
+            rotations[bone, :count], rotations[bone, count:] = bone_rotations, bone_rotations[-1]
+            if bone_translations is not None:
+                translations[bone, :count], translations[bone, count:] = bone_translations, bone_translations[-1]
+
+        return cls(times, rotations, translations)
+
+    def __repr__(self):
+        return f"MotionInterpolator({self.bone_count()} bones, {self.times.shape[1]} keyframes)"
+
+    def bone_count(self):
+        return self.times.shape[0]
+
+    def _locate(self, query_times):
+        """
+        For each query time and bone, the index of the keyframe before it and the position t between that keyframe
+        and the next, both of shape (T, B). Times outside the keyframes are clamped to the first or last keyframe.
+        """
+        bones, keys = self.times.shape
+        query = np.asarray(query_times, dtype=np.float64).reshape(-1)
+
+        shifted = (query[:, None] - self.times.min()) + self._offsets[:, 0][None, :]
+        flat_index = np.searchsorted(self._flat_times, shifted, side="right") - 1
+
+        bone = np.arange(bones)[None, :]
+        index = np.clip(flat_index - bone * keys, 0, max(keys - 2, 0))
+        following = np.minimum(index + 1, keys - 1)
+
+        start, end = self.times[bone, index], self.times[bone, following]
+        duration = end - start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(duration > 0, (query[:, None] - start) / duration, 0.0)
+        return index, following, np.clip(t, 0.0, 1.0)
+
+    def evaluate(self, query_times, mode="slerp"):
+        """
+        Interpolate every bone at each of the query times
+
+        :param query_times: The times to evaluate, of shape (T, )
+        :type query_times: np.ndarray | list | float
+
+        :param mode: slerp for spherical linear interpolation, or nlerp for the faster normalised linear interpolation
+        :type mode: str
+
+        :return: Rotations of shape (T, B, 4) and translations of shape (T, B, 3)
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        if mode not in ("slerp", "nlerp"):
+            raise ValueError(f"Interpolation mode must be slerp or nlerp but found {mode}")
+
+        index, following, t = self._locate(query_times)
+        bone = np.arange(self.bone_count())[None, :]
+
+        q0, q1 = self.rotations[bone, index], self.rotations[bone, following]
+        rotations = slerp(q0, q1, t) if mode == "slerp" else nlerp(q0, q1, t)
+
+        p0, p1 = self.translations[bone, index], self.translations[bone, following]
+        translations = p0 + (p1 - p0) * t[..., None]
+        return rotations, translations
+
+    def evaluate_frame(self, time, mode="slerp"):
+        """
+        Interpolate every bone at a single time, where indexing the results returns a PymeshioQuaternion and Vector3D
+        for that bone
+
+        :rtype: (QuaternionArray, Vector3DArray)
+        """
+        rotations, translations = self.evaluate([time], mode)
+        return QuaternionArray(rotations[0]), Vector3DArray(translations[0])
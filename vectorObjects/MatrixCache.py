@@ -0,0 +1,104 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class MatrixCache:
+    """
+    A bounded least recently used cache of values calculated from the components of a quaternion, such as the
+    matrices of PymeshioQuaternion.getMatrix, so that quaternions which hold the same rotation across many frames only
+    have their matrix built once.
+
+    Cached arrays are set to read only, so callers cannot corrupt an entry that will be returned to other callers.
+    """
+    __slots__ = ["max_size", "digits", "hits", "misses", "evictions", "_entries"]
+
+    def __init__(self, max_size=1024, digits=None):
+        """
+        :param max_size: The maximum number of entries before the least recently used entry is evicted
+        :type max_size: int
+
+        :param digits: If None the components are used exactly as the key, so results are always the same as without
+            the cache. Otherwise the components are rounded to this number of decimal places, so quaternions that only
+            differ by less than that share an entry.
+        :type digits: int | None
+        """
+        if max_size < 1:
+            raise ValueError(f"A MatrixCache requires a max_size of at least 1 but found {max_size}")
+
+        self.max_size = max_size
+        self.digits = digits
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __repr__(self):
+        return f"MatrixCache({self.stats()})"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, name, components):
+        """
+        The key of a named calculation for these components at the precision of this cache
+        """
+        if self.digits is None:
+            return name, tuple(components)
+        else:
+            return name, tuple(round(value, self.digits) for value in components)
+
+    def get(self, name, components, calculate):
+        """
+        Return the cached value of the named calculation for these components, calling calculate to create it if it is
+        not already cached
+
+        :param name: The name of the calculation, such as matrix
+        :type name: str
+
+        :param components: The values the calculation depends on, such as x, y, z, w
+        :type components: tuple
+
+        :param calculate: A function with no arguments that returns the value to cache
+        """
+        key = self.key(name, components)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._read_only(calculate())
+            self._entries[key] = value
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _read_only(value):
+        """
+        Set any arrays in value to be read only
+        """
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        elif isinstance(value, tuple):
+            [v.setflags(write=False) for v in value if isinstance(v, np.ndarray)]
+        return value
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Returns a dict of the hits, misses and evictions, along with the current and maximum size of the cache
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries),
+                "max_size": self.max_size}
@@ -0,0 +1,155 @@
+from vectorObjects.VectorArrays import VectorArrayMaster, as_points
+from vectorObjects.Welding import _as_input_type
+from vectorObjects.Precision import resolve
+import numpy as np
+
+WEIGHTINGS = ("area", "angle", "uniform")
+
+
+def _as_triangles(faces, vertex_count):
+    faces = np.asarray(faces)
+    if faces.ndim != 2 or faces.shape[1] != 3 or not np.issubdtype(faces.dtype, np.integer):
+        raise ValueError(f"Faces are expected to be an (F, 3) array of vertex indices but found {faces.dtype} "
+                         f"{faces.shape}")
+    if len(faces) and (faces.min() < 0 or faces.max() >= vertex_count):
+        raise IndexError(f"Faces index vertices outside of the {vertex_count} vertices")
+    return faces
+
+
+def _unit(vectors, lengths, fallback):
+    """
+    Divide each row by its length, setting rows of zero length to fallback rather than dividing by zero
+    """
+    unit = np.empty_like(vectors)
+    valid = lengths > 0
+    np.divide(vectors, lengths[:, None], out=unit, where=valid[:, None])
+    unit[~valid] = fallback
+    return unit
+
+
+def _corner_angles(corners, faces):
+    """
+    The interior angle at each corner of each triangle, of shape (F, 3), where degenerate corners have an angle of 0.0
+    """
+    angles = np.empty(faces.shape, dtype=np.float64)
+    for corner in range(3):
+        origin = corners[:, corner]
+        a = corners[:, (corner + 1) % 3] - origin
+        b = corners[:, (corner + 2) % 3] - origin
+        # atan2 of the sine and cosine is accurate for small angles, and is 0.0 rather than nan for zero length edges
+        angles[:, corner] = np.arctan2(np.linalg.norm(np.cross(a, b), axis=1), np.einsum("ij,ij->i", a, b))
+    return angles
+
+
+def _accumulate(faces, weighted, vertex_count):
+    """
+    Sum the weighted normal of every corner into its vertex, of shape (V, 3)
+    """
+    indices = faces.reshape(-1)
+    totals = np.empty((vertex_count, 3), dtype=np.float64)
+    for column in range(3):
+        totals[:, column] = np.bincount(indices, weights=weighted[..., column].reshape(-1), minlength=vertex_count)
+    return totals
+
+
+def _normal_dtype(vertices):
+    """
+    The dtype of normals returned as a batch, which keeps a floating dtype of the vertices and is otherwise float64
+    """
+    if isinstance(vertices, VectorArrayMaster) and np.issubdtype(vertices.dtype, np.floating):
+        return vertices.dtype
+    return np.float64
+
+
+def _triangle_crosses(vertices, faces):
+    """
+    The vertices as an array, the checked faces, the corners of each triangle, and the cross product of two edges of
+    each triangle, which points along its normal with a length of twice its area
+    """
+    points = as_points(vertices)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"Mesh normals require three dimensional vertices but found {points.shape}")
+
+    faces = _as_triangles(faces, len(points))
+    corners = points[faces]
+    crosses = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    return points, faces, corners, crosses
+
+
+def mesh_normals(vertices, faces, weighting="area", fallback=(0.0, 0.0, 0.0), rounding=None):
+    """
+    Calculate the unit normal of every triangle and of every vertex of an indexed triangle mesh in one pass. Normals
+    follow the right hand rule, so counter clockwise triangles face towards the viewer.
+
+    Triangles with no area have no direction, so their face normal is fallback and they add nothing to the normals of
+    their vertices, rather than raising the ZeroDivisionError of normalise. Vertices that are not used by any triangle
+    with area also have a normal of fallback.
+
+    :param vertices: The vertices of the mesh as an (V, 3) array, a Vector3DArray, or a list of Vector3D
+    :type vertices: np.ndarray | Vector3DArray | list
+
+    :param faces: An (F, 3) array of the vertex indices of each triangle
+    :type faces: np.ndarray | list
+
+    :param weighting: How the normals of the triangles around a vertex are weighted, area for the area of each
+        triangle, angle for the angle of the triangle at that vertex, or uniform to weight each triangle equally
+    :type weighting: str
+
+    :param fallback: The normal of degenerate triangles and of unused vertices
+    :type fallback: tuple | list
+
+    :param rounding: The precision policy, of which like normalise only float32 is applied
+
+    :return: The face normals and vertex normals, in the same form as vertices
+    :rtype: tuple[np.ndarray | Vector3DArray | list, np.ndarray | Vector3DArray | list]
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {', '.join(WEIGHTINGS)} but found {weighting}")
+
+    points, faces, corners, crosses = _triangle_crosses(vertices, faces)
+    lengths = np.linalg.norm(crosses, axis=1)
+    face_normals = _unit(crosses, lengths, fallback)
+
+    if weighting == "area":
+        weighted = np.broadcast_to(crosses[:, None], corners.shape)
+    else:
+        unit = np.where((lengths > 0)[:, None], face_normals, 0.0)
+        if weighting == "angle":
+            weighted = unit[:, None] * _corner_angles(corners, faces)[..., None]
+        else:
+            weighted = np.broadcast_to(unit[:, None], corners.shape)
+
+    totals = _accumulate(faces, weighted, len(points))
+    vertex_normals = _unit(totals, np.linalg.norm(totals, axis=1), fallback)
+
+    policy = resolve(rounding)
+    if policy.single:
+        policy.apply_array(face_normals)
+        policy.apply_array(vertex_normals)
+
+    dtype = _normal_dtype(vertices)
+    return _as_input_type(vertices, face_normals, dtype), _as_input_type(vertices, vertex_normals, dtype)
+
+
+def face_normals(vertices, faces, fallback=(0.0, 0.0, 0.0), rounding=None):
+    """
+    The unit normal of every triangle of an indexed triangle mesh, see mesh_normals
+
+    :rtype: np.ndarray | Vector3DArray | list
+    """
+    crosses = _triangle_crosses(vertices, faces)[3]
+    normals = _unit(crosses, np.linalg.norm(crosses, axis=1), fallback)
+
+    policy = resolve(rounding)
+    if policy.single:
+        policy.apply_array(normals)
+    return _as_input_type(vertices, normals, _normal_dtype(vertices))
+
+
+def vertex_normals(vertices, faces, weighting="area", fallback=(0.0, 0.0, 0.0), rounding=None):
+    """
+    The unit normal of every vertex of an indexed triangle mesh, see mesh_normals
+
+    :rtype: np.ndarray | Vector3DArray | list
+    """
+    return mesh_normals(vertices, faces, weighting, fallback, rounding)[1]
@@ -0,0 +1,350 @@
+from vectorObjects.VectorArrays import Vector2DArray, Vector3DArray, Vector4DArray, VectorArrayMaster, as_points
+from vectorObjects.Polylines import sub_divide_segments, _segment_counts
+from vectorObjects.Rotations import rotate_around_point
+from vectorObjects.Transforms import Transform
+from vectorObjects.Precision import resolve
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+import numpy as np
+import os
+
+# The batch type used for the rows of each width, so the kernels run the same operations as vectorObjects.VectorArrays
+BATCH_TYPES = {
+    2: Vector2DArray,
+    3: Vector3DArray,
+    4: Vector4DArray,
+}
+
+MODES = ("process", "thread", "serial")
+
+
+def _batch_type(width):
+    if width not in BATCH_TYPES:
+        raise ValueError(f"Batches can have a width of 2, 3 or 4 but found {width}")
+    return BATCH_TYPES[width]
+
+
+def _normalise_kernel(points, policy, out):
+    out[:] = points
+    _batch_type(points.shape[1])(out).normalise(policy)
+
+
+def _cross_product_kernel(points, other, policy, out):
+    out[:] = points
+    batch = Vector3DArray(out)
+    batch.cross_product(Vector3DArray(other) if isinstance(other, np.ndarray) else other, policy)
+
+
+def _transform_kernel(points, matrix, out):
+    width = points.shape[1]
+    np.matmul(points, matrix[:width, :width].T, out=out)
+    if matrix.shape[0] > width:
+        out += matrix[:width, width]
+
+
+def _rotate_kernel(points, radians, origin, rounding, out):
+    rotate_around_point(points, radians, origin, out, rounding)
+
+
+def _sub_divide_kernel(starts, ends, counts, include_points, include_end, out):
+    out[:] = sub_divide_segments(starts, ends, counts, include_points, include_end)[0]
+
+
+def _attach(spec):
+    """
+    Open a shared memory block created by the parent process, returning the block and an array over it
+    """
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _run_shared_chunk(function, input_specs, output_spec, start, stop, out_start, out_stop, args):
+    """
+    Run function over rows start:stop of every input, writing into rows out_start:out_stop of the output, where each
+    array is a view of a shared memory block so no data is pickled
+    """
+    attached = [_attach(spec) for spec in input_specs + [output_spec]]
+    try:
+        arrays = [array for _, array in attached]
+        function(*[array[start:stop] for array in arrays[:-1]], *args, out=arrays[-1][out_start:out_stop])
+    finally:
+        # Every view must be released before a block can be closed
+        del arrays
+        [block.close() for block, _ in attached]
+
+
+def _run_chunk(function, inputs, output, start, stop, out_start, out_stop, args):
+    function(*[array[start:stop] for array in inputs], *args, out=output[out_start:out_stop])
+
+
+class ParallelExecutor:
+    """
+    Runs batch operations over chunks of rows on a pool of worker processes or threads, so passes over very large
+    batches use every core.
+
+    In process mode the rows are copied once into multiprocessing.shared_memory, and each worker writes its chunk of the
+    result straight into a shared output, so only the names of the blocks and the bounds of each chunk are pickled. In
+    thread mode the workers share the arrays directly, which only scales as far as numpy releases the GIL. Chunks are
+    written into the output at their own rows, so the output is always in the same order as the input.
+
+    Use as a context manager, or call close, to shut the pool down.
+    """
+    __slots__ = ["workers", "chunk_size", "mode", "_pool"]
+
+    def __init__(self, workers=None, chunk_size=262144, mode="process"):
+        """
+        :param workers: The number of worker processes or threads, or None for the number of cores
+        :type workers: int | None
+
+        :param chunk_size: The number of rows of each chunk sent to a worker
+        :type chunk_size: int
+
+        :param mode: process, thread, or serial to run every chunk in the calling thread
+        :type mode: str
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}: expected one of {', '.join(MODES)}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1 but found {chunk_size}")
+
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        if self.workers < 1:
+            raise ValueError(f"workers must be at least 1 but found {self.workers}")
+
+        self.chunk_size = chunk_size
+        self.mode = mode
+        self._pool = None
+
+    def __repr__(self):
+        return f"ParallelExecutor({self.workers} workers, chunk_size={self.chunk_size}, mode={self.mode})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the pool of workers, which is created again if the executor is used after closing
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_type = ProcessPoolExecutor if self.mode == "process" else ThreadPoolExecutor
+            self._pool = pool_type(max_workers=self.workers)
+        return self._pool
+
+    def map_rows(self, function, arrays, width, args=(), out=None, offsets=None):
+        """
+        Run function over chunks of rows of arrays in parallel, as function(*chunks, *args, out=out_chunk), where the
+        function writes its result into out_chunk. In process mode function and args must be picklable, so function
+        must be defined at the top level of a module.
+
+        :param function: The function to run over each chunk
+        :type function: callable
+
+        :param arrays: The arrays that are split into chunks of rows, which must all have the same number of rows
+        :type arrays: list[np.ndarray]
+
+        :param width: The number of columns of the output
+        :type width: int
+
+        :param args: Any arguments that are the same for every chunk, such as a single vector or matrix
+        :type args: tuple
+
+        :param out: An optional float64 array to write the output into
+        :type out: np.ndarray | None
+
+        :param offsets: If the rows of the output are not the rows of the input, an array of length N + 1 where input
+            row i writes the output rows offsets[i]:offsets[i + 1]
+        :type offsets: np.ndarray | None
+
+        :rtype: np.ndarray
+        """
+        arrays = [np.ascontiguousarray(array) for array in arrays]
+        count = len(arrays[0])
+        if any(len(array) != count for array in arrays):
+            raise ValueError(f"Every array must have the same number of rows but found {[len(a) for a in arrays]}")
+
+        rows = count if offsets is None else int(offsets[-1])
+        shape = (rows, width)
+        if out is None:
+            out = np.empty(shape, dtype=np.float64)
+        elif out.shape != shape or out.dtype != np.float64:
+            raise ValueError(f"Output buffer must be a float64 array of shape {shape} but found {out.dtype} "
+                             f"{out.shape}")
+
+        chunks = []
+        for start in range(0, count, self.chunk_size):
+            stop = min(start + self.chunk_size, count)
+            out_start, out_stop = (start, stop) if offsets is None else (int(offsets[start]), int(offsets[stop]))
+            chunks.append((start, stop, out_start, out_stop))
+
+        if self.mode == "serial" or self.workers == 1 or len(chunks) < 2:
+            [_run_chunk(function, arrays, out, *chunk, args) for chunk in chunks]
+        elif self.mode == "thread":
+            pool = self._get_pool()
+            self._wait([pool.submit(_run_chunk, function, arrays, out, *chunk, args) for chunk in chunks])
+        else:
+            self._map_shared(function, arrays, out, chunks, args)
+        return out
+
+    @staticmethod
+    def _wait(futures):
+        """
+        Wait for every chunk to finish, even if one fails, so no worker is still using the arrays, then raise the error
+        of the first chunk that failed
+        """
+        wait(futures)
+        [future.result() for future in futures]
+
+    def _map_shared(self, function, arrays, out, chunks, args):
+        """
+        Copy the inputs into shared memory, run every chunk on the process pool, then copy the shared output into out
+        """
+        blocks = []
+        try:
+            specs = []
+            for array in arrays + [out]:
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                specs.append((block.name, array.shape, array.dtype.str))
+                if array is not out:
+                    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+
+            pool = self._get_pool()
+            self._wait([pool.submit(_run_shared_chunk, function, specs[:-1], specs[-1], *chunk, args)
+                        for chunk in chunks])
+
+            out[:] = np.ndarray(out.shape, dtype=out.dtype, buffer=blocks[-1].buf)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _result(self, points, result):
+        """
+        Return the result as the batch type of points if points was a batch, otherwise as an array. Batches keep
+        their dtype when it is a floating dtype, whilst integer batches are returned as float64.
+        """
+        if not isinstance(points, VectorArrayMaster):
+            return result
+        return type(points)(result, dtype=points.dtype if np.issubdtype(points.dtype, np.floating) else np.float64)
+
+    def normalise(self, points, rounding=None, out=None):
+        """
+        Normalise every row, as VectorArrayMaster.normalise
+
+        :param points: An (N, k) array, a batch from vectorObjects.VectorArrays, or a list of vectors
+        :type points: np.ndarray | VectorArrayMaster | list
+
+        :param rounding: The precision policy, see vectorObjects.Precision. None uses the current policy
+        :param out: An optional float64 (N, k) array to write into, which may be the array of points itself
+
+        :rtype: np.ndarray | VectorArrayMaster
+        """
+        array = as_points(points)
+        _batch_type(array.shape[1])
+        result = self.map_rows(_normalise_kernel, [array], array.shape[1], (resolve(rounding), ), out)
+        return self._result(points, result)
+
+    def cross_product(self, points, other, rounding=None, out=None):
+        """
+        The cross product of every row with ether a single Vector3D, or the matching row of another batch of 3D points
+
+        :param points: An (N, 3) array, a Vector3DArray, or a list of Vector3D
+        :type points: np.ndarray | Vector3DArray | list
+
+        :param other: A single Vector3D, or an (N, 3) array, Vector3DArray or list of Vector3D
+        :param rounding: The precision policy, see vectorObjects.Precision. None uses the current policy
+        :param out: An optional float64 (N, 3) array to write into
+
+        :rtype: np.ndarray | Vector3DArray
+        """
+        array = as_points(points)
+        if array.shape[1] != 3:
+            raise ValueError(f"Cross products require points of width 3 but found {array.shape[1]}")
+
+        policy = resolve(rounding)
+        if isinstance(other, Vector3DArray.vector_type):
+            result = self.map_rows(_cross_product_kernel, [array], 3, (other, policy), out)
+        else:
+            result = self.map_rows(_cross_product_kernel, [array, as_points(other)], 3, (policy, ), out)
+        return self._result(points, result)
+
+    def transform(self, points, matrix, out=None):
+        """
+        Multiply every row by a matrix, being ether a (k, k) linear matrix or a (k + 1, k + 1) affine matrix whose
+        last column is the translation, or by a vectorObjects.Transforms.Transform
+
+        :param points: An (N, k) array, a batch from vectorObjects.VectorArrays, or a list of vectors
+        :type points: np.ndarray | VectorArrayMaster | list
+
+        :param matrix: The matrix to apply to column vectors of each row, or a Transform whose row vector matrix is
+            transposed to match
+        :type matrix: np.ndarray | Transform
+
+        :param out: An optional float64 (N, k) array to write into
+
+        :rtype: np.ndarray | VectorArrayMaster
+        """
+        array = as_points(points)
+        matrix = matrix.matrix.T if isinstance(matrix, Transform) else np.asarray(matrix, dtype=np.float64)
+        width = array.shape[1]
+        if matrix.shape not in ((width, width), (width + 1, width + 1)):
+            raise ValueError(f"Points of width {width} require a matrix of shape {(width, width)} or "
+                             f"{(width + 1, width + 1)} but found {matrix.shape}")
+
+        return self._result(points, self.map_rows(_transform_kernel, [array], width, (matrix, ), out))
+
+    def rotate(self, points, radians, origin=(0, 0), out=None, rounding=7):
+        """
+        Rotate 2D points around an origin, as vectorObjects.Rotations.rotate_around_point
+
+        :param points: An (N, 2) array, a Vector2DArray, or a list of Vector2D
+        :type points: np.ndarray | Vector2DArray | list
+
+        :param radians: Ether a single angle for every point, or an (N, ) array of one angle per point
+        :type radians: float | np.ndarray
+
+        :param origin: A single origin for every point
+        :type origin: tuple | Vector2D
+
+        :param out: An optional float64 (N, 2) array to write into
+        :param rounding: The number of decimal places to round to, or None to skip rounding
+
+        :rtype: np.ndarray
+        """
+        array = as_points(points)
+        radians = np.asarray(radians, dtype=np.float64)
+        origin = tuple(origin)
+
+        if radians.ndim == 0:
+            return self.map_rows(_rotate_kernel, [array], 2, (float(radians), origin, rounding), out)
+        return self.map_rows(_rotate_kernel, [array, radians], 2, (origin, rounding), out)
+
+    def sub_divide(self, starts, ends, sub_divisions, include_points=True, include_end=True):
+        """
+        Sub divide many independent segments, as vectorObjects.Polylines.sub_divide_segments
+
+        :return: An (M, k) array of all the points, and an array of length S + 1 where the points of segment i are the
+            rows offsets[i]:offsets[i + 1]
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        starts, ends = as_points(starts), as_points(ends)
+        if starts.shape != ends.shape:
+            raise ValueError(f"Starts and ends must be of the same shape but found {starts.shape} and {ends.shape}")
+
+        counts = _segment_counts(sub_divisions, len(starts))
+        # The same number of rows per segment as sub_divide_segments returns
+        rows = counts + (2 if include_end else 1) if include_points else counts
+        offsets = np.concatenate(([0], np.cumsum(rows)))
+
+        points = self.map_rows(_sub_divide_kernel, [starts, ends, counts], starts.shape[1],
+                               (include_points, include_end), offsets=offsets)
+        return points, offsets
@@ -0,0 +1,226 @@
+from vectorObjects.VectorArrays import as_points
+from vectorObjects.VectorMaster import VectorMaster
+import numpy as np
+
+
+def _segment_counts(sub_divisions, segments):
+    """
+    Return sub_divisions as an array of one count per segment
+    """
+    counts = np.broadcast_to(np.asarray(sub_divisions, dtype=np.int64), (segments, )).copy()
+    if (counts < 0).any():
+        raise ValueError("The number of sub divisions of a segment cannot be negative")
+    return counts
+
+
+def sub_divide_segments(starts, ends, sub_divisions, include_points=True, include_end=True):
+    """
+    Sub divide many independent segments in a single vectorised call, with the points of each segment calculated the
+    same way as VectorMaster._sub_divide.
+
+    :param starts: The first point of each segment
+    :type starts: np.ndarray | VectorArrayMaster | list
+
+    :param ends: The last point of each segment
+    :type ends: np.ndarray | VectorArrayMaster | list
+
+    :param sub_divisions: The number of points to calculate between the start and end of each segment, ether the same
+        for every segment or an array of one count per segment
+    :type sub_divisions: int | np.ndarray
+
+    :param include_points: If True the start of each segment is included in the returned points
+    :type include_points: bool
+
+    :param include_end: If True, and include_points is True, the end of each segment is included in the returned points
+    :type include_end: bool
+
+    :return: An (M, k) array of all the points, and an array of length S + 1 where the points of segment i are the rows
+        offsets[i]:offsets[i + 1]
+    :rtype: (np.ndarray, np.ndarray)
+    """
+    starts, ends = as_points(starts), as_points(ends)
+    if starts.shape != ends.shape:
+        raise ValueError(f"Starts and ends must be of the same shape but found {starts.shape} and {ends.shape}")
+
+    counts = _segment_counts(sub_divisions, len(starts))
+    divisions = counts + 1
+
+    # The index within the linspace of the first and one past the last point returned for each segment
+    first = np.zeros_like(counts) if include_points else np.ones_like(counts)
+    stop = divisions + 1 if include_points and include_end else divisions
+
+    rows = stop - first
+    offsets = np.concatenate(([0], np.cumsum(rows)))
+
+    segment = np.repeat(np.arange(len(starts)), rows)
+    index = np.arange(offsets[-1]) - offsets[segment] + first[segment]
+
+    steps = (ends - starts) / divisions[:, None]
+    points = index[:, None] * steps[segment] + starts[segment]
+
+    # As with numpy.linspace, the end of each segment is set exactly rather than being calculated
+    is_end = index == divisions[segment]
+    points[is_end] = ends[segment[is_end]]
+    return points, offsets
+
+
+def iter_sub_divide_segments(starts, ends, sub_divisions, include_points=True, include_end=True, chunk_size=65536):
+    """
+    Lazily sub divide many independent segments, yielding the points chunk_size segments at a time so memory is bound
+    by the chunk rather than the total number of points. Arguments are as sub_divide_segments.
+
+    :return: A generator of (points, offsets) as returned by sub_divide_segments for each chunk of segments
+    :rtype: generator
+    """
+    starts, ends = as_points(starts), as_points(ends)
+    counts = _segment_counts(sub_divisions, len(starts))
+
+    for begin in range(0, len(starts), chunk_size):
+        end = begin + chunk_size
+        yield sub_divide_segments(starts[begin:end], ends[begin:end], counts[begin:end], include_points,
+                                  include_end)
+
+
+class Polyline:
+    """
+    A path through an ordered set of points, with vectorised sub division and resampling of all of its segments at
+    once.
+    """
+    __slots__ = ["points"]
+
+    def __init__(self, points):
+        """
+        Points can be an (N, k) array-like, a batch from vectorObjects.VectorArrays, or a list of vectors
+        """
+        self.points = as_points(points)
+        if len(self.points) < 2:
+            raise ValueError(f"A Polyline requires at least two points but found {len(self.points)}")
+
+    def __repr__(self):
+        return f"Polyline({len(self.points)} points, {self.points.shape[1]} dimensions)"
+
+    def __len__(self):
+        return len(self.points)
+
+    def segment_count(self):
+        """
+        The number of segments between the points of this path
+        """
+        return len(self.points) - 1
+
+    def segment_lengths(self):
+        """
+        The euclidean length of each segment
+        """
+        deltas = np.diff(self.points, axis=0)
+        return np.sqrt(np.einsum("ij,ij->i", deltas, deltas))
+
+    def length(self):
+        """
+        The total length of the path
+        """
+        return float(self.segment_lengths().sum())
+
+    def sub_divide(self, sub_divisions):
+        """
+        Insert points into every segment of the path, where points shared by two segments are only returned once
+
+        :param sub_divisions: The number of points to insert into each segment, ether the same for every segment or an
+            array of one count per segment
+        :type sub_divisions: int | np.ndarray
+
+        :return: An (M, k) array of the resampled path
+        :rtype: np.ndarray
+        """
+        points, _ = sub_divide_segments(self.points[:-1], self.points[1:], sub_divisions, include_end=False)
+        return np.concatenate((points, self.points[-1:]))
+
+    def iter_sub_divide(self, sub_divisions, chunk_size=65536):
+        """
+        As sub_divide, but yielding the path in chunks of chunk_size segments so memory stays flat when only iterating
+        over the results
+
+        :rtype: generator
+        """
+        counts = _segment_counts(sub_divisions, self.segment_count())
+        for begin in range(0, self.segment_count(), chunk_size):
+            end = min(begin + chunk_size, self.segment_count())
+            points, _ = sub_divide_segments(self.points[begin:end], self.points[begin + 1:end + 1], counts[begin:end],
+                                            include_end=False)
+            yield points
+
+        yield self.points[-1:]
+
+    def iter_vectors(self, vector_type, sub_divisions, chunk_size=65536):
+        """
+        Lazily yield each point of the sub divided path as an instance of vector_type, such as Vector3D
+
+        :rtype: generator
+        """
+        for chunk in self.iter_sub_divide(sub_divisions, chunk_size):
+            for values in chunk.tolist():
+                yield VectorMaster._from_values(vector_type, values)
+
+    def _uniform_distances(self, count, spacing):
+        """
+        The total distance along the path of each resampled point and the number of points
+        """
+        total = self.length()
+        if (count is None) == (spacing is None):
+            raise ValueError("Uniform resampling requires ether count or spacing to be set")
+
+        if spacing is not None:
+            if spacing <= 0:
+                raise ValueError(f"Spacing must be positive but found {spacing}")
+            count = int(np.floor(total / spacing)) + 1
+            # Always end on the last point of the path, even if it is closer than spacing to the previous point
+            return total, count, spacing, not np.isclose((count - 1) * spacing, total)
+
+        if count < 2:
+            raise ValueError(f"Uniform resampling requires a count of at least 2 but found {count}")
+        return total, count, total / (count - 1), False
+
+    def _points_at(self, distances):
+        """
+        The points at each distance along the path
+        """
+        lengths = self.segment_lengths()
+        cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+
+        segment = np.clip(np.searchsorted(cumulative, distances, side="right") - 1, 0, len(lengths) - 1)
+        segment_length = lengths[segment]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(segment_length > 0, (distances - cumulative[segment]) / segment_length, 0.0)
+
+        start = self.points[segment]
+        return start + (self.points[segment + 1] - start) * t[:, None]
+
+    def resample_uniform(self, count=None, spacing=None):
+        """
+        Resample the path so that the points are spaced evenly along its arc length, ether as count points or with
+        spacing between each point. The first and last points of the path are always kept.
+
+        :rtype: np.ndarray
+        """
+        return np.concatenate(list(self.iter_resample_uniform(count, spacing, chunk_size=None)))
+
+    def iter_resample_uniform(self, count=None, spacing=None, chunk_size=65536):
+        """
+        As resample_uniform, but yielding the points in chunks of chunk_size so memory stays flat when only iterating
+        over the results. A chunk_size of None returns all the points in a single chunk.
+
+        :rtype: generator
+        """
+        total, count, spacing, append_end = self._uniform_distances(count, spacing)
+        chunk_size = count if chunk_size is None else chunk_size
+
+        for begin in range(0, count, chunk_size):
+            index = np.arange(begin, min(begin + chunk_size, count), dtype=np.float64)
+            distances = np.minimum(index * spacing, total)
+            if not append_end and begin + chunk_size >= count:
+                distances[-1] = total
+            yield self._points_at(distances)
+
+        if append_end:
+            yield self.points[-1:]
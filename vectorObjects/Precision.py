@@ -0,0 +1,165 @@
+from contextlib import contextmanager
+import numpy as np
+import struct
+import re
+
+
+_FLOAT32 = struct.Struct("f")
+
+
+def _to_float32(value):
+    """
+    Round a python float to the nearest value representable at single precision
+    """
+    return _FLOAT32.unpack(_FLOAT32.pack(value))[0]
+
+
+class PrecisionPolicy:
+    """
+    How the results of vector operations are stored.
+
+    exact: No rounding is applied, which is the fastest mode
+    rounded(n): Results are rounded to n decimal places, which with n = 14 was the behaviour of all versions prior to
+        precision policies being added and remains the default
+    float32: Results are stored at single precision, as PymeshioQuaternion does with its 'f' arrays
+    """
+    __slots__ = ["name", "digits", "single", "exact"]
+
+    def __init__(self, name, digits=None, single=False):
+        self.name = name
+        self.digits = digits
+        self.single = single
+        self.exact = digits is None and not single
+
+    def __repr__(self):
+        return f"PrecisionPolicy({self.name})"
+
+    def __eq__(self, other):
+        return isinstance(other, PrecisionPolicy) and self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    @classmethod
+    def rounded(cls, digits=14):
+        return cls(f"rounded({digits})", digits=digits)
+
+    @classmethod
+    def from_value(cls, value):
+        """
+        Create a policy from ether an existing PrecisionPolicy, a string of exact, float32, rounded or rounded(n), or
+        an int which will be treated as the number of digits to round to.
+
+        :type value: PrecisionPolicy | str | int
+        :rtype: PrecisionPolicy
+        """
+        if isinstance(value, PrecisionPolicy):
+            return value
+
+        elif isinstance(value, int) and not isinstance(value, bool):
+            return cls.rounded(value)
+
+        elif isinstance(value, str):
+            mode = value.strip().lower()
+            if mode == "exact":
+                return EXACT
+            elif mode == "float32":
+                return FLOAT32
+            elif mode == "rounded":
+                return ROUNDED
+
+            digits = re.fullmatch(r"rounded\((\d+)\)", mode)
+            if digits:
+                return cls.rounded(int(digits.group(1)))
+
+            raise ValueError(f"Unknown precision policy {value}: expected exact, float32, rounded or rounded(n)")
+
+        else:
+            raise TypeError(f"Precision policies can be set from a PrecisionPolicy, str or int but found {type(value)}")
+
+    def apply(self, value):
+        """
+        Apply this policy to a single value
+        """
+        if self.single:
+            return _to_float32(value)
+        elif self.digits is not None:
+            return round(value, self.digits)
+        else:
+            return value
+
+    def apply_array(self, array):
+        """
+        Apply this policy to a float64 numpy array in place
+        """
+        if self.single:
+            np.copyto(array, array.astype(np.float32))
+        elif self.digits is not None:
+            np.round(array, self.digits, out=array)
+        return array
+
+
+EXACT = PrecisionPolicy("exact")
+ROUNDED = PrecisionPolicy.rounded(14)
+FLOAT32 = PrecisionPolicy("float32", single=True)
+
+
+class _PrecisionState:
+    """
+    Holds the policy in use, which generated methods look up on each call
+    """
+    __slots__ = ["policy"]
+
+    def __init__(self):
+        self.policy = ROUNDED
+
+
+_state = _PrecisionState()
+
+
+def get_precision():
+    """
+    Returns the precision policy currently in use
+
+    :rtype: PrecisionPolicy
+    """
+    return _state.policy
+
+
+def set_precision(policy):
+    """
+    Set the precision policy used by all vector and batch operations
+
+    :param policy: A PrecisionPolicy, or a value that can be parsed into one such as "exact", "float32" or "rounded(10)"
+    :type policy: PrecisionPolicy | str | int
+
+    :return: The previous policy
+    :rtype: PrecisionPolicy
+    """
+    previous = _state.policy
+    _state.policy = PrecisionPolicy.from_value(policy)
+    return previous
+
+
+@contextmanager
+def precision(policy):
+    """
+    Use a precision policy for all operations within a with block, restoring the previous policy on exit
+
+    :param policy: A PrecisionPolicy, or a value that can be parsed into one such as "exact", "float32" or "rounded(10)"
+    :type policy: PrecisionPolicy | str | int
+    """
+    previous = set_precision(policy)
+    try:
+        yield _state.policy
+    finally:
+        _state.policy = previous
+
+
+def resolve(policy=None):
+    """
+    Resolve a per call policy, falling back to the current policy if None
+
+    :rtype: PrecisionPolicy
+    """
+    return _state.policy if policy is None else PrecisionPolicy.from_value(policy)
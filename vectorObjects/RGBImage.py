@@ -0,0 +1,321 @@
+from vectorObjects.DefinedVectors import VectorRGB
+from vectorObjects.VectorMaster import VectorMaster
+from itertools import chain
+import numpy as np
+
+
+def _channel(index):
+    """
+    A property that reads and writes one channel of the pixel of a VectorRGBView
+    """
+    def getter(self):
+        return self._pixel[index].item()
+
+    def setter(self, value):
+        self._pixel[index] = _saturate(np.asarray(value, dtype=np.float64), self._pixel.dtype)
+
+    return property(getter, setter)
+
+
+def _saturate(values, dtype):
+    """
+    Convert values to dtype, rounding and clamping to 0 - 255 for uint8 rather than letting them wrap around
+    """
+    if dtype == np.uint8:
+        return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+    return np.asarray(values).astype(dtype)
+
+
+class VectorRGBView(VectorRGB):
+    """
+    A VectorRGB that reads and writes a single pixel of an RGBImage rather than holding its own values, so pixels can
+    be used as VectorRGB without copying them out of the image.
+
+    Operators that return a new vector return a plain VectorRGB, whilst in place operators, normalise and setting r, g,
+    or b write back to the image, saturating for uint8 images.
+    """
+    __slots__ = ["_pixel"]
+
+    r = _channel(0)
+    g = _channel(1)
+    b = _channel(2)
+
+    def __init__(self, pixel):
+        """
+        :param pixel: A writable view of the three channels of a single pixel
+        :type pixel: np.ndarray
+        """
+        self._pixel = pixel
+
+    def __repr__(self):
+        return f"VectorRGBView{self.r, self.g, self.b}"
+
+    def to_vector(self):
+        """
+        Returns a VectorRGB copy of this pixel
+        """
+        return VectorMaster._from_values(VectorRGB, self._pixel.tolist())
+
+    def copy(self):
+        return self.to_vector()
+
+    @classmethod
+    def from_array(cls, values):
+        """
+        Views are only created from an RGBImage, so this returns a plain VectorRGB
+        """
+        return VectorRGB.from_array(values)
+
+    @classmethod
+    def from_buffer(cls, buffer, dtype=np.float64, offset=0):
+        return VectorRGB.from_buffer(buffer, dtype, offset)
+
+    @classmethod
+    def _from_rows(cls, rows):
+        return VectorRGB._from_rows(rows)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("A VectorRGBView cannot be converted to an array without a copy")
+        return np.array(self._pixel, dtype=dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return self.to_vector().__array_ufunc__(ufunc, method, *[self._as_vector(value) for value in inputs],
+                                                **kwargs)
+
+    def __add__(self, other):
+        return self.to_vector() + self._as_vector(other)
+
+    def __sub__(self, other):
+        return self.to_vector() - self._as_vector(other)
+
+    def __mul__(self, other):
+        return self.to_vector() * self._as_vector(other)
+
+    def __truediv__(self, other):
+        return self.to_vector() / self._as_vector(other)
+
+    def __neg__(self):
+        return -self.to_vector()
+
+    def _write(self, vector):
+        if vector is NotImplemented:
+            return NotImplemented
+        self._pixel[:] = _saturate(np.array(vector.to_list(), dtype=np.float64), self._pixel.dtype)
+        return self
+
+    def __iadd__(self, other):
+        return self._write(self.to_vector().__iadd__(self._as_vector(other)))
+
+    def __isub__(self, other):
+        return self._write(self.to_vector().__isub__(self._as_vector(other)))
+
+    def __imul__(self, other):
+        return self._write(self.to_vector().__imul__(self._as_vector(other)))
+
+    def __itruediv__(self, other):
+        return self._write(self.to_vector().__itruediv__(self._as_vector(other)))
+
+    def add_scaled(self, other, scale):
+        return self._write(self.to_vector().add_scaled(self._as_vector(other), scale))
+
+    @staticmethod
+    def _as_vector(other):
+        """
+        Other as a plain VectorRGB if it is a view, as the generated methods of VectorRGB expect the same class
+        """
+        return other.to_vector() if isinstance(other, VectorRGBView) else other
+
+    def __eq__(self, other):
+        return self.to_vector() == self._as_vector(other)
+
+    def __hash__(self):
+        return hash(self.to_vector())
+
+    def isclose(self, other, rel_tol=1e-09, abs_tol=0.0):
+        return self.to_vector().isclose(self._as_vector(other), rel_tol, abs_tol)
+
+    def dot_product(self, other):
+        return self.to_vector().dot_product(self._as_vector(other))
+
+    def cross_product(self, other):
+        vector = self.to_vector()
+        vector.cross_product(self._as_vector(other))
+        self._write(vector)
+        return self.to_tuple()
+
+
+class RGBImage:
+    """
+    An image held as a single (H, W, 3) uint8 or float32 numpy array rather than nested lists of VectorRGB.
+
+    Indexing with two ints returns a VectorRGBView of that pixel, and indexing with slices returns an RGBImage that
+    shares memory with this one, so regions can be operated on in place. Arithmetic follows the same rules as
+    VectorRGB, with results clamped to 0 - 255 for uint8 images.
+    """
+    __slots__ = ["data"]
+
+    def __init__(self, data):
+        """
+        :param data: An (H, W, 3) array of uint8 or float32
+        :type data: np.ndarray
+        """
+        data = np.asarray(data)
+        if data.ndim != 3 or data.shape[2] != 3:
+            raise ValueError(f"RGBImage expects data of shape (H, W, 3) but found {data.shape}")
+        if data.dtype not in (np.uint8, np.float32):
+            raise TypeError(f"RGBImage expects data of uint8 or float32 but found {data.dtype}")
+        self.data = data
+
+    @classmethod
+    def blank(cls, width, height, colour=(0, 0, 0), dtype=np.uint8):
+        """
+        Create an image of width by height pixels set to a single colour
+        """
+        data = np.empty((height, width, 3), dtype=dtype)
+        data[:] = _saturate(np.asarray(tuple(colour), dtype=np.float64), np.dtype(dtype))
+        return cls(data)
+
+    @classmethod
+    def from_vectors(cls, matrix, dtype=np.uint8):
+        """
+        Create an image from a list of rows, each of which is a list of VectorRGB, as created in Examples/examples.py
+
+        :param matrix: A height long list of width long lists of VectorRGB
+        :type matrix: list[list[VectorRGB]]
+
+        :rtype: RGBImage
+        """
+        height = len(matrix)
+        width = len(matrix[0]) if height > 0 else 0
+        if any(len(row) != width for row in matrix):
+            raise ValueError("Every row of the matrix must be of the same length")
+
+        flat = np.fromiter(chain.from_iterable(chain.from_iterable(matrix)), dtype=np.float64,
+                           count=height * width * 3)
+        return cls(_saturate(flat.reshape(height, width, 3), np.dtype(dtype)))
+
+    def to_vectors(self):
+        """
+        Returns the image as a list of rows, each of which is a list of VectorRGB
+        """
+        return [[VectorMaster._from_values(VectorRGB, pixel) for pixel in row] for row in self.data.tolist()]
+
+    def to_array(self):
+        return self.data
+
+    def __repr__(self):
+        return f"RGBImage({self.width()}x{self.height()}, {self.data.dtype})"
+
+    def width(self):
+        return self.data.shape[1]
+
+    def height(self):
+        return self.data.shape[0]
+
+    def copy(self):
+        return RGBImage(self.data.copy())
+
+    def __getitem__(self, item):
+        """
+        image[y, x] returns a VectorRGBView of that pixel, whilst slices return an RGBImage view of that region
+        """
+        if isinstance(item, tuple) and len(item) == 2 and all(isinstance(i, (int, np.integer)) for i in item):
+            return VectorRGBView(self.data[item])
+
+        region = self.data[item]
+        if region.ndim != 3:
+            raise IndexError("Index an RGBImage with ether two ints for a pixel, or slices for a region")
+        return RGBImage(region)
+
+    def __setitem__(self, key, value):
+        """
+        Set a pixel or region from an RGBImage, VectorRGB, a constant, a list/tuple of three values, or an array
+        """
+        self.data[key] = _saturate(self._operand(value), self.data.dtype)
+
+    def pixels(self):
+        """
+        Yield a VectorRGBView of every pixel, row by row
+        """
+        for y in range(self.height()):
+            for x in range(self.width()):
+                yield VectorRGBView(self.data[y, x])
+
+    def _operand(self, other):
+        """
+        Convert other into something that broadcasts against the (H, W, 3) data, following the rules of VectorRGB
+        """
+        if isinstance(other, RGBImage):
+            return other.data.astype(np.float32)
+
+        elif isinstance(other, VectorRGB):
+            return np.array(other.to_list(), dtype=np.float32)
+
+        elif isinstance(other, (int, float, np.integer, np.floating)):
+            return float(other)
+
+        elif isinstance(other, (list, tuple)):
+            if len(other) == 3:
+                return np.array(other, dtype=np.float32)
+            else:
+                raise ValueError("A list/tuple must be of the same length as the number of attributes of the vector\n"
+                                 f"Length of input: {len(other)}\n"
+                                 f"Length of attributes: 3")
+
+        elif isinstance(other, np.ndarray):
+            return other.astype(np.float32)
+
+        else:
+            raise TypeError(f"RGBImage cannot operate with type {type(other)}")
+
+    def _operate(self, other, operation, in_place):
+        """
+        Apply the operation in float32, which holds every uint8 value exactly, then saturate back into the dtype of the
+        image. Operands of any other type return NotImplemented so python can try the reflected operation.
+        """
+        try:
+            operand = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = _saturate(operation(self.data.astype(np.float32), operand), self.data.dtype)
+
+        if in_place:
+            self.data[...] = result
+            return self
+        return RGBImage(result)
+
+    def __add__(self, other):
+        return self._operate(other, np.add, False)
+
+    def __sub__(self, other):
+        return self._operate(other, np.subtract, False)
+
+    def __mul__(self, other):
+        return self._operate(other, np.multiply, False)
+
+    def __truediv__(self, other):
+        return self._operate(other, np.true_divide, False)
+
+    def __iadd__(self, other):
+        return self._operate(other, np.add, True)
+
+    def __isub__(self, other):
+        return self._operate(other, np.subtract, True)
+
+    def __imul__(self, other):
+        return self._operate(other, np.multiply, True)
+
+    def __itruediv__(self, other):
+        return self._operate(other, np.true_divide, True)
+
+    def __eq__(self, other):
+        if not isinstance(other, RGBImage):
+            return NotImplemented
+        return self.data.shape == other.data.shape and bool((self.data == other.data).all())
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
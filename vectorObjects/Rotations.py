@@ -0,0 +1,122 @@
+from vectorObjects.VectorArrays import as_points
+import numpy as np
+
+
+def _round(values, rounding):
+    """
+    Round values in place to the number of decimal places Vector2D.rotate_around_point uses, unless rounding is None
+    """
+    if rounding is not None:
+        np.round(values, rounding, out=values)
+    return values
+
+
+def _output(out, shape):
+    """
+    Validate a preallocated output buffer, or create one if out is None
+    """
+    if out is None:
+        return np.empty(shape, dtype=np.float64)
+
+    if out.shape != shape or out.dtype != np.float64:
+        raise ValueError(f"Output buffer must be a float64 array of shape {shape} but found {out.dtype} {out.shape}")
+    return out
+
+
+class Rotation2D:
+    """
+    A rotation by a fixed angle around a fixed origin, with the same direction as Vector2D.rotate_around_point, that
+    calculates its sin/cos matrix once so it can be applied to many batches of points.
+    """
+    __slots__ = ["radians", "origin", "matrix"]
+
+    def __init__(self, radians, origin=(0, 0)):
+        self.radians = float(radians)
+        self.origin = np.asarray(tuple(origin), dtype=np.float64)
+
+        cos_rad = np.cos(self.radians)
+        sin_rad = np.sin(self.radians)
+
+        # Transposed so that rows of points can be multiplied by it directly
+        self.matrix = np.array([[cos_rad, -sin_rad],
+                                [sin_rad, cos_rad]])
+
+    def __repr__(self):
+        return f"Rotation2D(radians={self.radians}, origin={tuple(self.origin.tolist())})"
+
+    def apply(self, points, out=None, rounding=7):
+        """
+        Rotate every point as a single matrix multiplication
+
+        :param points: An (N, 2) array, a Vector2DArray, or a sequence of Vector2D
+        :type points: np.ndarray | vectorObjects.VectorArrays.Vector2DArray | list[Vector2D]
+
+        :param out: An optional float64 (N, 2) array to write the rotated points into, which may be points itself
+        :type out: np.ndarray | None
+
+        :param rounding: The number of decimal places to round to as Vector2D.rotate_around_point does, or None to skip
+            rounding
+        :type rounding: int | None
+
+        :return: An (N, 2) array of the rotated points
+        :rtype: np.ndarray
+        """
+        points = as_points(points)
+        out = _output(out, points.shape)
+
+        adjusted = points - self.origin
+        np.matmul(adjusted, self.matrix, out=out)
+        out += self.origin
+        return _round(out, rounding)
+
+    def inverse(self):
+        """
+        Return the rotation that undoes this one
+        """
+        return Rotation2D(-self.radians, self.origin)
+
+
+def rotate_around_point(points, radians, origin=(0, 0), out=None, rounding=7):
+    """
+    Rotate a batch of points around an origin, as Vector2D.rotate_around_point does for a single point.
+
+    :param points: An (N, 2) array, a Vector2DArray, or a sequence of Vector2D
+    :type points: np.ndarray | vectorObjects.VectorArrays.Vector2DArray | list[Vector2D]
+
+    :param radians: Ether a single angle for every point, or an (N, ) array of one angle per point
+    :type radians: float | np.ndarray
+
+    :param origin: Ether a single origin for every point, or an (N, 2) array of one origin per point
+    :type origin: tuple | Vector2D | np.ndarray
+
+    :param out: An optional float64 (N, 2) array to write the rotated points into, which may be points itself
+    :type out: np.ndarray | None
+
+    :param rounding: The number of decimal places to round to, or None to skip rounding
+    :type rounding: int | None
+
+    :return: An (N, 2) array of the rotated points
+    :rtype: np.ndarray
+    """
+    radians = np.asarray(radians, dtype=np.float64)
+    origin = np.asarray(tuple(origin) if not isinstance(origin, np.ndarray) else origin, dtype=np.float64)
+
+    # A single angle and origin is a single matrix operation
+    if radians.ndim == 0 and origin.ndim == 1:
+        return Rotation2D(radians, origin).apply(points, out, rounding)
+
+    points = as_points(points)
+    out = _output(out, points.shape)
+
+    cos_rad = np.cos(radians)
+    sin_rad = np.sin(radians)
+
+    adjusted = points - origin
+    adjusted_x, adjusted_y = adjusted[:, 0], adjusted[:, 1]
+
+    np.multiply(cos_rad, adjusted_x, out=out[:, 0])
+    out[:, 0] += sin_rad * adjusted_y
+    np.multiply(-sin_rad, adjusted_x, out=out[:, 1])
+    out[:, 1] += cos_rad * adjusted_y
+    out += origin
+    return _round(out, rounding)
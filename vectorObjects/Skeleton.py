@@ -0,0 +1,294 @@
+from vectorObjects.DefinedVectors import Vector3D, PymeshioQuaternion
+from vectorObjects.VectorArrays import QuaternionArray, Vector3DArray, as_points
+from vectorObjects.Transforms import Transform
+from vectorObjects.VectorMaster import VectorMaster
+import numpy as np
+
+
+def multiply_quaternions(a, b):
+    """
+    The Hamilton product of arrays of quaternions in x, y, z, w order, as PymeshioQuaternion.__mul__, so rotating by
+    the result rotates by b and then by a
+
+    :param a: Quaternions of shape (..., 4)
+    :type a: np.ndarray
+
+    :param b: Quaternions of shape (..., 4), which broadcast against a
+    :type b: np.ndarray
+
+    :rtype: np.ndarray
+    """
+    u, v = a[..., :3], b[..., :3]
+    w1, w2 = a[..., 3:], b[..., 3:]
+
+    product = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.float64)
+    product[..., :3] = w1 * v + w2 * u + np.cross(u, v)
+    product[..., 3] = w1[..., 0] * w2[..., 0] - np.einsum("...i,...i->...", u, v)
+    return product
+
+
+def rotate_by_quaternions(quaternions, vectors):
+    """
+    Rotate arrays of vectors by unit quaternions, the same rotation as multiplying each vector as a row by
+    PymeshioQuaternion.getMatrix
+
+    :param quaternions: Unit quaternions of shape (..., 4) in x, y, z, w order
+    :type quaternions: np.ndarray
+
+    :param vectors: Vectors of shape (..., 3), which broadcast against quaternions
+    :type vectors: np.ndarray
+
+    :rtype: np.ndarray
+    """
+    u, w = quaternions[..., :3], quaternions[..., 3:]
+    twice_cross = 2.0 * np.cross(u, vectors)
+    return vectors + w * twice_cross + np.cross(u, twice_cross)
+
+
+def _as_quaternions(rotations, shape):
+    if isinstance(rotations, QuaternionArray):
+        rotations = rotations.data
+    elif isinstance(rotations, list) and rotations and isinstance(rotations[0], VectorMaster):
+        rotations = as_points(rotations)
+
+    rotations = np.asarray(rotations, dtype=np.float64)
+    if rotations.shape[-2:] != shape:
+        raise ValueError(f"Rotations are expected to be of shape (..., {shape[0]}, 4) but found {rotations.shape}")
+    return rotations
+
+
+def _as_translations(translations, shape):
+    if isinstance(translations, Vector3DArray) or (isinstance(translations, list) and translations and
+                                                   isinstance(translations[0], VectorMaster)):
+        translations = as_points(translations)
+
+    translations = np.asarray(translations, dtype=np.float64)
+    if translations.shape[-2:] != shape:
+        raise ValueError(f"Translations are expected to be of shape (..., {shape[0]}, 3) but found "
+                         f"{translations.shape}")
+    return translations
+
+
+class Skeleton:
+    """
+    A hierarchy of bones, where each bone has a parent, a rest offset from its parent, and a local rotation and
+    translation, such as the bones of a pmx model driven by a vmd motion.
+
+    World rotations and positions are calculated one level of the hierarchy at a time, so every bone of a level is
+    calculated in one vectorised step after all of their parents. A bone's world rotation is its parents world
+    rotation multiplied by its local rotation, and its world position is its parents world position plus its offset
+    and local translation rotated by its parents world rotation.
+
+    evaluate keeps the world pose of a single frame, and only recalculates the bones whose local pose changed, along
+    with their descendants. evaluate_frames calculates many frames at once, such as those of
+    MotionInterpolator.evaluate.
+    """
+    __slots__ = ["parents", "offsets", "levels", "local_rotations", "local_translations", "_world_rotations",
+                 "_world_positions", "_dirty"]
+
+    def __init__(self, parents, offsets):
+        """
+        :param parents: The index of the parent of each bone, or -1 for a root bone. Parents do not need to come
+            before their children
+        :type parents: list[int] | np.ndarray
+
+        :param offsets: The rest offset of each bone from its parent, or from the origin for root bones
+        :type offsets: list[Vector3D] | Vector3DArray | np.ndarray
+
+        :raises ValueError: If a parent is out of range or the bones contain a cycle
+        """
+        self.parents = np.asarray(parents, dtype=np.intp).reshape(-1)
+        count = len(self.parents)
+        self.offsets = _as_translations(offsets, (count, 3)).copy()
+
+        if ((self.parents < -1) | (self.parents >= count)).any():
+            raise ValueError(f"Parents must be -1 or the index of one of the {count} bones")
+
+        self.levels = self._calculate_levels()
+        self.local_rotations = np.zeros((count, 4))
+        self.local_rotations[:, 3] = 1.0
+        self.local_translations = np.zeros((count, 3))
+
+        self._world_rotations = np.empty((count, 4))
+        self._world_positions = np.empty((count, 3))
+        self._dirty = np.ones(count, dtype=bool)
+
+    def __repr__(self):
+        return f"Skeleton({self.bone_count()} bones, {len(self.levels)} levels)"
+
+    def bone_count(self):
+        return len(self.parents)
+
+    def _calculate_levels(self):
+        """
+        The indices of the bones at each depth of the hierarchy, found by following every bones chain of ancestors
+        together, one step at a time
+        """
+        count = len(self.parents)
+        depths = np.zeros(count, dtype=np.intp)
+        ancestors = self.parents.copy()
+
+        for _ in range(count + 1):
+            has_parent = ancestors >= 0
+            if not has_parent.any():
+                break
+            depths += has_parent
+            ancestors[has_parent] = self.parents[ancestors[has_parent]]
+        else:
+            raise ValueError("The parents of the bones contain a cycle")
+
+        return [np.flatnonzero(depths == depth) for depth in range(depths.max() + 1 if count else 0)]
+
+    def set_local(self, bone, rotation=None, translation=None):
+        """
+        Set the local rotation and or translation of a single bone, which marks it as changed if either differ
+
+        :param bone: The index of the bone
+        :type bone: int
+
+        :param rotation: The local rotation, or None to leave it unchanged
+        :type rotation: PymeshioQuaternion | tuple | list | None
+
+        :param translation: The local translation, or None to leave it unchanged
+        :type translation: Vector3D | tuple | list | None
+        """
+        if rotation is not None:
+            rotation = (rotation.x, rotation.y, rotation.z, rotation.w) if isinstance(rotation, VectorMaster) else \
+                tuple(rotation)
+            if tuple(self.local_rotations[bone]) != rotation:
+                self.local_rotations[bone] = rotation
+                self._dirty[bone] = True
+
+        if translation is not None:
+            translation = (translation.x, translation.y, translation.z) if isinstance(translation, VectorMaster) \
+                else tuple(translation)
+            if tuple(self.local_translations[bone]) != translation:
+                self.local_translations[bone] = translation
+                self._dirty[bone] = True
+
+    def set_pose(self, rotations=None, translations=None, bones=None):
+        """
+        Set the local rotations and or translations of many bones, marking only those whose values differ as changed
+
+        :param rotations: Quaternions of shape (N, 4), a QuaternionArray, or a list of PymeshioQuaternion
+        :type rotations: np.ndarray | QuaternionArray | list | None
+
+        :param translations: Translations of shape (N, 3), a Vector3DArray, or a list of Vector3D
+        :type translations: np.ndarray | Vector3DArray | list | None
+
+        :param bones: The indices of the N bones to set, or None for every bone
+        :type bones: np.ndarray | list | None
+        """
+        bones = np.arange(self.bone_count()) if bones is None else np.asarray(bones, dtype=np.intp).reshape(-1)
+
+        for values, local, convert, width in ((rotations, self.local_rotations, _as_quaternions, 4),
+                                              (translations, self.local_translations, _as_translations, 3)):
+            if values is None:
+                continue
+            values = convert(values, (len(bones), width))
+            changed = (local[bones] != values).any(axis=1)
+            local[bones[changed]] = values[changed]
+            self._dirty[bones[changed]] = True
+
+    def _forward(self, rotations, translations, world_rotations, world_positions, dirty=None):
+        """
+        Calculate world rotations and positions one level at a time, for every bone or only the dirty bones. Arrays
+        have the bones as their second to last axis, so any leading axes, such as frames, are calculated together.
+        """
+        for depth, level in enumerate(self.levels):
+            if dirty is not None:
+                level = level[dirty[level]]
+                if len(level) == 0:
+                    continue
+
+            local_offsets = self.offsets[level] + translations[..., level, :]
+            if depth == 0:
+                world_rotations[..., level, :] = rotations[..., level, :]
+                world_positions[..., level, :] = local_offsets
+            else:
+                parents = self.parents[level]
+                parent_rotations = world_rotations[..., parents, :]
+                world_rotations[..., level, :] = multiply_quaternions(parent_rotations, rotations[..., level, :])
+                world_positions[..., level, :] = (world_positions[..., parents, :] +
+                                                  rotate_by_quaternions(parent_rotations, local_offsets))
+
+    def _update(self):
+        """
+        Recalculate the bones whose local pose changed, along with their descendants
+        """
+        dirty = self._dirty
+        if not dirty.any():
+            return
+
+        # A bone must be recalculated if its parent was, and the level order marks every parent before its children
+        for level in self.levels[1:]:
+            dirty[level] |= dirty[self.parents[level]]
+
+        self._forward(self.local_rotations, self.local_translations, self._world_rotations, self._world_positions,
+                      dirty)
+        dirty[:] = False
+
+    def evaluate(self):
+        """
+        Update the world pose of the bones whose local pose changed since the last evaluation, and of their
+        descendants
+
+        :return: The world rotation and position of every bone
+        :rtype: (QuaternionArray, Vector3DArray)
+        """
+        self._update()
+        return QuaternionArray(self._world_rotations.copy()), Vector3DArray(self._world_positions.copy())
+
+    def dirty_count(self):
+        """
+        The number of bones whose local pose changed since the last evaluation, not including their descendants
+        """
+        return int(self._dirty.sum())
+
+    def world_rotation(self, bone):
+        """
+        :rtype: PymeshioQuaternion
+        """
+        self._update()
+        return PymeshioQuaternion(*self._world_rotations[bone].tolist())
+
+    def world_position(self, bone):
+        """
+        :rtype: Vector3D
+        """
+        self._update()
+        return Vector3D(*self._world_positions[bone].tolist())
+
+    def world_transform(self, bone):
+        """
+        The world rotation and position of a bone as a vectorObjects.Transforms.Transform, which moves points from the
+        bones local space into world space
+
+        :rtype: Transform
+        """
+        return Transform.from_components(self.world_position(bone), self.world_rotation(bone))
+
+    def evaluate_frames(self, rotations, translations=None):
+        """
+        Calculate the world pose of every bone for many frames at once, such as the output of
+        MotionInterpolator.evaluate. This does not change the pose held by evaluate.
+
+        :param rotations: The local rotation of every bone in every frame, of shape (T, B, 4)
+        :type rotations: np.ndarray
+
+        :param translations: The local translation of every bone in every frame, of shape (T, B, 3), or None for no
+            translations
+        :type translations: np.ndarray | None
+
+        :return: World rotations of shape (T, B, 4) and world positions of shape (T, B, 3)
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        count = self.bone_count()
+        rotations = _as_quaternions(rotations, (count, 4))
+        translations = np.zeros(rotations.shape[:-1] + (3, )) if translations is None else \
+            _as_translations(translations, (count, 3))
+
+        world_rotations = np.empty(np.broadcast_shapes(rotations.shape[:-1], translations.shape[:-1]) + (4, ))
+        world_positions = np.empty(world_rotations.shape[:-1] + (3, ))
+        self._forward(rotations, translations, world_rotations, world_positions)
+        return world_rotations, world_positions
@@ -0,0 +1,592 @@
+from vectorObjects.VectorArrays import VectorArrayMaster, as_points
+from vectorObjects.VectorMaster import VectorMaster
+import numpy as np
+
+
+def _as_queries(points, dimensions):
+    """
+    Convert points into a (Q, dimensions) array, along with if a single point was given so that its results can be
+    returned directly rather than as a batch
+    """
+    if isinstance(points, VectorMaster):
+        queries, single = np.array([VectorMaster._return_list(points)], dtype=np.float64), True
+    elif isinstance(points, VectorArrayMaster) or (len(points) > 0 and isinstance(points[0], VectorMaster)):
+        queries, single = as_points(points), False
+    else:
+        queries = np.asarray(points, dtype=np.float64)
+        single = queries.ndim == 1
+        if single:
+            queries = queries.reshape(1, -1)
+
+    if queries.ndim != 2 or queries.shape[1] != dimensions:
+        raise ValueError(f"Expected points of {dimensions} dimensions but found an array of shape {queries.shape}")
+    return queries, single
+
+
+def _ranges(starts, ends):
+    """
+    Concatenate the ranges of starts to ends, returning the position in each range along with which range it is from
+    """
+    counts = ends - starts
+    group = np.repeat(np.arange(len(starts)), counts)
+    positions = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return group, positions
+
+
+def _squared_distances(points, queries):
+    difference = points - queries
+    return np.einsum("ij,ij->i", difference, difference)
+
+
+def _offsets(query_ids, query_count):
+    offsets = np.zeros(query_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(query_ids, minlength=query_count), out=offsets[1:])
+    return offsets
+
+
+def _top_k(query_ids, ids, squared, query_count, k):
+    """
+    The k closest of each query from pairs of (query, point), where every query has at least k pairs
+    """
+    order = np.lexsort((squared, query_ids))
+    take = _offsets(query_ids, query_count)[:-1, None] + np.arange(k)
+    return ids[order][take], np.sqrt(squared[order][take])
+
+
+class SpatialIndex:
+    """
+    Core logic for spatial indexes over a set of points, which answers nearest neighbour, radius and box queries for a
+    single point or a batch of points at once.
+
+    Each index implements _nearest, _radius_pairs and _box_pairs for a block of queries, whilst this class handles
+    converting the queries and grouping the results of each query. Ids are the row of each point in the points the
+    index was built from, or the ids returned when inserting into a UniformGrid.
+    """
+    __slots__ = ["dimensions"]
+
+    # The number of queries processed at once, which bounds the memory used by the candidates of each block
+    _query_block = 4096
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def _blocks(self, queries):
+        for start in range(0, len(queries), self._query_block):
+            yield start, queries[start:start + self._query_block]
+
+    def query(self, points, k=1):
+        """
+        Find the k nearest points to each query point
+
+        :param points: A single point, such as a Vector3D, or a batch of points as an (Q, k) array, a batch from
+            vectorObjects.VectorArrays, or a list of vectors
+        :type points: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param k: The number of neighbours to find
+        :type k: int
+
+        :return: The ids and distances of the nearest points, closest first, of shape (k, ) for a single point or (Q, k)
+            for a batch
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        queries, single = _as_queries(points, self.dimensions)
+        if not 1 <= k <= len(self):
+            raise ValueError(f"k must be between 1 and the number of points in the index ({len(self)}) but found {k}")
+
+        ids, distances = np.empty((len(queries), k), dtype=np.int64), np.empty((len(queries), k))
+        for start, block in self._blocks(queries):
+            ids[start:start + len(block)], distances[start:start + len(block)] = self._nearest(block, k)
+
+        return (ids[0], distances[0]) if single else (ids, distances)
+
+    def query_radius(self, points, radius):
+        """
+        Find every point within radius of each query point, inclusive of the radius
+
+        :param points: A single point or a batch of points, as accepted by query
+        :type points: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param radius: The radius of the search, ether one radius for every query or one per query
+        :type radius: float | np.ndarray
+
+        :return: For a single point the ids and distances of the points found, closest first. For a batch the ids and
+            distances of every query concatenated, along with (Q + 1) offsets so query i found ids[offsets[i]:
+            offsets[i + 1]]
+        :rtype: (np.ndarray, np.ndarray) | (np.ndarray, np.ndarray, np.ndarray)
+        """
+        queries, single = _as_queries(points, self.dimensions)
+        squared_radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (len(queries), )) ** 2
+
+        query_ids, ids, squared = [], [], []
+        for start, block in self._blocks(queries):
+            block_ids, block_points, block_squared = self._radius_pairs(block, squared_radius[start:start + len(block)])
+            query_ids.append(block_ids + start), ids.append(block_points), squared.append(block_squared)
+
+        query_ids, ids, squared = np.concatenate(query_ids), np.concatenate(ids), np.concatenate(squared)
+        order = np.lexsort((squared, query_ids))
+        ids, distances = ids[order], np.sqrt(squared[order])
+        return (ids, distances) if single else (ids, distances, _offsets(query_ids, len(queries)))
+
+    def query_box(self, lower, upper):
+        """
+        Find every point within an axis aligned box, inclusive of its bounds
+
+        :param lower: The minimum corner of a single box, or the minimum corners of a batch of boxes
+        :type lower: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :param upper: The maximum corner of each box, of the same form as lower
+        :type upper: VectorMaster | VectorArrayMaster | np.ndarray | list
+
+        :return: For a single box the ids of the points found in ascending order. For a batch the ids of every box
+            concatenated, along with (Q + 1) offsets so box i found ids[offsets[i]:offsets[i + 1]]
+        :rtype: np.ndarray | (np.ndarray, np.ndarray)
+        """
+        lower, single = _as_queries(lower, self.dimensions)
+        upper, _ = _as_queries(upper, self.dimensions)
+        lower, upper = np.broadcast_arrays(lower, upper)
+        if (lower > upper).any():
+            raise ValueError("The lower corner of a box cannot be greater than its upper corner")
+
+        query_ids, ids = [], []
+        for start, block in self._blocks(lower):
+            block_ids, block_points = self._box_pairs(block, upper[start:start + len(block)])
+            query_ids.append(block_ids + start), ids.append(block_points)
+
+        query_ids, ids = np.concatenate(query_ids), np.concatenate(ids)
+        ids = ids[np.lexsort((ids, query_ids))]
+        return ids if single else (ids, _offsets(query_ids, len(lower)))
+
+    def _nearest(self, queries, k):
+        raise NotImplementedError
+
+    def _radius_pairs(self, queries, squared_radius):
+        raise NotImplementedError
+
+    def _box_pairs(self, lower, upper):
+        raise NotImplementedError
+
+
+class KDTree(SpatialIndex):
+    """
+    A k-d tree held as flat arrays of nodes rather than node objects, with the points reordered so that the points of
+    every node are contiguous. Nodes are split at the median of their widest axis, and each node holds the bounding box
+    of its points, which is used to prune queries.
+
+    Queries are answered for a whole block of query points at once by walking the tree breadth first, keeping the
+    (query, node) pairs that can still hold a result at each level.
+    """
+    __slots__ = ["points", "leaf_size", "_order", "_ordered", "_lower", "_upper", "_start", "_end", "_left"]
+
+    def __init__(self, points, leaf_size=16):
+        """
+        :param points: The points to index, as an (N, k) array, a batch from vectorObjects.VectorArrays, or a list of
+            vectors
+        :type points: np.ndarray | VectorArrayMaster | list
+
+        :param leaf_size: The maximum number of points of a leaf node
+        :type leaf_size: int
+        """
+        self.points = as_points(points)
+        if len(self.points) == 0:
+            raise ValueError("A KDTree requires at least one point")
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size must be at least 1 but found {leaf_size}")
+
+        self.dimensions = self.points.shape[1]
+        self.leaf_size = leaf_size
+        self._build()
+
+    def __repr__(self):
+        return f"KDTree({len(self)} points, {len(self._start)} nodes)"
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self):
+        """
+        Build the tree a level at a time, where every node of a level is bounded and split in the same numpy calls
+        """
+        count = len(self.points)
+        order = np.arange(count)
+        ordered = self.points.copy()
+
+        lower, upper, starts, ends, lefts = [], [], [], [], []
+        level_start, level_end = np.array([0]), np.array([count])
+        node_count = 0
+
+        while len(level_start) > 0:
+            # Bound each node with reduceat over (start, end) pairs, where a padding row keeps an end of count in range
+            padded = np.vstack([ordered, ordered[-1:]])
+            bounds = np.column_stack([level_start, level_end]).ravel()
+            level_lower = np.minimum.reduceat(padded, bounds, axis=0)[::2]
+            level_upper = np.maximum.reduceat(padded, bounds, axis=0)[::2]
+
+            split = (level_end - level_start) > self.leaf_size
+            level_left = np.full(len(level_start), -1, dtype=np.int64)
+            level_left[split] = node_count + len(level_start) + 2 * np.arange(split.sum())
+
+            lower.append(level_lower), upper.append(level_upper), starts.append(level_start), ends.append(level_end)
+            lefts.append(level_left)
+            node_count += len(level_start)
+
+            # Sort the points of every node being split along its widest axis, so each half is contiguous. Each value
+            # is scaled into [node, node + 1) so every node is sorted with a single argsort, where any loss of precision
+            # only affects the balance of the tree, as queries are pruned by the bounds of each node.
+            split_start, split_end = level_start[split], level_end[split]
+            extent = level_upper[split] - level_lower[split]
+            axis = np.argmax(extent, axis=1)
+            rows = np.arange(len(axis))
+            split_lower, width = level_lower[split][rows, axis], extent[rows, axis] * 1.000001
+            group, positions = _ranges(split_start, split_end)
+            scaled = (ordered[positions, axis[group]] - split_lower[group]) / np.where(width > 0, width, 1.0)[group]
+            sort = positions[np.argsort(group + np.minimum(scaled, 0.999999))]
+            ordered[positions], order[positions] = ordered[sort], order[sort]
+
+            middle = (split_start + split_end) // 2
+            level_start = np.column_stack([split_start, middle]).ravel()
+            level_end = np.column_stack([middle, split_end]).ravel()
+
+        self._order, self._ordered = order, ordered
+        self._lower, self._upper = np.concatenate(lower), np.concatenate(upper)
+        self._start, self._end, self._left = np.concatenate(starts), np.concatenate(ends), np.concatenate(lefts)
+
+    def _box_distance(self, queries, nodes):
+        """
+        The squared distance from each query to the bounding box of its node, which is zero inside the box
+        """
+        outside = np.maximum(np.maximum(self._lower[nodes] - queries, queries - self._upper[nodes]), 0.0)
+        return np.einsum("ij,ij->i", outside, outside)
+
+    def _walk(self, query_ids, keep):
+        """
+        Walk the tree from the root for each query, descending into the nodes for which keep(query_ids, nodes) is True,
+        and return the (query, leaf) pairs that are reached
+        """
+        nodes = np.zeros(len(query_ids), dtype=np.int64)
+        leaf_queries, leaf_nodes = [], []
+
+        while len(query_ids) > 0:
+            kept = keep(query_ids, nodes)
+            query_ids, nodes = query_ids[kept], nodes[kept]
+
+            leaf = self._left[nodes] < 0
+            leaf_queries.append(query_ids[leaf]), leaf_nodes.append(nodes[leaf])
+
+            query_ids, children = query_ids[~leaf], self._left[nodes[~leaf]]
+            query_ids = np.repeat(query_ids, 2)
+            nodes = np.column_stack([children, children + 1]).ravel()
+
+        return np.concatenate(leaf_queries), np.concatenate(leaf_nodes)
+
+    def _leaf_points(self, query_ids, nodes):
+        """
+        Expand (query, leaf) pairs into (query, position) pairs for every point of each leaf
+        """
+        group, positions = _ranges(self._start[nodes], self._end[nodes])
+        return query_ids[group], positions
+
+    def _radius_pairs(self, queries, squared_radius):
+        query_ids, nodes = self._walk(np.arange(len(queries)), lambda q, n: (
+            self._box_distance(queries[q], n) <= squared_radius[q]))
+
+        query_ids, positions = self._leaf_points(query_ids, nodes)
+        squared = _squared_distances(self._ordered[positions], queries[query_ids])
+        found = squared <= squared_radius[query_ids]
+        return query_ids[found], self._order[positions[found]], squared[found]
+
+    def _box_pairs(self, lower, upper):
+        query_ids, nodes = self._walk(np.arange(len(lower)), lambda q, n: (
+            (self._lower[n] <= upper[q]).all(axis=1) & (self._upper[n] >= lower[q]).all(axis=1)))
+
+        query_ids, positions = self._leaf_points(query_ids, nodes)
+        points = self._ordered[positions]
+        found = (points >= lower[query_ids]).all(axis=1) & (points <= upper[query_ids]).all(axis=1)
+        return query_ids[found], self._order[positions[found]]
+
+    def _nearest(self, queries, k):
+        """
+        Descend to the smallest node around each query that still holds k points, so the distance to the kth closest
+        point of that node bounds a radius search that is guaranteed to contain the k nearest points
+        """
+        nodes = np.zeros(len(queries), dtype=np.int64)
+        active = np.arange(len(queries))
+
+        while len(active) > 0:
+            children = self._left[nodes[active]]
+            internal = children >= 0
+            active, children = active[internal], children[internal]
+
+            closer = children + (self._box_distance(queries[active], children + 1) <
+                                 self._box_distance(queries[active], children))
+            descend = (self._end[closer] - self._start[closer]) >= k
+            nodes[active[descend]] = closer[descend]
+            active = active[descend]
+
+        query_ids, positions = self._leaf_points(np.arange(len(queries)), nodes)
+        squared = _squared_distances(self._ordered[positions], queries[query_ids])
+        order = np.lexsort((squared, query_ids))
+        bound = squared[order][_offsets(query_ids, len(queries))[:-1] + k - 1]
+
+        query_ids, ids, squared = self._radius_pairs(queries, bound)
+        return _top_k(query_ids, ids, squared, len(queries), k)
+
+
+class UniformGrid(SpatialIndex):
+    """
+    A uniform grid of cells that supports inserting and removing points after it is created.
+
+    Each cell is packed into a single int64 key, and the points are held sorted by key so the points of a cell are
+    found with a binary search. Inserted points are held in a second, smaller set of sorted keys that is searched in the
+    same way until it grows large enough to be merged into the main keys, and removed points are masked out until the
+    grid is rebuilt.
+
+    Queries enumerate the cells overlapped by each query box, unless a box covers more cells than there are points, in
+    which case the occupied cells are walked instead, so sparse grids do not use memory for their empty cells.
+    """
+    __slots__ = ["cell_size", "_points", "_cell_keys", "_alive", "_count", "_size", "_keys", "_key_ids", "_indexed",
+                 "_pending_keys", "_pending_ids", "_removed", "_lower_cell", "_upper_cell", "_bits", "_occupied"]
+
+    # The minimum number of pending points before they are merged into the sorted keys
+    _merge_minimum = 1024
+
+    # The most (box, occupied cell) pairs compared at once when walking the occupied cells
+    _cell_block = 1 << 20
+
+    def __init__(self, cell_size, points=None, dimensions=3):
+        """
+        :param cell_size: The width of each cell, which is best set close to the typical radius of a query
+        :type cell_size: float
+
+        :param points: Optional points to insert, as accepted by insert
+        :type points: np.ndarray | VectorArrayMaster | list | None
+
+        :param dimensions: The number of dimensions of the points, which is taken from points if they are given
+        :type dimensions: int
+        """
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive but found {cell_size}")
+
+        initial = None if points is None else as_points(points)
+        self.dimensions = dimensions if initial is None else initial.shape[1]
+        self.cell_size = float(cell_size)
+
+        # Each cell coordinate is packed into bits of the key, offset so negative coordinates are positive
+        self._bits = 63 // self.dimensions
+        self._points = np.empty((0, self.dimensions))
+        self._cell_keys = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._count = 0
+        self._size = 0
+        self._keys = np.empty(0, dtype=np.int64)
+        self._key_ids = np.empty(0, dtype=np.int64)
+        self._indexed = 0
+        self._pending_keys = np.empty(0, dtype=np.int64)
+        self._pending_ids = np.empty(0, dtype=np.int64)
+        self._removed = 0
+        self._occupied = None
+        self._lower_cell = np.full(self.dimensions, np.iinfo(np.int64).max)
+        self._upper_cell = np.full(self.dimensions, np.iinfo(np.int64).min)
+
+        if initial is not None:
+            self.insert(initial)
+
+    def __repr__(self):
+        return f"UniformGrid({len(self)} points, cell_size {self.cell_size})"
+
+    def __len__(self):
+        return self._size
+
+    def points(self):
+        """
+        The points of the grid indexed by id, including the rows of any points that have been removed
+        """
+        return self._points[:self._count]
+
+    def _cells(self, points):
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+    def _pack(self, cells):
+        """
+        Pack the cell coordinates of each row into a single int64 key
+        """
+        shifted = cells + (1 << (self._bits - 1))
+        if (shifted < 0).any() or (shifted >= (1 << self._bits)).any():
+            raise ValueError(f"Points are too far from the origin to be held in a grid of cell_size {self.cell_size}")
+
+        keys = np.zeros(len(cells), dtype=np.int64)
+        for axis in range(self.dimensions):
+            keys |= shifted[:, axis] << (self._bits * axis)
+        return keys
+
+    def insert(self, points):
+        """
+        Insert points into the grid
+
+        :param points: A single point, or an (N, k) array, a batch from vectorObjects.VectorArrays, or a list of vectors
+        :type points: VectorMaster | np.ndarray | VectorArrayMaster | list
+
+        :return: The id of each inserted point
+        :rtype: np.ndarray
+        """
+        points, _ = _as_queries(points, self.dimensions)
+        cells = self._cells(points)
+        keys = self._pack(cells)
+
+        required = self._count + len(points)
+        if required > len(self._points):
+            capacity = max(required, 2 * len(self._points))
+            self._points = np.concatenate([self._points[:self._count], np.empty((capacity - self._count,
+                                                                                 self.dimensions))])
+            self._cell_keys = np.concatenate([self._cell_keys[:self._count], np.empty(capacity - self._count,
+                                                                                      dtype=np.int64)])
+            self._alive = np.concatenate([self._alive[:self._count], np.zeros(capacity - self._count, dtype=bool)])
+
+        ids = np.arange(self._count, required)
+        self._points[ids], self._cell_keys[ids], self._alive[ids] = points, keys, True
+        if len(points) > 0:
+            self._lower_cell = np.minimum(self._lower_cell, cells.min(axis=0))
+            self._upper_cell = np.maximum(self._upper_cell, cells.max(axis=0))
+
+        self._count = required
+        self._size += len(points)
+        self._occupied = None
+        if self._count - self._indexed > max(self._merge_minimum, self._indexed // 8):
+            self.rebuild()
+        else:
+            pending = np.arange(self._indexed, self._count)
+            order = np.argsort(self._cell_keys[pending], kind="stable")
+            self._pending_keys, self._pending_ids = self._cell_keys[pending][order], pending[order]
+        return ids
+
+    def remove(self, ids):
+        """
+        Remove points from the grid by the ids returned from insert
+
+        :param ids: A single id or an array of ids
+        :type ids: int | np.ndarray | list
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        if ((ids < 0) | (ids >= self._count)).any():
+            raise IndexError(f"Ids must be between 0 and {self._count - 1}")
+
+        ids = np.unique(ids)
+        if not self._alive[ids].all():
+            raise ValueError(f"Ids {ids[~self._alive[ids]].tolist()} have already been removed")
+
+        self._alive[ids] = False
+        self._size -= len(ids)
+        self._removed += len(ids)
+        if self._removed > len(self._keys) // 2:
+            self.rebuild()
+
+    def rebuild(self):
+        """
+        Sort the keys of every point in the grid, merging any pending inserts and dropping removed points
+        """
+        rows = np.flatnonzero(self._alive[:self._count])
+        order = np.argsort(self._cell_keys[rows], kind="stable")
+        self._keys, self._key_ids = self._cell_keys[rows][order], rows[order]
+        self._indexed = self._count
+        self._pending_keys = np.empty(0, dtype=np.int64)
+        self._pending_ids = np.empty(0, dtype=np.int64)
+        self._removed = 0
+        self._occupied = None
+
+    def _occupied_cells(self):
+        """
+        The sorted keys, and the cells, of every cell that holds an indexed or pending point, which may include cells
+        whose points have all been removed until the grid is rebuilt
+        """
+        if self._occupied is None:
+            keys = np.union1d(self._keys, self._pending_keys)
+            cells = np.empty((len(keys), self.dimensions), dtype=np.int64)
+            for axis in range(self.dimensions):
+                cells[:, axis] = (((keys >> (self._bits * axis)) & ((1 << self._bits) - 1)) -
+                                  (1 << (self._bits - 1)))
+            self._occupied = (keys, cells)
+        return self._occupied
+
+    def _candidates(self, lower, upper):
+        """
+        The (query, id) pairs of every indexed or pending point in the cells overlapped by each box
+        """
+        # Boxes are clipped to the cells that hold points before converting to ints, so very large boxes stay in range
+        lower_cells, upper_cells = np.floor(lower / self.cell_size), np.floor(upper / self.cell_size)
+        overlapping = np.flatnonzero(((upper_cells >= self._lower_cell) &
+                                      (lower_cells <= self._upper_cell)).all(axis=1))
+        lower_cells = np.maximum(lower_cells[overlapping], self._lower_cell).astype(np.int64)
+        upper_cells = np.minimum(upper_cells[overlapping], self._upper_cell).astype(np.int64)
+        extent = upper_cells - lower_cells + 1
+
+        small = np.prod(extent.astype(np.float64), axis=1) <= len(self._keys) + len(self._pending_keys)
+        dense, sparse = np.flatnonzero(small), np.flatnonzero(~small)
+
+        # Enumerate every cell of each small box by decomposing the position of the cell within its box axis by axis
+        group, local = _ranges(np.zeros(len(dense), dtype=np.int64), np.prod(extent[dense], axis=1))
+        group = dense[group]
+        cells = np.empty((len(group), self.dimensions), dtype=np.int64)
+        for axis in range(self.dimensions):
+            cells[:, axis] = lower_cells[group, axis] + local % extent[group, axis]
+            local = local // extent[group, axis]
+        groups, keys = [group], [self._pack(cells)]
+
+        # Boxes that cover more cells than there are points keep the occupied cells that lie inside them instead
+        occupied_keys, occupied_cells = self._occupied_cells() if len(sparse) else (None, None)
+        step = max(1, self._cell_block // max(len(self._keys) + len(self._pending_keys), 1))
+        for start in range(0, len(sparse), step):
+            boxes = sparse[start:start + step]
+            inside = ((occupied_cells[None] >= lower_cells[boxes, None]) &
+                      (occupied_cells[None] <= upper_cells[boxes, None])).all(axis=2)
+            box, cell = np.nonzero(inside)
+            groups.append(boxes[box]), keys.append(occupied_keys[cell])
+
+        group, keys = np.concatenate(groups), np.concatenate(keys)
+        query_ids, ids = [], []
+        for sorted_keys, sorted_ids in ((self._keys, self._key_ids), (self._pending_keys, self._pending_ids)):
+            cell_group, positions = _ranges(np.searchsorted(sorted_keys, keys, side="left"),
+                                            np.searchsorted(sorted_keys, keys, side="right"))
+            query_ids.append(overlapping[group[cell_group]]), ids.append(sorted_ids[positions])
+
+        query_ids, ids = np.concatenate(query_ids), np.concatenate(ids)
+        alive = self._alive[ids]
+        return query_ids[alive], ids[alive]
+
+    def _radius_pairs(self, queries, squared_radius):
+        radius = np.sqrt(squared_radius)[:, None]
+        query_ids, ids = self._candidates(queries - radius, queries + radius)
+        squared = _squared_distances(self._points[ids], queries[query_ids])
+        found = squared <= squared_radius[query_ids]
+        return query_ids[found], ids[found], squared[found]
+
+    def _box_pairs(self, lower, upper):
+        query_ids, ids = self._candidates(lower, upper)
+        points = self._points[ids]
+        found = (points >= lower[query_ids]).all(axis=1) & (points <= upper[query_ids]).all(axis=1)
+        return query_ids[found], ids[found]
+
+    def _nearest(self, queries, k):
+        """
+        Search a radius of one cell around each query, doubling it for the queries that have not yet found k points up
+        to a radius that covers every occupied cell
+        """
+        ids, distances = np.empty((len(queries), k), dtype=np.int64), np.empty((len(queries), k))
+        radius = np.full(len(queries), self.cell_size)
+
+        # The distance to the furthest corner of the occupied cells, plus a cell so rounding cannot miss a point
+        furthest = np.maximum(np.abs(queries - self._lower_cell * self.cell_size),
+                              np.abs(queries - (self._upper_cell + 1) * self.cell_size))
+        limit = np.sqrt(np.einsum("ij,ij->i", furthest, furthest)) + self.cell_size
+        active = np.arange(len(queries))
+
+        while len(active) > 0:
+            query_ids, found_ids, squared = self._radius_pairs(queries[active], radius[active] ** 2)
+            done = np.bincount(query_ids, minlength=len(active)) >= k
+
+            pairs = done[query_ids]
+            renumber = np.cumsum(done) - 1
+            ids[active[done]], distances[active[done]] = _top_k(renumber[query_ids[pairs]], found_ids[pairs],
+                                                                squared[pairs], done.sum(), k)
+
+            active = active[~done]
+            radius[active] = np.minimum(radius[active] * 2, limit[active])
+        return ids, distances
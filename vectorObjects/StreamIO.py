@@ -0,0 +1,229 @@
+from vectorObjects.VectorArrays import Vector2DArray, Vector3DArray, Vector4DArray, as_points
+import numpy as np
+import warnings
+
+
+# The batch type each obj record is read into, and the number of values of each record that are kept
+OBJ_RECORDS = {
+    b"v": (Vector3DArray, 3),
+    b"vn": (Vector3DArray, 3),
+    b"vt": (Vector2DArray, 2),
+}
+
+# The batch type used for delimited point files of each width
+POINT_BATCHES = {
+    2: Vector2DArray,
+    3: Vector3DArray,
+    4: Vector4DArray,
+}
+
+
+def _parse_values(text, source):
+    """
+    Parse whitespace separated numbers into a flat array with np.fromstring, which parses the whole block in C
+    """
+    with warnings.catch_warnings():
+        # Older versions of numpy warn and stop at a malformed value rather than raising
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning) as error:
+            raise ValueError(f"Found a value that is not a number in a block of {source}: {error}") from None
+
+
+def _parse_block(text, rows, width, source):
+    """
+    Parse a block of rows of whitespace separated numbers into an (rows, width) array in a single numpy call
+
+    :raises ValueError: If the block does not hold exactly rows * width values, or a value is not a number
+    """
+    values = _parse_values(text, source)
+    if values.size != rows * width:
+        raise ValueError(f"Found {values.size} values in a block of {rows} rows of {source}, but expected "
+                         f"{rows * width} values of {width} per row")
+    return values.reshape(rows, width)
+
+
+def _parse_obj_lines(lines, width, source):
+    """
+    Parse the values of obj records that have already had their prefix removed. Records with more values than width,
+    such as vertex colours or a w for v, only keep their first width values.
+    """
+    values = _parse_values(b"\n".join(lines), source)
+    if values.size == len(lines) * width:
+        return values.reshape(-1, width)
+
+    # Records usually all have the same number of values, such as x y z r g b, so the block is sliced to width
+    row_width = len(lines[0].split())
+    if row_width > width and values.size == len(lines) * row_width and len(lines[-1].split()) == row_width:
+        return values.reshape(-1, row_width)[:, :width]
+
+    # Otherwise the records have a mix of widths, so each line is cut to width before parsing the block again
+    return _parse_block(b" ".join(b" ".join(line.split()[:width]) for line in lines), len(lines), width, source)
+
+
+def read_obj(path, records=("v", "vn", "vt"), chunk_bytes=1 << 23):
+    """
+    Stream the vertex records of an obj file, reading chunk_bytes at a time so memory is bound by the chunk size rather
+    than the size of the file.
+
+    :param path: The path to the obj file
+    :type path: str
+
+    :param records: Which records to read, from v and vn which are read as Vector3DArray, and vt which is read as
+        Vector2DArray
+    :type records: tuple[str]
+
+    :param chunk_bytes: The approximate number of bytes to read per chunk
+    :type chunk_bytes: int
+
+    :return: A generator of (record, batch) for each record type found in each chunk
+    :rtype: generator
+    """
+    prefixes = {record.encode("ascii") + b" ": record.encode("ascii") for record in records}
+    for record in prefixes.values():
+        if record not in OBJ_RECORDS:
+            raise ValueError(f"Unknown obj record {record.decode()}: expected one of v, vn or vt")
+
+    with open(path, "rb") as file:
+        while True:
+            lines = file.readlines(chunk_bytes)
+            if not lines:
+                break
+
+            found = {record: [] for record in prefixes.values()}
+            for line in lines:
+                record = prefixes.get(line[:3]) or prefixes.get(line[:2])
+                if record is not None:
+                    found[record].append(line[len(record) + 1:].strip())
+
+            for record, record_lines in found.items():
+                if record_lines:
+                    batch_type, width = OBJ_RECORDS[record]
+                    yield record.decode(), batch_type(_parse_obj_lines(record_lines, width, path))
+
+
+def read_points(path, width=3, delimiter=",", skip_header=0, chunk_bytes=1 << 23):
+    """
+    Stream a delimited point file, such as a csv of x, y, z rows, as batches of chunk_bytes at a time
+
+    :param path: The path to the file
+    :type path: str
+
+    :param width: The number of values on each row, which sets the batch type as Vector2DArray, Vector3DArray or
+        Vector4DArray
+    :type width: int
+
+    :param delimiter: The delimiter between values, or None for whitespace
+    :type delimiter: str | None
+
+    :param skip_header: The number of lines to skip at the start of the file
+    :type skip_header: int
+
+    :param chunk_bytes: The approximate number of bytes to read per chunk
+    :type chunk_bytes: int
+
+    :return: A generator of batches
+    :rtype: generator
+    """
+    if width not in POINT_BATCHES:
+        raise ValueError(f"Point files can have a width of 2, 3 or 4 but found {width}")
+
+    separator = None if delimiter is None else delimiter.encode("ascii")
+    with open(path, "rb") as file:
+        for _ in range(skip_header):
+            file.readline()
+
+        while True:
+            lines = file.readlines(chunk_bytes)
+            if not lines:
+                break
+
+            text = b"".join(lines)
+            if separator is not None:
+                text = text.replace(separator, b" ")
+
+            rows = sum(1 for line in lines if not line.isspace())
+            points = _parse_block(text, rows, width, path)
+            if len(points) > 0:
+                yield POINT_BATCHES[width](points)
+
+
+def _format_rows(rows, prefix, separator, precision):
+    """
+    Format every row of a chunk into a single string with one format operation
+    """
+    rows = as_points(rows)
+    line = prefix + separator.join([f"%.{precision}g"] * rows.shape[1]) + "\n"
+    return (line * len(rows)) % tuple(rows.ravel().tolist())
+
+
+class ObjWriter:
+    """
+    Write v, vn and vt records to an obj file a batch at a time, so the whole mesh never needs to be in memory
+    """
+    __slots__ = ["file", "precision"]
+
+    def __init__(self, path, precision=17):
+        """
+        :param path: The path to write to, which is overwritten
+        :type path: str
+
+        :param precision: The number of significant digits written for each value
+        :type precision: int
+        """
+        self.file = open(path, "w")
+        self.precision = precision
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, record, batch):
+        """
+        Write a batch of vectors as one record type
+
+        :param record: v, vn or vt
+        :type record: str
+
+        :param batch: An (N, k) array, a batch from vectorObjects.VectorArrays, or a list of vectors
+        """
+        if record.encode("ascii") not in OBJ_RECORDS:
+            raise ValueError(f"Unknown obj record {record}: expected one of v, vn or vt")
+        self.file.write(_format_rows(batch, f"{record} ", " ", self.precision))
+
+    def write_line(self, line):
+        """
+        Write any other line, such as a comment or face
+        """
+        self.file.write(line.rstrip("\n") + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def write_points(path, batches, delimiter=",", header=None, precision=17):
+    """
+    Write batches of points to a delimited file, one batch at a time
+
+    :param path: The path to write to, which is overwritten
+    :type path: str
+
+    :param batches: An iterable of (N, k) arrays, batches from vectorObjects.VectorArrays, or lists of vectors
+    :type batches: iterable
+
+    :param delimiter: The delimiter between values
+    :type delimiter: str
+
+    :param header: An optional first line, such as x,y,z
+    :type header: str | None
+
+    :param precision: The number of significant digits written for each value
+    :type precision: int
+    """
+    with open(path, "w") as file:
+        if header is not None:
+            file.write(header.rstrip("\n") + "\n")
+        [file.write(_format_rows(batch, "", delimiter, precision)) for batch in batches]
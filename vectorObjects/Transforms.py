@@ -0,0 +1,275 @@
+from vectorObjects.DefinedVectors import Vector3D, Vector4D
+from vectorObjects.VectorArrays import VectorArrayMaster, as_points, stack, unstack, _cast
+from vectorObjects.Precision import resolve
+import numpy as np
+
+
+def _rotation_matrix(x, y, z, w):
+    """
+    The 3x3 rotation of a quaternion at float64, in the same layout as PymeshioQuaternion.getMatrix
+    """
+    return np.array([
+        [1 - 2 * y * y - 2 * z * z, 2 * x * y + 2 * w * z, 2 * x * z - 2 * w * y],
+        [2 * x * y - 2 * w * z, 1 - 2 * x * x - 2 * z * z, 2 * y * z + 2 * w * x],
+        [2 * x * z + 2 * w * y, 2 * y * z - 2 * w * x, 1 - 2 * x * x - 2 * y * y]])
+
+
+def _components(value, width, name):
+    """
+    A tuple of width floats from a vector, list/tuple or a single number repeated width times
+    """
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return (float(value), ) * width
+
+    values = tuple(float(v) for v in value)
+    if len(values) != width:
+        raise ValueError(f"{name} expects {width} values but found {len(values)}")
+    return values
+
+
+def _read_only(matrix):
+    matrix = np.array(matrix, dtype=np.float64)
+    matrix.setflags(write=False)
+    return matrix
+
+
+class Transform:
+    """
+    An affine transform held as a single 4x4 matrix, built from a scale, then a quaternion rotation, then a translation.
+
+    Matrices follow the same row vector convention as PymeshioQuaternion.getMatrix, so a point p is transformed as
+    [x, y, z, 1] @ matrix with the translation in the last row, and a @ b applies a then b. Transforms are immutable, so
+    the inverse, the matrix for normals, and the last composition are calculated once and cached.
+    """
+    __slots__ = ["matrix", "_rows", "_inverse", "_normal_matrix", "_composed"]
+
+    def __init__(self, matrix=None):
+        """
+        :param matrix: A 4x4 matrix in the row vector convention, or None for the identity
+        :type matrix: np.ndarray | list | None
+        """
+        matrix = np.identity(4) if matrix is None else np.asarray(matrix, dtype=np.float64)
+        if matrix.shape != (4, 4):
+            raise ValueError(f"A Transform requires a 4x4 matrix but found {matrix.shape}")
+
+        self.matrix = _read_only(matrix)
+        self._rows = None
+        self._inverse = None
+        self._normal_matrix = None
+        self._composed = None
+
+    @classmethod
+    def from_components(cls, translation=(0.0, 0.0, 0.0), rotation=None, scale=1.0):
+        """
+        Compose a scale, then a rotation, then a translation into one matrix
+
+        :param translation: The translation as a Vector3D or x, y, z
+        :type translation: Vector3D | tuple | list
+
+        :param rotation: The rotation as a PymeshioQuaternion or x, y, z, w, or None for no rotation
+        :type rotation: PymeshioQuaternion | tuple | list | None
+
+        :param scale: A single scale for every axis, or a scale per axis as a Vector3D or x, y, z
+        :type scale: float | Vector3D | tuple | list
+
+        :rtype: Transform
+        """
+        matrix = np.identity(4)
+        matrix[:3, :3] = np.diag(_components(scale, 3, "scale"))
+        if rotation is not None:
+            matrix[:3, :3] = matrix[:3, :3] @ _rotation_matrix(*_components(rotation, 4, "rotation"))
+        matrix[3, :3] = _components(translation, 3, "translation")
+        return cls(matrix)
+
+    @classmethod
+    def translation(cls, translation):
+        return cls.from_components(translation=translation)
+
+    @classmethod
+    def rotation(cls, rotation):
+        return cls.from_components(rotation=rotation)
+
+    @classmethod
+    def scaling(cls, scale):
+        return cls.from_components(scale=scale)
+
+    def __repr__(self):
+        return f"Transform({self.matrix.tolist()})"
+
+    def compose(self, other):
+        """
+        The transform that applies this transform and then other, as one matrix. The result of the last composition is
+        cached, so composing the same pair of transforms every frame only multiplies the matrices once.
+
+        :type other: Transform
+        :rtype: Transform
+        """
+        if not isinstance(other, Transform):
+            raise TypeError(f"Transforms can only be composed with another Transform but found {type(other)}")
+
+        composed = self._composed
+        if composed is not None and composed[0] is other:
+            return composed[1]
+
+        result = Transform(self.matrix @ other.matrix)
+        self._composed = (other, result)
+        return result
+
+    def __matmul__(self, other):
+        return self.compose(other)
+
+    def inverse(self):
+        """
+        The transform that undoes this one, calculated once and cached
+
+        :rtype: Transform
+        """
+        if self._inverse is None:
+            matrix = self.matrix
+            if np.array_equal(matrix[:, 3], (0.0, 0.0, 0.0, 1.0)):
+                # An affine matrix only needs the inverse of its 3x3 part
+                linear = np.linalg.inv(matrix[:3, :3])
+                inverse = np.identity(4)
+                inverse[:3, :3] = linear
+                inverse[3, :3] = -matrix[3, :3] @ linear
+            else:
+                inverse = np.linalg.inv(matrix)
+
+            self._inverse = Transform(inverse)
+            self._inverse._inverse = self
+        return self._inverse
+
+    def normal_matrix(self):
+        """
+        The 3x3 matrix that transforms normals, being the inverse transpose of the 3x3 part of the matrix, so normals
+        stay perpendicular to surfaces under non uniform scales
+
+        :rtype: np.ndarray
+        """
+        if self._normal_matrix is None:
+            self._normal_matrix = _read_only(np.linalg.inv(self.matrix[:3, :3]).T)
+        return self._normal_matrix
+
+    def _matrix_rows(self):
+        """
+        The matrix as nested lists of floats, so single vectors are transformed without numpy
+        """
+        if self._rows is None:
+            self._rows = self.matrix.tolist()
+        return self._rows
+
+    def _apply_vector(self, vector, kind, out, policy):
+        if isinstance(vector, Vector4D):
+            if kind == "normal":
+                raise ValueError("Normals can only be transformed as three dimensional vectors")
+            (a, b, c, d), (e, f, g, h), (i, j, k, m), (n, o, p, q) = self._matrix_rows()
+            x, y, z, w = vector.x, vector.y, vector.z, vector.w
+            values = (x * a + y * e + z * i + w * n, x * b + y * f + z * j + w * o,
+                      x * c + y * g + z * k + w * p, x * d + y * h + z * m + w * q)
+        else:
+            if kind == "normal":
+                (a, b, c), (e, f, g), (i, j, k) = self.normal_matrix().tolist()
+                n = o = p = 0.0
+            else:
+                (a, b, c, _), (e, f, g, _), (i, j, k, _), (n, o, p, _) = self._matrix_rows()
+                if kind == "direction":
+                    n = o = p = 0.0
+            x, y, z = vector.x, vector.y, vector.z
+            values = (x * a + y * e + z * i + n, x * b + y * f + z * j + o, x * c + y * g + z * k + p)
+
+        if policy.digits is not None:
+            digits = policy.digits
+            values = [round(value, digits) for value in values]
+        elif policy.single:
+            values = [policy.apply(value) for value in values]
+
+        if out is None:
+            out = object.__new__(type(vector))
+        elif type(out) is not type(vector):
+            raise TypeError(f"Expected an output of type {type(vector).__name__} but found {type(out).__name__}")
+
+        if len(values) == 3:
+            out.x, out.y, out.z = values
+        else:
+            out.x, out.y, out.z, out.w = values
+        return out
+
+    def _apply_rows(self, rows, kind, out, policy):
+        width = rows.shape[1]
+        if width == 4:
+            if kind == "normal":
+                raise ValueError("Normals can only be transformed as three dimensional vectors")
+            np.matmul(rows, self.matrix, out=out)
+        elif width == 3:
+            np.matmul(rows, self.normal_matrix() if kind == "normal" else self.matrix[:3, :3], out=out)
+            if kind == "point":
+                out += self.matrix[3, :3]
+        else:
+            raise ValueError(f"Transforms apply to vectors of width 3 or 4 but found {width}")
+
+        policy.apply_array(out)
+        return out
+
+    def _apply(self, values, kind, out, rounding):
+        policy = resolve(rounding)
+        if isinstance(values, (Vector3D, Vector4D)):
+            return self._apply_vector(values, kind, out, policy)
+
+        if isinstance(values, VectorArrayMaster):
+            rows = as_points(values)
+            target = out.data if isinstance(out, VectorArrayMaster) and out.dtype == np.float64 else out
+        elif isinstance(values, np.ndarray):
+            rows, target = np.asarray(values, dtype=np.float64), out
+        else:
+            rows, target = stack(values), None
+
+        if target is None or isinstance(target, VectorArrayMaster):
+            result = self._apply_rows(rows, kind, np.empty(rows.shape, dtype=np.float64), policy)
+        else:
+            if target.shape != rows.shape or target.dtype != np.float64:
+                raise ValueError(f"Output buffer must be a float64 array of shape {rows.shape} but found "
+                                 f"{target.dtype} {target.shape}")
+            result = self._apply_rows(rows, kind, target, policy)
+
+        if isinstance(out, VectorArrayMaster):
+            if result is not out.data:
+                out.data[:] = _cast(result, out.dtype)
+            return out
+        elif isinstance(values, VectorArrayMaster):
+            return type(values)(result, dtype=values.dtype)
+        elif isinstance(values, np.ndarray):
+            return result
+        return unstack(result, type(values[0]))
+
+    def apply(self, points, out=None, rounding=None):
+        """
+        Transform points, including the translation. Four dimensional vectors are homogeneous, so they are multiplied
+        by the whole matrix including their own w.
+
+        :param points: A Vector3D or Vector4D, an (N, 3) or (N, 4) array, a Vector3DArray or Vector4DArray, or a list of
+            Vector3D or Vector4D
+        :type points: Vector3D | Vector4D | np.ndarray | VectorArrayMaster | list
+
+        :param out: An optional output to write into, being a vector of the same type for a single vector, or a float64
+            array or batch of the same shape, which may be points itself
+        :type out: Vector3D | Vector4D | np.ndarray | VectorArrayMaster | None
+
+        :param rounding: The precision policy, see vectorObjects.Precision. None uses the current policy
+
+        :return: The transformed points, in the same form as points
+        """
+        return self._apply(points, "point", out, rounding)
+
+    def apply_directions(self, directions, out=None, rounding=None):
+        """
+        Transform directions, which are scaled and rotated but not translated. Arguments are as apply.
+        """
+        return self._apply(directions, "direction", out, rounding)
+
+    def apply_normals(self, normals, out=None, rounding=None):
+        """
+        Transform three dimensional surface normals by the inverse transpose of the matrix, so they stay perpendicular
+        to the transformed surface under non uniform scales. Normals are not normalised again, see normalise. Arguments
+        are as apply.
+        """
+        return self._apply(normals, "normal", out, rounding)
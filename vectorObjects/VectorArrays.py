@@ -0,0 +1,770 @@
+from vectorObjects.DefinedVectors import Vector2D, Vector3D, Vector4D, VectorRGB, PymeshioQuaternion
+from vectorObjects.VectorMaster import VectorMaster
+from vectorObjects.Precision import resolve
+from operator import attrgetter
+import numpy as np
+import sys
+
+
+def _cast(values, dtype):
+    """
+    Convert values to dtype, rounding and clamping to the range of integer dtypes rather than letting them wrap around,
+    as RGBImage does for uint8
+    """
+    if values.dtype == dtype:
+        return np.ascontiguousarray(values)
+    if np.issubdtype(dtype, np.integer):
+        limits = np.iinfo(dtype)
+        return np.clip(np.rint(values), limits.min, limits.max).astype(dtype)
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def result_dtype(dtype, other, operation=None):
+    """
+    The dtype of the result of an operation between a batch of dtype and other.
+
+    Two batches promote to the smallest dtype that holds both, such as float32 with int16 giving float32. Python
+    numbers, single vectors and lists/tuples keep the dtype of the batch, so a float32 batch stays float32, unless the
+    batch is an integer dtype and other has values that are not whole numbers. Division of integers, and any other
+    result that cannot be a whole number, is float64.
+
+    :param dtype: The dtype of the batch
+    :type dtype: np.dtype
+
+    :param other: The other operand, ether a numpy array from a batch or the values of a constant
+    :type other: np.ndarray | float | int
+
+    :param operation: The numpy ufunc of the operation
+    :type operation: np.ufunc | None
+
+    :rtype: np.dtype
+    """
+    if isinstance(other, np.ndarray) and other.ndim == 2:
+        dtype = np.promote_types(dtype, other.dtype)
+    elif np.issubdtype(dtype, np.integer) and not np.all(np.mod(other, 1) == 0):
+        dtype = np.dtype(np.float64)
+
+    if operation is np.true_divide and np.issubdtype(dtype, np.integer):
+        return np.dtype(np.float64)
+    return dtype
+
+
+class VectorArrayMaster:
+    """
+    Core logic for batches of vectors, held as a single contiguous (N, k) numpy array rather than N individual
+    vector objects. Operations follow the same rules as VectorMaster, but are applied to every row in one numpy call.
+
+    Batches are float64 by default, or any dtype of dtypes for more compact storage. Operations between dtypes follow
+    result_dtype, and integer results are rounded and clamped to the range of their dtype rather than wrapping around.
+    The precision policy is only applied to float results.
+    """
+    __slots__ = ["data"]
+
+    # The single vector class each row of the batch represents, set by each defined array
+    vector_type = None
+
+    # The dtypes a batch can be held as
+    dtypes = (np.float64, np.float32, np.int16)
+
+    # The number of rows processed at once by operations that work through the batch in blocks
+    _block_size = 65536
+
+    def __init__(self, data=None, dtype=np.float64):
+        """
+        Data can be an (N, k) array-like, a list of the vector_type objects, or None for an empty batch. An array that
+        is already contiguous and of dtype is used without copying it.
+
+        :param dtype: The dtype of the batch, one of dtypes
+        :type dtype: np.dtype | type | str
+        """
+        dtype = self._check_dtype(dtype)
+        if data is None:
+            self.data = np.zeros((0, self.width()), dtype=dtype)
+        elif isinstance(data, np.ndarray):
+            self.data = self._validate(_cast(data, dtype))
+        elif len(data) > 0 and isinstance(data[0], self.vector_type):
+            self.data = _cast(self._from_vectors(data), dtype)
+        else:
+            self.data = self._validate(_cast(np.array(data, dtype=np.float64), dtype))
+
+    @classmethod
+    def _check_dtype(cls, dtype):
+        dtype = np.dtype(dtype)
+        if dtype not in cls.dtypes:
+            raise TypeError(f"{cls.__name__} can be held as {', '.join(np.dtype(d).name for d in cls.dtypes)} but "
+                            f"found {dtype}")
+        return dtype
+
+    @classmethod
+    def width(cls):
+        """
+        The number of attributes of each vector in the batch
+        """
+        return len(cls.vector_type.__slots__)
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """
+        Construct a batch from a list of vector_type objects
+
+        :param vectors: A list of vectors of the same type as this batches vector_type
+        :type vectors: list
+
+        :rtype: VectorArrayMaster
+        """
+        return cls(cls._from_vectors(vectors))
+
+    @classmethod
+    def _from_vectors(cls, vectors):
+        """
+        Read the attributes of each vector into a single (N, k) array, see stack
+        """
+        return stack(vectors, cls.vector_type)
+
+    def _validate(self, data):
+        """
+        Ensure data is two dimensional with the same number of columns as attributes of the vector_type
+        """
+        if data.ndim == 1 and data.size == 0:
+            data = data.reshape(0, self.width())
+
+        if data.ndim != 2 or data.shape[1] != self.width():
+            raise ValueError(f"{type(self).__name__} expects data of shape (N, {self.width()}) but found "
+                             f"{data.shape}")
+        return data
+
+    def _new(self, data):
+        """
+        Create a new instance of this class around already validated data without copying it
+        """
+        instance = type(self).__new__(type(self))
+        instance.data = data
+        return instance
+
+    def __repr__(self):
+        """
+        Return for debugging
+        """
+        return f"{type(self).__name__}({self.data.tolist()})"
+
+    def __str__(self):
+        """
+        Print return for code readability
+        """
+        dtype = "" if self.data.dtype == np.float64 else f"{self.data.dtype} "
+        return f"{type(self).__name__} of {len(self)} {dtype}vectors:\n{self.data}"
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, item):
+        """
+        An integer index will return the vector_type at that position, whilst a slice or index array will return a
+        batch of the same type
+        """
+        if isinstance(item, (int, np.integer)):
+            return self.vector_type(*self.data[item].tolist())
+        else:
+            return self._new(np.atleast_2d(self.data[item]))
+
+    def __setitem__(self, key, value):
+        """
+        Set a row or rows from a vector, another batch of this type, or anything numpy can broadcast
+        """
+        if isinstance(value, (self.vector_type, type(self))):
+            value = self._operand(value)
+        self.data[key] = value
+
+    def __iter__(self):
+        """
+        Yields each row as a vector_type, creating the vectors of a block of rows at a time
+        """
+        for start in range(0, len(self), self._block_size):
+            yield from unstack(self.data[start:start + self._block_size], self.vector_type)
+
+    def __add__(self, other):
+        """
+        Add ether another batch of the same type, a single vector_type, an int/float as a constant to all
+        attributes, or a list/tuple of values of equal length to the number of attributes, returning a new batch
+
+        :rtype: VectorArrayMaster
+        """
+        return self._mathematical_operator(self, other, np.add)
+
+    def __iadd__(self, other):
+        """
+        Add as __add__, but updating this batch in place
+        """
+        return self._mathematical_operator(self, other, np.add, in_place=True)
+
+    def __sub__(self, other):
+        """
+        Subtract ether another batch of the same type, a single vector_type, an int/float as a constant to all
+        attributes, or a list/tuple of values of equal length to the number of attributes, returning a new batch
+
+        :rtype: VectorArrayMaster
+        """
+        return self._mathematical_operator(self, other, np.subtract)
+
+    def __isub__(self, other):
+        """
+        Subtract as __sub__, but updating this batch in place
+        """
+        return self._mathematical_operator(self, other, np.subtract, in_place=True)
+
+    def __mul__(self, other):
+        """
+        Multiply ether another batch of the same type, a single vector_type, an int/float as a constant to all
+        attributes, or a list/tuple of values of equal length to the number of attributes, returning a new batch
+
+        :rtype: VectorArrayMaster
+        """
+        return self._mathematical_operator(self, other, np.multiply)
+
+    def __imul__(self, other):
+        """
+        Multiply as __mul__, but updating this batch in place
+        """
+        return self._mathematical_operator(self, other, np.multiply, in_place=True)
+
+    def __truediv__(self, other):
+        """
+        Divide ether another batch of the same type, a single vector_type, an int/float as a constant to all
+        attributes, or a list/tuple of values of equal length to the number of attributes, returning a new batch
+
+        :rtype: VectorArrayMaster
+        """
+        return self._mathematical_operator(self, other, np.true_divide)
+
+    def __itruediv__(self, other):
+        """
+        Divide as __truediv__, but updating this batch in place
+        """
+        return self._mathematical_operator(self, other, np.true_divide, in_place=True)
+
+    def __neg__(self):
+        """
+        Return a new batch with the sign of all elements inverted
+        """
+        if np.issubdtype(self.data.dtype, np.integer):
+            return self._new(_cast(np.negative(self.data, dtype=np.float64), self.data.dtype))
+        return self._new(np.negative(self.data))
+
+    def __eq__(self, other):
+        """
+        See if two batches are equal, leaving any other type of object to decide for itself
+        """
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self.data.shape == other.data.shape and bool((self.data == other.data).all())
+
+    def __ne__(self, other):
+        """
+        Opposite of equality
+        """
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def _operand(self, other):
+        """
+        Convert other into something that broadcasts against the (N, k) data following the rules of
+        VectorMaster._mathematical_operator: a batch of the same type row by row, a single vector or a list/tuple of
+        equal length to the number of attributes for every row, or a constant for every attribute.
+        """
+        if isinstance(other, type(self)):
+            if len(other) != len(self):
+                raise ValueError(f"Batches must be of the same length but found {len(self)} and {len(other)}")
+            return other.data
+
+        elif isinstance(other, self.vector_type):
+            return np.fromiter(other, dtype=np.float64, count=self.width())
+
+        elif isinstance(other, (int, float, np.integer, np.floating)):
+            return other
+
+        elif isinstance(other, (list, tuple)):
+            if len(other) == self.width():
+                return np.array(other, dtype=np.float64)
+            else:
+                raise ValueError("A list/tuple must be of the same length as the number of attributes of the vector\n"
+                                 f"Length of input: {len(other)}\n"
+                                 f"Length of attributes: {self.width()}")
+
+        else:
+            raise TypeError(f"{type(self).__name__} cannot operate with type {type(other)}")
+
+    @staticmethod
+    def _mathematical_operator(current_inst, other_inst, operation, rounding=None, in_place=False):
+        """
+        Apply an operation to the data of the current batch with other instance, either a batch of the same class, a
+        single vector of the batches vector_type, a constant, or a list/tuple of the same length of the attributes of
+        the vector_type. The result is of the dtype given by result_dtype, whilst in place the dtype of the current
+        batch is kept.
+
+        :param current_inst: The current batch instance
+        :param other_inst: The other operand
+        :param operation: The numpy ufunc you wish to perform
+        :param rounding: The precision policy for this call, see vectorObjects.Precision. None uses the current policy
+        :param in_place: If True the current batch is updated and returned, otherwise a new batch is returned
+        :return: The result, or NotImplemented if other_inst is none of the above so python and numpy can try the
+            reflected operation
+        :rtype: VectorArrayMaster
+        """
+        data = current_inst.data
+        try:
+            operand = current_inst._operand(other_inst)
+        except TypeError:
+            return NotImplemented
+        dtype = data.dtype if in_place else result_dtype(data.dtype, operand, operation)
+
+        if np.issubdtype(dtype, np.integer):
+            # Calculate at float64 so the result can be rounded and clamped rather than wrapping around
+            values = _cast(operation(data.astype(np.float64), operand), dtype)
+        else:
+            # Constants are converted to the dtype of the result so they do not promote a float32 batch to float64
+            if not (isinstance(operand, np.ndarray) and operand.ndim == 2):
+                operand = np.asarray(operand, dtype=dtype)
+            values = operation(data, operand, out=data) if in_place else operation(data, operand, dtype=dtype)
+
+        if in_place:
+            if values is not data:
+                data[:] = values
+            result = current_inst
+        else:
+            result = current_inst._new(values)
+
+        if not np.issubdtype(dtype, np.integer):
+            resolve(rounding).apply_array(result.data)
+        return result
+
+    def add_scaled(self, other, scale, rounding=None):
+        """
+        Add other multiplied by scale to this batch in place, as self += other * scale without creating a temporary
+        batch for other * scale. Other follows the same rules as the arithmetic operators.
+
+        :rtype: VectorArrayMaster
+        """
+        operand = self._operand(other)
+        if np.issubdtype(self.data.dtype, np.integer):
+            self.data[:] = _cast(self.data + np.asarray(operand) * scale, self.data.dtype)
+            return self
+
+        if isinstance(operand, np.ndarray) and operand.ndim == 2:
+            # Accumulate row by row blocks so the scaled temporary stays small for very large batches
+            for start in range(0, len(self), self._block_size):
+                stop = start + self._block_size
+                self.data[start:stop] += operand[start:stop] * scale
+        else:
+            self.data += operand * scale
+
+        resolve(rounding).apply_array(self.data)
+        return self
+
+    def to_array(self):
+        """
+        Returns the underlying (N, k) array
+        """
+        return self.data
+
+    def to_vectors(self):
+        """
+        Returns a list of vector_type objects
+        """
+        return unstack(self.data, self.vector_type)
+
+    def copy(self):
+        """
+        Returns a copy of this batch that does not share memory with it
+        """
+        return self._new(self.data.copy())
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def _float_data(self):
+        """
+        The data as floats, converting integer dtypes to float64 so products do not overflow
+        """
+        return self.data.astype(np.float64) if np.issubdtype(self.data.dtype, np.integer) else self.data
+
+    def astype(self, dtype):
+        """
+        Returns a copy of this batch as another of dtypes, rounding and clamping for integer dtypes
+
+        :rtype: VectorArrayMaster
+        """
+        return self._new(_cast(self.data, self._check_dtype(dtype)).copy())
+
+    def nbytes(self):
+        """
+        The number of bytes of the array of vectors, without the batch object itself
+        """
+        return self.data.nbytes
+
+    def memory_report(self):
+        """
+        The memory of this batch against holding the same vectors as a list of vector_type objects
+
+        :return: A dict of the count, dtype, bytes of the batch and bytes per vector, along with the bytes per vector of
+            a list of vector_type objects of the same values
+        :rtype: dict
+        """
+        count = len(self)
+        total = memory_usage(self)
+        objects = memory_usage(self.to_vectors()) if count else 0
+        return {
+            "count": count,
+            "dtype": self.data.dtype.name,
+            "bytes": total,
+            "bytes_per_vector": total / count if count else 0.0,
+            "vector_objects_bytes_per_vector": objects / count if count else 0.0,
+        }
+
+    def dot_product(self, other):
+        """
+        Calculate the dot product of each row with the matching row of another batch of the same type, or of every row
+        against a single vector_type
+
+        :rtype: np.ndarray
+        """
+        if isinstance(other, type(self)):
+            return np.einsum("ij,ij->i", self._float_data(), other._float_data())
+        elif isinstance(other, self.vector_type):
+            return self._float_data() @ self._operand(other)
+        else:
+            raise TypeError(f"Dot product expects a {type(self).__name__} or {self.vector_type.__name__} but found: "
+                            f"{type(other)}")
+
+    def cross_product(self, other, rounding=None):
+        """
+        Calculate the cross product of each row with the matching row of another batch of the same type, or of every
+        row against a single vector_type, and update this batch as the result
+        """
+        if not isinstance(other, (type(self), self.vector_type)):
+            raise TypeError(f"Cross product expects a {type(self).__name__} or {self.vector_type.__name__} but "
+                            f"found: {type(other)}")
+
+        if np.issubdtype(self.data.dtype, np.integer):
+            self.data[:] = _cast(np.cross(self._float_data(), self._operand(other)), self.data.dtype)
+            return self
+
+        self.data[:] = np.cross(self.data, self._operand(other))
+        resolve(rounding).apply_array(self.data)
+        return self
+
+    def lengths(self):
+        """
+        Returns the euclidean length of each row
+        """
+        data = self._float_data()
+        return np.sqrt(np.einsum("ij,ij->i", data, data))
+
+    def normalise(self, rounding=None):
+        """
+        Normalise the attributes of every row. Like VectorMaster, only a float32 precision policy is applied
+        """
+        if np.issubdtype(self.data.dtype, np.integer):
+            raise TypeError(f"Unable to normalise a batch of {self.data.dtype} in place, see astype")
+
+        lengths = self.lengths()
+        if not lengths.all():
+            raise ZeroDivisionError(f"Unable to normalise {np.count_nonzero(lengths == 0)} zero length vectors")
+
+        np.divide(self.data, lengths[:, None], out=self.data)
+
+        policy = resolve(rounding)
+        if policy.single:
+            policy.apply_array(self.data)
+        return self
+
+
+class Vector2DArray(VectorArrayMaster):
+    """
+    A batch of Vector2D held as an (N, 2) array
+    """
+    __slots__ = []
+    vector_type = Vector2D
+
+
+class Vector3DArray(VectorArrayMaster):
+    """
+    A batch of Vector3D held as an (N, 3) array
+    """
+    __slots__ = []
+    vector_type = Vector3D
+
+    def cross_product(self, other, rounding=None):
+        """
+        Calculate the cross product of each row with the matching row of another batch, or of every row against a
+        single Vector3D, and update this batch as the result.
+
+        Written out by component as it avoids the temporaries np.cross creates
+        """
+        if not isinstance(other, (Vector3DArray, Vector3D)):
+            raise TypeError(f"Cross product expects a Vector3DArray or Vector3D but found: {type(other)}")
+
+        b = self._operand(other)
+        integer = np.issubdtype(self.data.dtype, np.integer)
+        a = self._float_data()
+        ax, ay, az = a[:, 0].copy(), a[:, 1].copy(), a[:, 2].copy()
+        bx, by, bz = b[..., 0], b[..., 1], b[..., 2]
+
+        if integer:
+            self.data[:] = _cast(np.column_stack((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx)),
+                                 self.data.dtype)
+            return self
+
+        self.data[:, 0] = ay * bz - az * by
+        self.data[:, 1] = az * bx - ax * bz
+        self.data[:, 2] = ax * by - ay * bx
+        resolve(rounding).apply_array(self.data)
+        return self
+
+
+class Vector4DArray(VectorArrayMaster):
+    """
+    A batch of Vector4D held as an (N, 4) array
+    """
+    __slots__ = []
+    vector_type = Vector4D
+
+
+class VectorRGBArray(VectorArrayMaster):
+    """
+    A batch of VectorRGB held as an (N, 3) array, which can also be held as uint8 for 8 bit colour
+    """
+    __slots__ = []
+    vector_type = VectorRGB
+    dtypes = VectorArrayMaster.dtypes + (np.uint8, )
+
+
+class QuaternionArray(VectorArrayMaster):
+    """
+    A batch of PymeshioQuaternion held as an (N, 4) array in the order x, y, z, w.
+
+    Matrices are returned as float32, the same as PymeshioQuaternion, as a single (N, 4, 4) stack.
+    """
+    __slots__ = []
+    vector_type = PymeshioQuaternion
+
+    def __mul__(self, other):
+        """
+        The Hamilton product of each row with the matching row of another QuaternionArray, or of every row with a
+        single PymeshioQuaternion. Like PymeshioQuaternion this returns a new instance rather than updating this one.
+
+        Any other type will scale the attributes via the rules of VectorArrayMaster
+
+        :rtype: QuaternionArray
+        """
+        if not isinstance(other, (QuaternionArray, PymeshioQuaternion)):
+            return super().__mul__(other)
+
+        rhs = self._operand(other)
+        u, v = self.data[:, :3], rhs[..., :3]
+        w1, w2 = self.data[:, 3:], rhs[..., 3:]
+
+        product = np.empty_like(self.data)
+        product[:, :3] = w1 * v + w2 * u + np.cross(u, v)
+        product[:, 3] = w1[:, 0] * w2[..., 0] - np.einsum("ij,ij->i", u, np.broadcast_to(v, u.shape))
+        return self._new(product)
+
+    def __imul__(self, other):
+        """
+        As __mul__, but updating this batch in place
+        """
+        if isinstance(other, (QuaternionArray, PymeshioQuaternion)):
+            self.data[:] = (self * other).data
+            return self
+        return super().__imul__(other)
+
+    def dot(self, rhs):
+        """
+        The dot product of each row with the matching row of another QuaternionArray, or a single PymeshioQuaternion
+        """
+        return self.dot_product(rhs)
+
+    def getNormalized(self):
+        return self.normalise()
+
+    def getRightHanded(self):
+        "swap y and z axis"
+        return self._new(np.column_stack((-self.data[:, 0], -self.data[:, 2], -self.data[:, 1], self.data[:, 3])))
+
+    @staticmethod
+    def createFromAxisAngle(axis, rad):
+        """
+        Create a batch of quaternions from an (N, 3) array of axes and an (N, ) array of angles in radians
+
+        :rtype: QuaternionArray
+        """
+        axis = np.asarray(axis, dtype=np.float64).reshape(-1, 3)
+        half_rad = np.asarray(rad, dtype=np.float64).reshape(-1) / 2.0
+
+        s = np.sin(half_rad)
+        return QuaternionArray(np.column_stack((axis * s[:, None], np.cos(half_rad))))
+
+    @staticmethod
+    def _mmd_quaternion_array(x, y, z, w):
+        """
+        Vectorised version of PymeshioQuaternion._mmd_quaternion_array, filling one (N, 4, 4) float32 stack
+        """
+        sqX, sqY, sqZ = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        wx, wy, wz = w * x, w * y, w * z
+
+        matrices = np.zeros((len(x), 4, 4), dtype=np.float32)
+        # 1
+        matrices[:, 0, 0] = 1 - 2 * sqY - 2 * sqZ
+        matrices[:, 0, 1] = 2 * xy + 2 * wz
+        matrices[:, 0, 2] = 2 * xz - 2 * wy
+        # 2
+        matrices[:, 1, 0] = 2 * xy - 2 * wz
+        matrices[:, 1, 1] = 1 - 2 * sqX - 2 * sqZ
+        matrices[:, 1, 2] = 2 * yz + 2 * wx
+        # 3
+        matrices[:, 2, 0] = 2 * xz + 2 * wy
+        matrices[:, 2, 1] = 2 * yz - 2 * wx
+        matrices[:, 2, 2] = 1 - 2 * sqX - 2 * sqY
+        # 4
+        matrices[:, 3, 3] = 1
+        return matrices
+
+    def getMatrix(self):
+        """
+        Returns an (N, 4, 4) stack of rotation matrices
+        """
+        x, y, z, w = self.data.T
+        return self._mmd_quaternion_array(x, y, z, w)
+
+    def getRHMatrix(self):
+        """
+        Returns an (N, 4, 4) stack of right handed rotation matrices
+        """
+        x, y, z, w = self.data.T
+        return self._mmd_quaternion_array(-x, -y, z, w)
+
+    def getRollPitchYaw(self):
+        """
+        Returns three (N, ) arrays of roll, pitch and yaw.
+
+        Where the pitch is at gimbal lock, roll and yaw are shifted by pi for that element only, matching
+        PymeshioQuaternion.getRollPitchYaw
+        """
+        m = self.getMatrix().astype(np.float64)
+
+        roll = np.arctan2(m[:, 0, 1], m[:, 1, 1])
+        pitch = np.arcsin(np.clip(-m[:, 2, 1], -1.0, 1.0))
+        yaw = np.arctan2(m[:, 2, 0], m[:, 2, 2])
+
+        gimbal_lock = np.abs(np.cos(pitch)) < 1.0e-6
+        roll[gimbal_lock] -= np.pi
+        yaw[gimbal_lock] -= np.pi
+
+        return roll, pitch, yaw
+
+
+def as_points(points):
+    """
+    Convert points into a two dimensional float64 numpy array, where points can be an (N, k) array-like, a batch from
+    vectorObjects.VectorArrays, or a list of vectors that inherit from VectorMaster
+
+    :rtype: np.ndarray
+    """
+    if isinstance(points, VectorArrayMaster):
+        return np.asarray(points.data, dtype=np.float64)
+
+    elif len(points) > 0 and isinstance(points[0], VectorMaster):
+        return stack(points)
+
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2:
+        raise ValueError(f"Points are expected to be of shape (N, k) but found {points.shape}")
+    return points
+
+
+def stack(vectors, vector_type=None, dtype=np.float64, out=None):
+    """
+    Stack a list of vectors into an (N, k) array. Each column is read for every vector in a single pass of
+    operator.attrgetter, so no tuple or list is created per vector.
+
+    :param vectors: A list of vectors that share the same attribute names
+    :type vectors: list
+
+    :param vector_type: The class of the vectors, which is only required to give the width of an empty list, or None to
+        use the class of the first vector
+    :type vector_type: type | None
+
+    :param dtype: The dtype of the array
+    :type dtype: np.dtype | type | str
+
+    :param out: An optional (N, k) array to write into rather than allocating a new one
+    :type out: np.ndarray | None
+
+    :rtype: np.ndarray
+    """
+    count = len(vectors)
+    if vector_type is None:
+        if count == 0:
+            raise ValueError("stack requires a vector_type to stack an empty list")
+        vector_type = type(vectors[0])
+
+    slots = vector_type.__slots__
+    if out is None:
+        out = np.empty((count, len(slots)), dtype=dtype)
+    elif out.shape != (count, len(slots)):
+        raise ValueError(f"out must be of shape {(count, len(slots))} but found {out.shape}")
+
+    for column, slot in enumerate(slots):
+        out[:, column] = np.fromiter(map(attrgetter(slot), vectors), dtype=out.dtype, count=count)
+    return out
+
+
+def unstack(array, vector_type):
+    """
+    Create a list of vector_type from the rows of an (N, k) array, setting the attributes of each vector directly
+    rather than through __init__
+
+    :param array: An (N, k) array, where k is the number of attributes of vector_type
+    :type array: np.ndarray
+
+    :param vector_type: The class of vector to create, such as Vector3D
+    :type vector_type: type
+
+    :rtype: list
+    """
+    array = np.asarray(array)
+    if array.ndim != 2 or array.shape[1] != len(vector_type.__slots__):
+        raise ValueError(f"{vector_type.__name__} expects an array of shape (N, {len(vector_type.__slots__)}) but "
+                         f"found {array.shape}")
+    return vector_type._from_rows(array.tolist())
+
+
+def memory_usage(value):
+    """
+    The bytes held by a vector, a list of vectors, or a batch, counting each attribute object of a vector once and the
+    array of a batch whether or not it owns its memory
+
+    :param value: A vector, a list or tuple of vectors, or a batch from vectorObjects.VectorArrays
+    :type value: VectorMaster | list | tuple | VectorArrayMaster
+
+    :rtype: int
+    """
+    if isinstance(value, VectorArrayMaster):
+        array = sys.getsizeof(value.data) + (value.data.nbytes if value.data.base is not None else 0)
+        return sys.getsizeof(value) + array
+
+    elif isinstance(value, VectorMaster):
+        return sys.getsizeof(value) + sum(sys.getsizeof(attribute) for attribute in {id(a): a for a in value}.values())
+
+    elif isinstance(value, (list, tuple)):
+        seen, total = set(), sys.getsizeof(value)
+        for vector in value:
+            total += sys.getsizeof(vector)
+            for attribute in vector:
+                if id(attribute) not in seen:
+                    seen.add(id(attribute))
+                    total += sys.getsizeof(attribute)
+        return total
+
+    raise TypeError(f"memory_usage expects a vector, list of vectors or batch but found {type(value)}")
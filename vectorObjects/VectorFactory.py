@@ -0,0 +1,419 @@
+from vectorObjects.VectorMaster import VectorMaster, _buffer_reader
+from vectorObjects.Precision import _state, _to_float32
+import linecache
+import operator
+import numpy as np
+import math
+
+
+# Operators that have their source generated per slot, with the symbol used in the generated source, the operator
+# passed to VectorMaster._mathematical_operator for the types that are not unrolled, and the name of the in place
+# version of the operator
+_OPERATORS = {
+    "__add__": ("+", operator.add, "Add", "__iadd__"),
+    "__sub__": ("-", operator.sub, "Subtract", "__isub__"),
+    "__mul__": ("*", operator.mul, "Multiply", "__imul__"),
+    "__truediv__": ("/", operator.truediv, "Divide", "__itruediv__"),
+}
+
+# Generated methods that are set as classmethods
+_CLASS_METHODS = {"from_array", "from_buffer", "_from_rows"}
+
+
+def _tuple_source(slots):
+    """
+    Source of a tuple of all the slots of self, such as (self.x, self.y)
+    """
+    attributes = ", ".join(f"self.{slot}" for slot in slots)
+    return f"({attributes},)" if len(slots) == 1 else f"({attributes})"
+
+
+def _init_source(slots):
+    targets = ", ".join(f"self.{slot}" for slot in slots) + ("," if len(slots) == 1 else "")
+    return (f"def __init__(self, *args, ex=False):\n"
+            f"    \"\"\"\n"
+            f"    Set {', '.join(slots)} from positional args, or from a list or tuple via _load if ex is True\n"
+            f"    \"\"\"\n"
+            f"    if ex:\n"
+            f"        {targets} = self._load(args)\n"
+            f"    else:\n"
+            f"        {targets} = args\n")
+
+
+def _repr_source(slots, name):
+    return (f"def {name}(self):\n"
+            f"    return f\"{{{_tuple_source(slots)}}}\"\n")
+
+
+def _getitem_source(slots, class_name):
+    lines = ["def __getitem__(self, item):",
+             f"    \"\"\"",
+             f"    Allows for index calling returns in order of {', '.join(slots)}.",
+             f"    \"\"\""]
+
+    for index, slot in enumerate(slots):
+        lines.append(f"    {'if' if index == 0 else 'elif'} item == {index}:")
+        lines.append(f"        return self.{slot}")
+
+    items = ", ".join(f"{slot}[{index}]" for index, slot in enumerate(slots))
+    lines.append(f"    raise IndexError(\"Index out of range: {class_name} has {items} items. Item calls greater than "
+                 f"{len(slots) - 1} not permitted\")")
+    return "\n".join(lines) + "\n"
+
+
+def _iter_source(slots):
+    return (f"def __iter__(self):\n"
+            f"    \"\"\"\n"
+            f"    Allows for iteration in order {', '.join(slots)}\n"
+            f"    \"\"\"\n"
+            f"    return iter({_tuple_source(slots)})\n")
+
+
+def _policy_assignments(slots, target, expression, indent):
+    """
+    Source setting each slot of target as the expression of that slot under each precision policy, so that no function
+    call is needed to apply the policy in exact or rounded modes
+    """
+    pad = " " * indent
+    lines = [f"{pad}policy = _state.policy",
+             f"{pad}if policy.exact:"]
+    lines += [f"{pad}    {target}.{slot} = {expression(slot)}" for slot in slots]
+    lines += [f"{pad}elif policy.single:"]
+    lines += [f"{pad}    {target}.{slot} = _to_float32({expression(slot)})" for slot in slots]
+    lines += [f"{pad}else:",
+              f"{pad}    digits = policy.digits"]
+    lines += [f"{pad}    {target}.{slot} = round({expression(slot)}, digits)" for slot in slots]
+    return lines
+
+
+def _operator_source(slots, name, symbol, description, in_place):
+    """
+    Source of an operator, which ether returns a new instance or if in_place updates and returns this instance
+    """
+    target = "self" if in_place else "new"
+    result = "Update this instance by" if in_place else "Return a new instance of"
+    lines = [f"def {name}(self, other):",
+             f"    \"\"\"",
+             f"    {result} this vector after the {description.lower()} operation with ether another instance of",
+             f"    this vector, a number as a constant to all attributes, including numpy scalars, or a list/tuple of",
+             f"    values of equal length to the number of attributes",
+             f"    \"\"\"",
+             f"    if isinstance(other, type(self)):"]
+    if not in_place:
+        lines += [f"        new = _new(type(self))"]
+    lines += _policy_assignments(slots, target, lambda slot: f"self.{slot} {symbol} other.{slot}", 8)
+    # Numpy scalars, including np.float64 which is a subclass of float, are converted to python numbers first
+    lines += [f"        return {target}",
+              f"    elif isinstance(other, _number):",
+              f"        return self.{name}(other.item())",
+              f"    elif isinstance(other, (int, float)):"]
+    if not in_place:
+        lines += [f"        new = _new(type(self))"]
+    lines += _policy_assignments(slots, target, lambda slot: f"self.{slot} {symbol} other", 8)
+    lines += [f"        return {target}"]
+
+    current = "self" if in_place else "self._copy(self)"
+    lines += [f"    return self._mathematical_operator({current}, other, _operators[{name!r}])"]
+    return "\n".join(lines) + "\n"
+
+
+def _add_scaled_source(slots):
+    lines = ["def add_scaled(self, other, scale):",
+             "    \"\"\"",
+             "    Add other multiplied by scale to this instance in place, in a single pass without the temporary",
+             "    vector of self += other * scale",
+             "    \"\"\"",
+             "    if isinstance(other, type(self)):"]
+    lines += _policy_assignments(slots, "self", lambda slot: f"self.{slot} + other.{slot} * scale", 8)
+    lines += ["        return self",
+              "    return self._add_scaled(self, other, scale)"]
+    return "\n".join(lines) + "\n"
+
+
+def _neg_source(slots):
+    lines = ["def __neg__(self):",
+             "    \"\"\"",
+             "    Return a new instance with the sign of all elements inverted",
+             "    \"\"\"",
+             "    new = _new(type(self))"]
+    lines += [f"    new.{slot} = -self.{slot}" for slot in slots]
+    lines += ["    return new"]
+    return "\n".join(lines) + "\n"
+
+
+def _copy_source(slots):
+    lines = ["def copy(self):",
+             "    \"\"\"",
+             "    Return a new instance with the same attributes as this one",
+             "    \"\"\"",
+             "    new = _new(type(self))"]
+    lines += [f"    new.{slot} = self.{slot}" for slot in slots]
+    lines += ["    return new"]
+    return "\n".join(lines) + "\n"
+
+
+def _type_check_source(description):
+    return (f"    if not isinstance(other, type(self)):\n"
+            f"        raise TypeError(f\"{description} expects two instances of the same class object but found: \"\n"
+            f"                        f\"{{type(self)}}, {{type(other)}}\")\n")
+
+
+def _eq_source(slots):
+    comparison = " and ".join(f"self.{slot} == other.{slot}" for slot in slots)
+    return (f"def __eq__(self, other):\n"
+            f"    \"\"\"\n"
+            f"    See if two vectors are equal, leaving any other type of object to decide for itself\n"
+            f"    \"\"\"\n"
+            f"    if not isinstance(other, type(self)):\n"
+            f"        return NotImplemented\n"
+            f"    return bool({comparison})\n")
+
+
+def _ne_source():
+    return ("def __ne__(self, other):\n"
+            "    \"\"\"\n"
+            "    Opposite of equality\n"
+            "    \"\"\"\n"
+            "    equal = self.__eq__(other)\n"
+            "    return equal if equal is NotImplemented else not equal\n")
+
+
+def _hash_source(slots, class_name):
+    return (f"def __hash__(self):\n"
+            f"    \"\"\"\n"
+            f"    Hash of the class and attributes, consistent with __eq__, so vectors of other classes or tuples\n"
+            f"    with the same values are different keys. Vectors are mutable, so a vector must not be changed\n"
+            f"    whilst it is held in a set or as a dict key\n"
+            f"    \"\"\"\n"
+            f"    return hash(({class_name!r}, {', '.join(f'self.{slot}' for slot in slots)}))\n")
+
+
+def _isclose_source(slots):
+    comparison = " and\n            ".join(f"_isclose(self.{slot}, other.{slot}, rel_tol=rel_tol, abs_tol=abs_tol)"
+                                           for slot in slots)
+    return (f"def isclose(self, other, rel_tol=1e-09, abs_tol=0.0):\n"
+            f"    \"\"\"\n"
+            f"    See if every attribute of two vectors is close, with the same tolerances as math.isclose\n"
+            f"    \"\"\"\n"
+            f"{_type_check_source('Isclose')}"
+            f"    return ({comparison})\n")
+
+
+def _to_tuple_source(slots):
+    return (f"def to_tuple(self):\n"
+            f"    \"\"\"\n"
+            f"    Returns a tuple representation of type ({', '.join(slots)})\n"
+            f"    \"\"\"\n"
+            f"    return {_tuple_source(slots)}\n")
+
+
+def _to_list_source(slots):
+    return (f"def to_list(self):\n"
+            f"    \"\"\"\n"
+            f"    Returns a list representation of type [{', '.join(slots)}]\n"
+            f"    \"\"\"\n"
+            f"    return [{', '.join(f'self.{slot}' for slot in slots)}]\n")
+
+
+def _dot_product_source(slots):
+    products = " + ".join(f"self.{slot} * other.{slot}" for slot in slots)
+    return (f"def dot_product(self, other):\n"
+            f"    \"\"\"\n"
+            f"    Calculate the dot product of two instances of the same class object\n"
+            f"    \"\"\"\n"
+            f"{_type_check_source('Dot product')}"
+            f"    return {products}\n")
+
+
+def _cross_product_source():
+    return ("def cross_product(self, other):\n"
+            "    \"\"\"\n"
+            "    Calculate the cross product of two instances of the same class object\n"
+            "    \"\"\"\n"
+            "    return self._return_cross_product(self, other)\n")
+
+
+def _normalise_source(slots):
+    squares = " + ".join(f"self.{slot} * self.{slot}" for slot in slots)
+    lines = ["def normalise(self):",
+             "    \"\"\"",
+             "    Normalise attributes",
+             "    \"\"\"",
+             f"    scale_factor = 1.0 / _sqrt({squares})"]
+    lines += [f"    self.{slot} = self.{slot} * scale_factor" for slot in slots]
+    lines += ["    if _state.policy.single:"]
+    lines += [f"        self.{slot} = _to_float32(self.{slot})" for slot in slots]
+    lines += [f"    return {_tuple_source(slots)}"]
+    return "\n".join(lines) + "\n"
+
+
+def _sub_divide_source():
+    return ("def sub_divide(self, other, sub_divisions, from_self=True, include_points=True, output=\"list\"):\n"
+            "    \"\"\"\n"
+            "    Sub divide the points between this vector and another instance of this vector, see\n"
+            "    VectorMaster._sub_divide\n"
+            "    \"\"\"\n"
+            "    return self._sub_divide(self, other, sub_divisions, from_self, include_points, output)\n")
+
+
+def _from_array_source(slots):
+    targets = ", ".join(f"new.{slot}" for slot in slots) + ("," if len(slots) == 1 else "")
+    return (f"def from_array(cls, values):\n"
+            f"    \"\"\"\n"
+            f"    Create a vector from a one dimensional array-like of {', '.join(slots)}, see\n"
+            f"    VectorMaster.from_array\n"
+            f"    \"\"\"\n"
+            f"    if type(values) is not _ndarray:\n"
+            f"        values = _asarray(values)\n"
+            f"    if values.shape != ({len(slots)}, ):\n"
+            f"        raise ValueError(f\"{{cls.__name__}} expects an array of shape ({len(slots)}, ) but found \"\n"
+            f"                         f\"{{values.shape}}\")\n"
+            f"    new = _new(cls)\n"
+            f"    {targets} = values.tolist()\n"
+            f"    return new\n")
+
+
+def _from_buffer_source(slots):
+    targets = ", ".join(f"new.{slot}" for slot in slots) + ("," if len(slots) == 1 else "")
+    return (f"def from_buffer(cls, buffer, dtype=_float64, offset=0):\n"
+            f"    \"\"\"\n"
+            f"    Create a vector from {', '.join(slots)} read directly from a buffer, see VectorMaster.from_buffer\n"
+            f"    \"\"\"\n"
+            f"    new = _new(cls)\n"
+            f"    {targets} = _buffer_reader(dtype, {len(slots)})(buffer, offset)\n"
+            f"    return new\n")
+
+
+def _from_rows_source(slots):
+    names = ", ".join(f"_value_{index}" for index in range(len(slots))) + ("," if len(slots) == 1 else "")
+    lines = ["def _from_rows(cls, rows):",
+             "    \"\"\"",
+             "    Create a list of vectors from an iterable of rows, see vectorObjects.VectorArrays.unstack",
+             "    \"\"\"",
+             "    vectors = []",
+             "    append = vectors.append",
+             f"    for {names} in rows:",
+             "        new = _new(cls)"]
+    lines += [f"        new.{slot} = _value_{index}" for index, slot in enumerate(slots)]
+    lines += ["        append(new)",
+              "    return vectors"]
+    return "\n".join(lines) + "\n"
+
+
+def _array_source(slots):
+    return (f"def __array__(self, dtype=None, copy=None):\n"
+            f"    \"\"\"\n"
+            f"    Return {', '.join(slots)} as a one dimensional numpy array, see VectorMaster.__array__\n"
+            f"    \"\"\"\n"
+            f"    if copy is False:\n"
+            f"        raise ValueError(f\"{{type(self).__name__}} cannot be converted to an array without a copy\")\n"
+            f"    return _array({_tuple_source(slots)}, dtype=dtype)\n")
+
+
+def _method_sources(slots, class_name):
+    """
+    The source of each method that can be generated for a vector with these slots, keyed by method name
+    """
+    sources = {
+        "__init__": _init_source(slots),
+        "__repr__": _repr_source(slots, "__repr__"),
+        "__str__": _repr_source(slots, "__str__"),
+        "__getitem__": _getitem_source(slots, class_name),
+        "__iter__": _iter_source(slots),
+        "__neg__": _neg_source(slots),
+        "copy": _copy_source(slots),
+        "add_scaled": _add_scaled_source(slots),
+        "__eq__": _eq_source(slots),
+        "__ne__": _ne_source(),
+        "__hash__": _hash_source(slots, class_name),
+        "isclose": _isclose_source(slots),
+        "to_tuple": _to_tuple_source(slots),
+        "to_list": _to_list_source(slots),
+        "dot_product": _dot_product_source(slots),
+        "cross_product": _cross_product_source(),
+        "normalise": _normalise_source(slots),
+        "sub_divide": _sub_divide_source(),
+        "from_array": _from_array_source(slots),
+        "from_buffer": _from_buffer_source(slots),
+        "_from_rows": _from_rows_source(slots),
+        "__array__": _array_source(slots),
+    }
+    for name, (symbol, _, description, in_place_name) in _OPERATORS.items():
+        sources[name] = _operator_source(slots, name, symbol, description, False)
+        sources[in_place_name] = _operator_source(slots, in_place_name, symbol, description, True)
+    return sources
+
+
+def vector_class(cls):
+    """
+    Class decorator for VectorMaster subclasses that generates specialised source for the dunders and common methods
+    of the class from its __slots__, so each operation works on the attributes directly rather than looping over
+    __slots__ with getattr/setattr.
+
+    Any method the class defines itself is left as it is, so only what is missing is generated.
+
+    :param cls: A subclass of VectorMaster with __slots__ set
+    :type cls: type
+
+    :return: The same class with the generated methods set
+    :rtype: type
+    """
+    slots = list(cls.__slots__)
+    if len(slots) == 0:
+        raise ValueError(f"{cls.__name__} must define at least one slot to have its methods generated")
+
+    sources = {name: source for name, source in _method_sources(slots, cls.__name__).items()
+               if name not in cls.__dict__}
+
+    # If the class defines its own operator then the in place version should fall back to it, rather than to the
+    # generated one
+    for name, (_, _, _, in_place_name) in _OPERATORS.items():
+        if name in cls.__dict__:
+            sources.pop(in_place_name, None)
+
+    # Register the source with linecache so that tracebacks and inspect can show the generated code
+    filename = f"<vectorObjects.VectorFactory {cls.__qualname__}>"
+    source = "\n".join(sources.values())
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    operators = {}
+    for name, (_, op, _, in_place_name) in _OPERATORS.items():
+        operators[name] = operators[in_place_name] = op
+
+    namespace = {"_sqrt": math.sqrt, "_state": _state, "_to_float32": _to_float32, "_new": object.__new__,
+                 "_operators": operators, "_ndarray": np.ndarray, "_asarray": np.asarray, "_array": np.array,
+                 "_float64": np.float64, "_number": np.number, "_buffer_reader": _buffer_reader,
+                 "_isclose": math.isclose}
+    exec(compile(source, filename, "exec"), namespace)
+
+    for name in sources:
+        method = namespace[name]
+        method.__qualname__ = f"{cls.__qualname__}.{name}"
+        method.__module__ = cls.__module__
+        setattr(cls, name, classmethod(method) if name in _CLASS_METHODS else method)
+
+    return cls
+
+
+def make_vector_class(name, slots, base=VectorMaster, doc=None):
+    """
+    Create a new vector class with the given attribute names, with all of its methods generated via vector_class
+
+    :param name: The name of the class, such as Vector5D
+    :type name: str
+
+    :param slots: The names of each attribute in order, such as ["a", "b", "c", "d", "e"]
+    :type slots: list[str] | tuple[str]
+
+    :param base: The class to inherit from, which must be VectorMaster or a subclass of it
+    :type base: type
+
+    :param doc: The docstring of the class
+    :type doc: str | None
+
+    :rtype: type
+    """
+    if not issubclass(base, VectorMaster):
+        raise TypeError(f"make_vector_class expects base to be a subclass of VectorMaster but found {base}")
+
+    return vector_class(type(name, (base,), {"__slots__": list(slots), "__doc__": doc}))
@@ -1,82 +1,364 @@
+from vectorObjects.Precision import resolve
 import numpy as np
 import operator
+import numbers
+import struct
+import array
 import math
 import sys
 
 
+def _load_values(args):
+    """
+    Load positional numbers, converting any numpy scalars to python numbers so they are not held as numpy types
+    """
+    return [value.item() if isinstance(value, np.generic) else value for value in args]
+
+
+def _load_sequence(args):
+    return args[0]
+
+
+def _load_array(args):
+    """
+    Load a one dimensional ndarray, memoryview or array.array, where tolist converts every value in a single call
+    """
+    values = args[0]
+    if getattr(values, "ndim", 1) != 1:
+        raise ValueError(f"Vectors can only be loaded from one dimensional arrays but found {values.ndim} dimensions")
+    return values.tolist()
+
+
+def _load_array_like(args):
+    return _load_array((np.asarray(args[0]), ))
+
+
+def _resolve_loader(kind):
+    """
+    Find the loader of a type that is not yet in the dispatch table, adding it to the table if one is found
+    """
+    if issubclass(kind, (int, float, np.number)):
+        loader = _load_values
+    elif issubclass(kind, (list, tuple)):
+        loader = _load_sequence
+    elif issubclass(kind, (np.ndarray, memoryview, array.array)):
+        loader = _load_array
+    elif hasattr(kind, "__array__"):
+        loader = _load_array_like
+    else:
+        raise TypeError(f"Vectors can be loaded from numbers, a list or tuple, a one dimensional array or buffer, or "
+                        f"an object with __array__, but found {kind}")
+
+    _LOADERS[kind] = loader
+    return loader
+
+
+# The struct format character of each numpy kind and item size that struct can read directly
+_STRUCT_CHARACTERS = {
+    ("f", 2): "e", ("f", 4): "f", ("f", 8): "d",
+    ("i", 1): "b", ("i", 2): "h", ("i", 4): "i", ("i", 8): "q",
+    ("u", 1): "B", ("u", 2): "H", ("u", 4): "I", ("u", 8): "Q",
+    ("b", 1): "?",
+}
+
+# The reader of each (dtype, count) used by from_buffer, so the dtype is only resolved once
+_BUFFER_READERS = {}
+
+
+def _buffer_reader(dtype, count):
+    """
+    A function of (buffer, offset) that returns count values of dtype from the buffer. A struct is used where the
+    dtype has a struct equivalent, as unpacking a few values is much faster with struct than numpy.
+    """
+    try:
+        return _BUFFER_READERS[dtype, count]
+    except (KeyError, TypeError):
+        pass
+
+    resolved = np.dtype(dtype)
+    character = _STRUCT_CHARACTERS.get((resolved.kind, resolved.itemsize))
+    if character is None:
+        def reader(buffer, offset):
+            return np.frombuffer(buffer, dtype=resolved, count=count, offset=offset).tolist()
+    else:
+        order = {"<": "<", ">": ">", "|": "<"}.get(resolved.byteorder, "<" if sys.byteorder == "little" else ">")
+        reader = struct.Struct(f"{order}{count}{character}").unpack_from
+
+    try:
+        _BUFFER_READERS[dtype, count] = reader
+    except TypeError:
+        # Unhashable dtype descriptions are resolved every call
+        pass
+    return reader
+
+
+# The loader of each type of the first argument given to _load, filled as new types are seen so each type is only
+# resolved once
+_LOADERS = {
+    int: _load_values,
+    float: _load_values,
+    list: _load_sequence,
+    tuple: _load_sequence,
+    np.ndarray: _load_array,
+}
+
+
 class VectorMaster:
     def _load(self, args):
         """
-        All args will be submitted in a tuple format, but we may not be expecting it. Load will check to see what the
-        first element is, and use that to determine the load operation
+        All args will be submitted in a tuple format, but we may not be expecting it. Load will check the type of the
+        first element, and use that to determine the load operation from a table of loaders by type.
+
+        Numbers are returned as python numbers, with numpy scalars of any width converted by item. A list or tuple
+        returns the first element rather than the tuple containing it, whilst one dimensional ndarrays, memoryviews,
+        array.array and objects with __array__ are converted to a list in a single call. Any other type raises a
+        TypeError.
         """
+        # If no args supplied, just initialise all values to 0 for each slot
+        if len(args) == 0:
+            return [0 for _ in range(len(self.__slots__))]
+
         try:
-            # If its a numeric, then it is the expect tuple and we should just return the args
-            if isinstance(args[0], (int, float, np.intc, np.float32, np.float64)):
-                return args
+            loader = _LOADERS[type(args[0])]
+        except KeyError:
+            loader = _resolve_loader(type(args[0]))
+        return loader(args)
 
-            # If its a list or tuple then we need to return the first element rather than the tuple containing it
-            elif isinstance(args[0], (list, tuple)):
-                return args[0]
+    @classmethod
+    def from_array(cls, values):
+        """
+        Create a vector from a one dimensional array-like of one value per attribute, such as a row of a numpy array
 
-            # Catch unexpected types
-            else:
-                sys.exit(f"Found unexpected type {type(args[0])}")
+        :param values: An ndarray, memoryview, array.array, or any object accepted by numpy.asarray
+        :rtype: VectorMaster
+        """
+        values = np.asarray(values)
+        if values.shape != (len(cls.__slots__), ):
+            raise ValueError(f"{cls.__name__} expects an array of shape ({len(cls.__slots__)}, ) but found "
+                             f"{values.shape}")
+        return cls._from_values(cls, values.tolist())
 
-        # If no args supplied, just initialise all values to 0 for each slot
-        except IndexError:
-            return [0 for _ in range(len(self.__slots__))]
+    @classmethod
+    def from_buffer(cls, buffer, dtype=np.float64, offset=0):
+        """
+        Create a vector from one value per attribute read directly from a buffer, such as bytes read from a binary file
+
+        :param buffer: Any object exposing the buffer protocol, such as bytes, bytearray or memoryview
+        :param dtype: The dtype of the values in the buffer
+        :type dtype: np.dtype | type | str
+        :param offset: The byte offset to start reading from
+        :type offset: int
+        :rtype: VectorMaster
+        """
+        return cls._from_values(cls, _buffer_reader(dtype, len(cls.__slots__))(buffer, offset))
+
+    @classmethod
+    def _from_rows(cls, rows):
+        """
+        Create a list of vectors from an iterable of rows of one value per attribute, see vectorObjects.VectorArrays.
+        unstack
+        """
+        return [cls._from_values(cls, row) for row in rows]
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        Return the attributes as a one dimensional numpy array, so np.asarray(vector) and np.stack(vectors) work
+        directly. The array is always a new copy of the attributes.
+        """
+        if copy is False:
+            raise ValueError(f"{type(self).__name__} cannot be converted to an array without a copy")
+        return np.array(self._return_list(self), dtype=dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """
+        Apply numpy ufuncs to vectors as arrays of their attributes, so np.add(v, w) or np.sqrt(v) work directly. A
+        result of one value per attribute is returned as a vector of the same class, whilst any other result, such as
+        a comparison or reduction, is returned as numpy returns it. Results are calculated by numpy, so the precision
+        policy is not applied.
+        """
+        if any(isinstance(value, VectorMaster) for value in kwargs.get("out", ())):
+            return NotImplemented
+
+        arrays = [value.__array__() if isinstance(value, VectorMaster) else value for value in inputs]
+        return self._wrap_array(getattr(ufunc, method)(*arrays, **kwargs))
+
+    def _wrap_array(self, result):
+        """
+        Return result as a vector of this class if it is a numeric array of one value per attribute
+        """
+        if isinstance(result, tuple):
+            return tuple(self._wrap_array(value) for value in result)
+
+        if isinstance(result, np.ndarray) and result.shape == (len(self.__slots__), ) and result.dtype.kind in "iuf":
+            return type(self).from_array(result)
+        return result
 
     @staticmethod
-    def _mathematical_operator(current_inst, other_inst, operation, rounding=14):
+    def _mathematical_operator(current_inst, other_inst, operation, rounding=None):
         """
         Update the attributes of the current instance of this class by other instance, either of the same class, a
         constant, or a list/tuple of the same length of the attributes of the current instance.
 
         :param current_inst: The current class instance
-        :param other_inst: Another class instance of the same type as current, an int/float, or a tuple/list of equal
-            length to the number of attributes in the current inst
+        :param other_inst: Another class instance of the same type as current, a number including numpy scalars, or a
+            tuple/list of equal length to the number of attributes in the current inst
         :param operation: The operator function you wish to perform
-        :return: A tuple of the current attributes of the current instance of a class
-        :rtype: tuple
+        :param rounding: The precision policy for this call, see vectorObjects.Precision. An int is treated as the
+            number of digits to round to, and None uses the current policy
+        :return: The current class instance, which has been updated in place, or NotImplemented if other_inst is none
+            of the above so python and numpy can try the reflected operation, such as ndarray.__radd__
         """
+        apply = resolve(rounding).apply
+        if isinstance(other_inst, np.number):
+            other_inst = other_inst.item()
 
         # modify current instances attributes by another vector arrays of the same type
         if isinstance(other_inst, type(current_inst)):
             [setattr(current_inst, current,
-                     round(operation(getattr(current_inst, current), getattr(other_inst, other)), rounding))
+                     apply(operation(getattr(current_inst, current), getattr(other_inst, other))))
              for current, other in zip(current_inst.__slots__, other_inst.__slots__)]
 
         # modify current instances attributes by a constant
-        elif isinstance(other_inst, (float, int)):
-            [setattr(current_inst, current, round(operation(getattr(current_inst, current), other_inst), rounding))
+        elif isinstance(other_inst, numbers.Number):
+            [setattr(current_inst, current, apply(operation(getattr(current_inst, current), other_inst)))
              for current in current_inst.__slots__]
 
         # Modify current instances attributes by a value from a list of tuple of equal length of attributes
         elif isinstance(other_inst, (list, tuple)):
             if len(other_inst) == len(current_inst.__slots__):
-                [setattr(current_inst, attr, round(operation(getattr(current_inst, attr), v), rounding))
+                [setattr(current_inst, attr, apply(operation(getattr(current_inst, attr), v)))
                  for attr, v in zip(current_inst.__slots__, other_inst)]
             else:
                 raise ValueError("A list/tuple must be of the same length as the number of attributes of the vector\n"
                                  f"Length of input: {len(other_inst)}\n"
                                  f"Length of attributes: {len(current_inst.__slots__)}")
 
+        else:
+            return NotImplemented
+
         return current_inst
 
+    @staticmethod
+    def _copy(instance):
+        """
+        Return a new instance of the same class as instance with the same attribute values, without going through
+        __init__
+        """
+        new = object.__new__(type(instance))
+        [setattr(new, attr, getattr(instance, attr)) for attr in instance.__slots__]
+        return new
+
+    def _add_scaled(self, current_inst, other_inst, scale, rounding=None):
+        """
+        Update the attributes of the current instance by adding other instance multiplied by scale, where other
+        instance is ether of the same class or a list/tuple of the same length of the attributes of the current instance
+
+        :param current_inst: The current class instance
+        :param other_inst: Another class instance of the same type as current, or a tuple/list of equal length to the
+            number of attributes in the current inst
+        :param scale: The int/float to multiply other instance by
+        :param rounding: The precision policy for this call, see vectorObjects.Precision
+        :return: The current class instance
+        """
+        if isinstance(other_inst, type(current_inst)):
+            values = self._return_list(other_inst)
+        elif isinstance(other_inst, (list, tuple)):
+            values = other_inst
+        else:
+            raise TypeError(f"Add scaled expects an instance of the same class object or a list/tuple but found: "
+                            f"{type(current_inst)}, {type(other_inst)}")
+
+        return self._mathematical_operator(current_inst, [v * scale for v in values], operator.add, rounding)
+
+    @staticmethod
+    def _from_values(cls, values):
+        """
+        Return a new instance of cls with its attributes set in order from values, without going through __init__
+        """
+        new = object.__new__(cls)
+        [setattr(new, attr, value) for attr, value in zip(cls.__slots__, values)]
+        return new
+
+    def _sub_divide(self, current_inst, other_inst, sub_divisions, from_self=True, include_points=True,
+                    output="list"):
+        """
+        This takes the current instance and another instance of the same class and in-betweens the points into
+        multiple points equal in length to the sub_divisions.
+
+        :param current_inst: The current class instance
+        :param other_inst: Another instance of the same class as current_inst
+
+        :param sub_divisions: The number of points you want have calculated between this vector and other
+        :type sub_divisions: int
+
+        :param from_self: By default this will create a sub divided list from this point to the next point. If you want
+            the opposite, ie from the other point to this point, set to False
+        :type from_self: bool
+
+        :param include_points: If True the returned points will include current_inst and other_inst
+        :type include_points: bool
+
+        :param output: "list" for a list of instances of the same class, "array" for an (N, k) numpy array, or
+            "generator" for a generator that creates each instance as it is iterated over so memory stays flat
+        :type output: str
+
+        :return: The points with current_inst and other_inst being the first or last based on from_self, with the
+            number of subdivided points between them equal to sub_divisions.
+        :rtype: list | np.ndarray | generator
+        """
+        if not isinstance(other_inst, type(current_inst)):
+            raise TypeError(f"Sub divide expects two instances of the same class object but found: "
+                            f"{type(current_inst)}, {type(other_inst)}")
+
+        start, stop = (current_inst, other_inst) if from_self else (other_inst, current_inst)
+
+        if output == "generator":
+            return self._iter_sub_divide(start, stop, sub_divisions, include_points)
+
+        spaced = np.linspace(self._return_list(start), self._return_list(stop), 2 + sub_divisions)
+        if not include_points:
+            spaced = spaced[1:-1]
+
+        if output == "array":
+            return spaced
+        elif output == "list":
+            return [self._from_values(type(current_inst), values) for values in spaced.tolist()]
+        else:
+            raise ValueError(f"Sub divide output must be one of list, array or generator but found {output}")
+
+    @staticmethod
+    def _iter_sub_divide(start, stop, sub_divisions, include_points):
+        """
+        Yield each sub divided point between start and stop as a new instance, calculating each point as numpy.linspace
+        would so the results are the same as the list and array outputs of _sub_divide
+        """
+        cls = type(start)
+        first = [float(getattr(start, attr)) for attr in cls.__slots__]
+        last = [float(getattr(stop, attr)) for attr in cls.__slots__]
+
+        divisions = sub_divisions + 1
+        steps = [(end - begin) / divisions for begin, end in zip(first, last)]
+
+        for index in range(0 if include_points else 1, divisions + 1 if include_points else divisions):
+            if index == divisions:
+                yield VectorMaster._from_values(cls, last)
+            else:
+                yield VectorMaster._from_values(cls, [index * step + begin for begin, step in zip(first, steps)])
+
     def _negative(self, instance):
         """
-        Set all attributes of the current class instance to be the negative
+        Return a new instance with all attributes of the current class instance set to be the negative
         """
-        [setattr(instance, attr, operator.neg(getattr(instance, attr))) for attr in instance.__slots__]
-        return self._return_tuple(instance)
+        new = self._copy(instance)
+        [setattr(new, attr, operator.neg(getattr(new, attr))) for attr in new.__slots__]
+        return new
 
     @staticmethod
     def _return_tuple(instance):
         """
         Return a tuple of all the current instances attribute values
         """
-        return (getattr(instance, attr) for attr in instance.__slots__)
+        return tuple(getattr(instance, attr) for attr in instance.__slots__)
 
     @staticmethod
     def _return_list(instance):
@@ -97,38 +379,44 @@ class VectorMaster:
             raise TypeError(f"Dot product expects two instances of the same class object but found: "
                             f"{type(current_inst)}, {type(other_inst)}")
 
-    def _return_cross_product(self, current_inst, other_inst, rounding=14):
+    def _return_cross_product(self, current_inst, other_inst, rounding=None):
         """
-        Calculate the cross product via numpy.cross, round to deal with floating point errors, then update the current
-        class's attributes as the cross product
+        Calculate the cross product via numpy.cross, apply the precision policy to deal with floating point errors,
+        then update the current class's attributes as the cross product
         """
         if isinstance(other_inst, type(current_inst)):
-            cross = np.cross(np.array(self._return_list(current_inst)), np.array(self._return_list(other_inst)))
-            cross = [round(cp, rounding) for cp in cross]
+            apply = resolve(rounding).apply
+            if len(current_inst.__slots__) == 3:
+                # The same products and differences as numpy.cross, without building arrays for three values
+                (a1, a2, a3), (b1, b2, b3) = self._return_list(current_inst), self._return_list(other_inst)
+                cross = [a2 * b3 - a3 * b2, a3 * b1 - a1 * b3, a1 * b2 - a2 * b1]
+            else:
+                cross = np.cross(np.array(self._return_list(current_inst)), np.array(self._return_list(other_inst)))
+            cross = [float(apply(cp)) for cp in cross]
             [setattr(current_inst, attr, value) for attr, value in zip(current_inst.__slots__, cross)]
             return self._return_tuple(current_inst)
         else:
             raise TypeError(f"Cross product expects two instances of the same class object but found: "
                             f"{type(current_inst)}, {type(other_inst)}")
 
-    def _normalise_attributes(self, instance):
+    def _normalise_attributes(self, instance, rounding=None):
         """
-        Normalise the attributes of the class instance
+        Normalise the attributes of the class instance. Only a float32 precision policy is applied, as normalised values
+        have never been rounded
         """
+        policy = resolve(rounding)
         scale_factor = 1.0 / math.sqrt(sum([getattr(instance, attr) * getattr(instance, attr)
                                             for attr in instance.__slots__]))
         [setattr(instance, attr, getattr(instance, attr) * scale_factor) for attr in instance.__slots__]
+        if policy.single:
+            [setattr(instance, attr, policy.apply(getattr(instance, attr))) for attr in instance.__slots__]
         return self._return_tuple(instance)
 
     def _equality(self, current_inst, other_inst):
         """
-        Check if two class instances are equal
+        Check if two class instances are equal, returning NotImplemented for any other type as __eq__ does
         """
         if isinstance(other_inst, type(current_inst)):
-            if (np.array(self._return_list(current_inst)) == np.array(self._return_list(other_inst))).all():
-                return True
-            else:
-                return False
-        else:
-            raise TypeError(f"Equality expects two instances of the same class object but found: "
-                            f"{type(current_inst)}, {type(other_inst)}")
+            return all([getattr(current_inst, current) == getattr(other_inst, other)
+                        for current, other in zip(current_inst.__slots__, other_inst.__slots__)])
+        return NotImplemented
@@ -0,0 +1,231 @@
+from vectorObjects.DefinedVectors import Vector2D, Vector3D, Vector4D, VectorRGB, PymeshioQuaternion
+from vectorObjects.VectorArrays import (Vector2DArray, Vector3DArray, Vector4DArray, VectorRGBArray, QuaternionArray,
+                                        as_points)
+from vectorObjects.VectorMaster import VectorMaster
+import numpy as np
+import struct
+import json
+import os
+
+
+# The vector and batch types of each kind of vector that can be stored
+KINDS = {
+    "2D": (Vector2D, Vector2DArray),
+    "3D": (Vector3D, Vector3DArray),
+    "4D": (Vector4D, Vector4DArray),
+    "RGB": (VectorRGB, VectorRGBArray),
+    "quaternion": (PymeshioQuaternion, QuaternionArray),
+}
+
+MAGIC = b"VOBJ"
+VERSION = 1
+
+# Magic, version, count and the length of the json header. The count is the only field that changes on append, so it
+# is held at a fixed offset rather than in the json header.
+_PREAMBLE = struct.Struct("<4sHxxQI")
+_COUNT_OFFSET = 8
+
+# The start of the data is aligned so it can be memory mapped efficiently
+_ALIGNMENT = 64
+
+
+class VectorStore:
+    """
+    A compact binary file of vectors that is opened with numpy.memmap, so loading is zero copy and pages are only read
+    from disk when they are used.
+
+    The file holds a small preamble of magic, version and count, then a json header of the kind of vector, dtype and
+    slot names, then the rows of the vectors as a single contiguous little endian array. Rows can be appended in chunks
+    without rewriting the file.
+    """
+    __slots__ = ["path", "kind", "dtype", "slots", "count", "_data_offset", "_arrays"]
+
+    def __init__(self, path):
+        """
+        Open an existing store, see VectorStore.create to make a new one
+
+        :param path: The path to the store
+        :type path: str
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, count, header_length = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a VectorStore")
+            if version > VERSION:
+                raise ValueError(f"{path} is version {version} but only versions up to {VERSION} can be read")
+
+            header = json.loads(file.read(header_length).decode("utf-8"))
+
+        self.kind = header["kind"]
+        self.dtype = np.dtype(header["dtype"])
+        self.slots = header["slots"]
+        self.count = count
+        self._data_offset = self._aligned(_PREAMBLE.size + header_length)
+        # The read only and writable memmaps, keyed by writable, which are mapped once until the store is appended to
+        self._arrays = {}
+
+    @classmethod
+    def create(cls, path, kind, dtype=np.float64, data=None):
+        """
+        Create a new store, overwriting any file at path
+
+        :param path: The path to write the store to
+        :type path: str
+
+        :param kind: The kind of vector held, one of 2D, 3D, 4D, RGB or quaternion
+        :type kind: str
+
+        :param dtype: The dtype each value is stored as, such as float64, float32 or uint8 for RGB
+        :type dtype: np.dtype | type | str
+
+        :param data: Optional vectors to write, as accepted by append
+        :type data: np.ndarray | VectorArrayMaster | list | None
+
+        :rtype: VectorStore
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind {kind}: expected one of {', '.join(KINDS)}")
+
+        header = json.dumps({"kind": kind, "dtype": np.dtype(dtype).newbyteorder("<").str,
+                             "slots": list(KINDS[kind][0].__slots__)}).encode("utf-8")
+
+        with open(path, "wb") as file:
+            file.write(_PREAMBLE.pack(MAGIC, VERSION, 0, len(header)))
+            file.write(header)
+            file.write(b"\0" * (cls._aligned(_PREAMBLE.size + len(header)) - _PREAMBLE.size - len(header)))
+
+        store = cls(path)
+        if data is not None:
+            store.append(data)
+        return store
+
+    @staticmethod
+    def _aligned(offset):
+        return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+    def __repr__(self):
+        return f"VectorStore({self.path}, {self.kind}, {self.dtype}, {self.count} vectors)"
+
+    def __len__(self):
+        return self.count
+
+    def width(self):
+        return len(self.slots)
+
+    def vector_type(self):
+        return KINDS[self.kind][0]
+
+    def batch_type(self):
+        return KINDS[self.kind][1]
+
+    def append(self, data):
+        """
+        Append vectors to the end of the store, which only writes the new rows and updates the count
+
+        :param data: An (N, k) array, a batch from vectorObjects.VectorArrays, or a list of vectors
+        :type data: np.ndarray | VectorArrayMaster | list
+        """
+        rows = np.ascontiguousarray(as_points(data) if not isinstance(data, np.ndarray) else data,
+                                    dtype=self.dtype.newbyteorder("<"))
+        if rows.ndim != 2 or rows.shape[1] != self.width():
+            raise ValueError(f"Expected rows of shape (N, {self.width()}) but found {rows.shape}")
+
+        with open(self.path, "r+b") as file:
+            file.seek(self._data_offset + self.count * self.width() * self.dtype.itemsize)
+            file.write(rows.tobytes())
+            file.truncate()
+
+            file.seek(_COUNT_OFFSET)
+            file.write(struct.pack("<Q", self.count + len(rows)))
+
+        self.count += len(rows)
+        self._arrays = {}
+
+    def append_chunks(self, chunks):
+        """
+        Append each chunk from an iterable of chunks, such as a generator, so only one chunk is in memory at once
+        """
+        [self.append(chunk) for chunk in chunks]
+
+    def array(self, writable=False):
+        """
+        The stored vectors as an (N, k) numpy.memmap, which reads from disk lazily. The file is mapped once and the
+        same memmap is returned until the store is appended to.
+
+        :param writable: If True changes to the array are written to the file
+        :type writable: bool
+
+        :rtype: np.memmap | np.ndarray
+        """
+        if self.count == 0:
+            return np.empty((0, self.width()), dtype=self.dtype)
+
+        writable = bool(writable)
+        array = self._arrays.get(writable)
+        if array is None:
+            array = np.memmap(self.path, dtype=self.dtype, mode="r+" if writable else "r", offset=self._data_offset,
+                              shape=(self.count, self.width()))
+            self._arrays[writable] = array
+        return array
+
+    def batch(self):
+        """
+        The stored vectors as the batch type of this kind, such as Vector3DArray. This is zero copy when the batch type
+        can be held as the dtype of the store, such as float32, whilst other dtypes are converted into float64 in
+        memory.
+
+        :rtype: VectorArrayMaster
+        """
+        batch_type = self.batch_type()
+        dtype = self.dtype if self.dtype in batch_type.dtypes else np.float64
+        return batch_type(self.array(), dtype=dtype)
+
+    def __getitem__(self, item):
+        """
+        A view of the memory mapped rows selected by item, see get
+        """
+        return self.get(item)
+
+    def get(self, item, copy=False):
+        """
+        The rows selected by item. By default an int or slice returns a view of the memmap, so nothing is read until it
+        is used, whilst indexing with an array or list of indices is always a copy, as with any numpy array.
+
+        :param item: An int, slice, or any other numpy index of the rows
+        :type item: int | slice | np.ndarray | list
+
+        :param copy: If True an int returns that vector as the vector type of this kind, and anything else returns an
+            in memory copy of the rows rather than a view
+        :type copy: bool
+
+        :rtype: np.memmap | np.ndarray | VectorMaster
+        """
+        if isinstance(item, (int, np.integer)) and not -self.count <= item < self.count:
+            raise IndexError(f"Index {item} out of range for a store of {self.count} vectors")
+
+        rows = self.array()[item]
+        if not copy:
+            return rows
+        elif isinstance(item, (int, np.integer)):
+            return VectorMaster._from_values(self.vector_type(), rows.tolist())
+        return np.array(rows)
+
+    def __iter__(self):
+        return self.iter_vectors()
+
+    def iter_vectors(self, chunk_size=65536):
+        """
+        Lazily yield every stored vector as the vector type of this kind, reading chunk_size rows at a time
+        """
+        array = self.array()
+        vector_type = self.vector_type()
+        for start in range(0, self.count, chunk_size):
+            for values in array[start:start + chunk_size].tolist():
+                yield VectorMaster._from_values(vector_type, values)
+
+    def nbytes(self):
+        """
+        The size of the file in bytes
+        """
+        return os.path.getsize(self.path)
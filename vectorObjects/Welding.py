@@ -0,0 +1,258 @@
+from vectorObjects.VectorArrays import VectorArrayMaster, as_points, unstack
+from vectorObjects.VectorMaster import VectorMaster
+import itertools
+import numpy as np
+
+# Odd constants used to mix the columns of each row into a single 64 bit hash
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_MIXER = np.uint64(0xBF58476D1CE4E5B9)
+_SHIFT = np.uint64(31)
+# The most pairs of points compared at once when welding with a tolerance
+_PAIR_BLOCK = 1 << 20
+
+
+def _hash_rows(rows):
+    """
+    Hash each row of an (N, k) array of 64 bit values into a single uint64, so rows can be grouped by sorting one
+    column rather than comparing k
+    """
+    rows = rows.view(np.uint64)
+    hashes = np.full(len(rows), rows.shape[1], dtype=np.uint64)
+    for column in range(rows.shape[1]):
+        hashes ^= rows[:, column]
+        hashes *= _MULTIPLIER
+        hashes ^= hashes >> _SHIFT
+        hashes *= _MIXER
+    return hashes
+
+
+def _group_rows(rows):
+    """
+    Group identical rows of an (N, k) array of 64 bit values, ordered by their first occurrence
+
+    :return: The index of the first row of each group, and the group of each row
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    _, first, inverse = np.unique(_hash_rows(rows), return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # Two different rows with the same hash are extremely unlikely, but if there are any fall back to sorting the rows
+    if not np.array_equal(rows[first][inverse], rows):
+        _, first, inverse = np.unique(rows, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse]
+
+
+def _connected_labels(count, a, b):
+    """
+    Label each of count nodes with the smallest node it is connected to through the edges a to b, by propagating the
+    minimum label along every edge and then jumping each label to the label of its label until nothing changes
+    """
+    labels = np.arange(count)
+    while True:
+        updated = labels.copy()
+        np.minimum.at(updated, a, labels[b])
+        np.minimum.at(updated, b, labels[a])
+
+        jumped = updated[updated]
+        while not np.array_equal(jumped, updated):
+            updated, jumped = jumped, jumped[jumped]
+
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _neighbour_offsets(dimensions):
+    """
+    Half of the offsets to every neighbouring cell, so each pair of neighbouring cells is only checked once
+    """
+    offsets = [offset for offset in itertools.product((-1, 0, 1), repeat=dimensions) if any(offset)]
+    return np.array([offset for offset in offsets if offset > tuple(-value for value in offset)], dtype=np.int64)
+
+
+def _cell_keys(cells):
+    """
+    A sortable int64 key of each cell and the key offset to each neighbouring cell. Cells are packed into mixed radix
+    keys when the range of cells fits into 63 bits, so the neighbours of sorted keys are also sorted. Otherwise cells
+    are hashed, and any two cells with the same hash are told apart by comparing the cells themselves.
+    """
+    lower = cells.min(axis=0) - 1
+    spans = cells.max(axis=0) - lower + 2
+    if np.sum(np.log2(spans.astype(np.float64))) < 62:
+        strides = np.cumprod(np.concatenate([[1], spans[:-1]]))
+        return (cells - lower) @ strides, _neighbour_offsets(cells.shape[1]) @ strides, True
+    return _hash_rows(cells).view(np.int64), None, False
+
+
+def _neighbouring_cells(cells):
+    """
+    Every pair of distinct unique cells that are neighbours, including diagonally, as two arrays of cell indices
+    """
+    keys, key_offsets, packed = _cell_keys(cells)
+    order = np.argsort(keys, kind="stable")
+    keys, sorted_cells = keys[order], cells[order]
+
+    a, b = [], []
+    for index, offset in enumerate(_neighbour_offsets(cells.shape[1])):
+        if packed:
+            candidates = np.arange(len(keys))
+            others = np.searchsorted(keys, keys + key_offsets[index])
+        else:
+            neighbour_keys = _hash_rows(sorted_cells + offset).view(np.int64)
+            candidates = np.argsort(neighbour_keys)
+            others = np.searchsorted(keys, neighbour_keys[candidates])
+
+        found = others < len(keys)
+        candidates, others = candidates[found], others[found]
+        match = (np.all(sorted_cells[others] == sorted_cells[candidates] + offset, axis=1) if not packed else
+                 keys[others] == keys[candidates] + key_offsets[index])
+        a.append(order[candidates[match]])
+        b.append(order[others[match]])
+    return np.concatenate(a), np.concatenate(b)
+
+
+def _close_pairs(points, tolerance):
+    """
+    Every pair of points within tolerance of each other. Points are bucketed into cells of size tolerance, so a close
+    pair always lies in the same or neighbouring cells, and every pair of points across those cells is compared. The
+    pairs are compared in blocks of cells to bound the memory used.
+    """
+    cells = np.floor(points / tolerance).astype(np.int64)
+    cell_first, cell_of_point = _group_rows(cells)
+    by_cell = np.argsort(cell_of_point, kind="stable")
+    sizes = np.bincount(cell_of_point, minlength=len(cell_first))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    same = np.flatnonzero(sizes > 1)
+    neighbour_a, neighbour_b = _neighbouring_cells(cells[cell_first])
+    cell_a, cell_b = np.concatenate([same, neighbour_a]), np.concatenate([same, neighbour_b])
+    totals = sizes[cell_a] * sizes[cell_b]
+    ends = np.cumsum(totals)
+
+    a, b = [], []
+    block_start = 0
+    while block_start < len(cell_a):
+        block_end = max(int(np.searchsorted(ends, ends[block_start] - totals[block_start] + _PAIR_BLOCK, "right")),
+                        block_start + 1)
+        block_a, block_b, block_totals = cell_a[block_start:block_end], cell_b[block_start:block_end], \
+            totals[block_start:block_end]
+
+        # Enumerate the cartesian product of the points of each pair of cells
+        pair = np.repeat(np.arange(len(block_totals)), block_totals)
+        local = np.arange(len(pair)) - np.repeat(np.cumsum(block_totals) - block_totals, block_totals)
+        width = sizes[block_b][pair]
+        first, second = local // width, local % width
+        keep = (block_a[pair] != block_b[pair]) | (first < second)
+        first = by_cell[starts[block_a[pair]][keep] + first[keep]]
+        second = by_cell[starts[block_b[pair]][keep] + second[keep]]
+
+        differences = points[first] - points[second]
+        close = np.einsum("ij,ij->i", differences, differences) <= tolerance * tolerance
+        a.append(first[close])
+        b.append(second[close])
+        block_start = block_end
+
+    if not a:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    return np.concatenate(a), np.concatenate(b)
+
+
+def _group_sizes_and_means(points, inverse, count):
+    sizes = np.bincount(inverse, minlength=count)
+    means = np.empty((count, points.shape[1]), dtype=np.float64)
+    for column in range(points.shape[1]):
+        means[:, column] = np.bincount(inverse, weights=points[:, column], minlength=count) / sizes
+    return means
+
+
+def weld(points, tolerance=0.0, keep="first"):
+    """
+    Merge duplicate points, returning the unique points and the index into them of every input point, so faces can be
+    rewritten with inverse[faces].
+
+    With a tolerance of 0.0 points are merged only when every value is identical, where 0.0 and -0.0 are the same, by
+    sorting a hash of each point. Otherwise every pair of points within tolerance of each other is merged, and no pair
+    further apart is merged directly. Pairs are found by bucketing points into a grid of cells of size tolerance and
+    comparing the points of each cell against those of the same and neighbouring cells, which is close to linear
+    unless many distinct points crowd into the same cells. Merging is transitive, so a chain of close points can weld
+    together points that are further than tolerance apart.
+
+    :param points: An (N, k) array, a batch from vectorObjects.VectorArrays, or a list of vectors such as Vector3D
+    :type points: np.ndarray | VectorArrayMaster | list
+
+    :param tolerance: The distance within which points are merged, or 0.0 to only merge identical points
+    :type tolerance: float
+
+    :param keep: Which value each merged point takes, first for the first point of the group or mean for the mean of the
+        group
+    :type keep: str
+
+    :return: The unique points in the same form as points, ordered by their first occurrence, and the index of the
+        unique point of every input point
+    :rtype: tuple[np.ndarray | VectorArrayMaster | list, np.ndarray]
+    """
+    if keep not in ("first", "mean"):
+        raise ValueError(f"keep must be first or mean but found {keep}")
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be positive or 0.0 but found {tolerance}")
+
+    array = np.ascontiguousarray(as_points(points), dtype=np.float64)
+    if len(array) == 0:
+        return points, np.zeros(0, dtype=np.intp)
+
+    if tolerance == 0:
+        # Adding 0.0 turns -0.0 into 0.0 so they share the same bits
+        first, inverse = _group_rows(array + 0.0)
+    else:
+        if not np.all(np.isfinite(array)):
+            raise ValueError("Points must be finite to be welded with a tolerance")
+        if np.abs(array).max() / tolerance >= 2 ** 60:
+            raise ValueError(f"A tolerance of {tolerance} is too small for points of this size to fit into the grid")
+
+        # Identical points are always merged, so only the distinct points need to be compared
+        distinct_first, distinct_of_point = _group_rows(array + 0.0)
+        a, b = _close_pairs(array[distinct_first], tolerance)
+        labels = _connected_labels(len(distinct_first), a, b) if len(a) else np.arange(len(distinct_first))
+        first, inverse = _group_rows(labels[distinct_of_point].reshape(-1, 1))
+
+    unique = array[first] if keep == "first" else _group_sizes_and_means(array, inverse, len(first))
+    return _as_input_type(points, unique), inverse
+
+
+def _as_input_type(points, unique, dtype=None):
+    """
+    Return unique in the same form as points, where batches keep the dtype of points unless dtype is given
+    """
+    if isinstance(points, VectorArrayMaster):
+        return type(points)(unique, dtype=points.dtype if dtype is None else dtype)
+    elif not isinstance(points, np.ndarray) and isinstance(points[0], VectorMaster):
+        return unstack(unique, type(points[0]))
+    return unique
+
+
+def remap_faces(faces, inverse, drop_degenerate=True):
+    """
+    Rewrite the vertex indices of faces after weld, optionally removing faces that now use the same vertex more than
+    once
+
+    :param faces: An (F, n) array of vertex indices, such as triangles
+    :type faces: np.ndarray | list
+
+    :param inverse: The inverse returned by weld
+    :type inverse: np.ndarray
+
+    :param drop_degenerate: If True remove faces with a repeated vertex
+    :type drop_degenerate: bool
+
+    :rtype: np.ndarray
+    """
+    faces = np.asarray(inverse)[np.asarray(faces)]
+    if drop_degenerate and len(faces) > 0:
+        ordered = np.sort(faces, axis=1)
+        faces = faces[np.all(ordered[:, 1:] != ordered[:, :-1], axis=1)]
+    return faces